@@ -0,0 +1,237 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from correlation_calculator import CorrelationCalculator
+from data_loader import DataLoader
+from indicators import calculate_indicators
+from sentiment_analyzer import SentimentAnalyzer
+from synthetic_data import write_dataset
+
+# Synthetic dataset sizes: tickers, trading days and headlines per ticker per day
+SCALES = {
+    'small': {'n_tickers': 2, 'days': 60, 'headlines_per_day': 5},
+    'medium': {'n_tickers': 10, 'days': 250, 'headlines_per_day': 10},
+    'large': {'n_tickers': 50, 'days': 500, 'headlines_per_day': 20},
+}
+
+# Pipeline stages in execution order
+STAGES = ['load_stock_data', 'load_analyst_ratings', 'align_dates', 'analyze_dataframe',
+          'aggregate_daily_sentiment', 'calculate_correlations', 'calculate_indicators',
+          'create_dashboard']
+
+# Relative slowdown (or memory growth) that counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Absolute changes below these are timer/allocator noise, never regressions
+MIN_DELTA = {'seconds': 0.005, 'peak_mb': 1.0}
+
+DEFAULT_OUTPUT = os.path.join("results", "benchmarks", "latest.json")
+
+
+def measure(func, repeat=3):
+    """Best wall time over `repeat` runs, plus peak traced memory of one extra run
+
+    Memory is measured separately so tracemalloc's overhead does not
+    inflate the timings. The stage's progress output is discarded.
+    """
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return result, {
+        'seconds': min(timings),
+        'mean_seconds': float(np.mean(timings)),
+        'peak_mb': peak / 2**20
+    }
+
+
+def _versions():
+    versions = {'python': platform.python_version()}
+    for name in ('numpy', 'pandas', 'nltk', 'textblob', 'matplotlib'):
+        try:
+            versions[name] = __import__(name).__version__
+        except (ImportError, AttributeError):
+            versions[name] = None
+    return versions
+
+
+def bench_scale(data_dir, symbols, stages=None, repeat=3, vader_backend='nltk'):
+    """Time every requested stage on one synthetic dataset
+
+    Stages run on the first ticker, except loading and scoring which see
+    the whole ratings file. Each stage is fed the previous stage's output.
+    """
+    stages = stages or STAGES
+    symbol = symbols[0]
+    timings = {}
+
+    def run(stage, func):
+        if stage not in stages:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return func()
+        result, timings[stage] = measure(func, repeat)
+        return result
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = DataLoader(data_dir)
+    stock_df = run('load_stock_data', lambda: loader.load_stock_data(symbol))
+    ratings_df = run('load_analyst_ratings', loader.load_analyst_ratings)
+    news_df = ratings_df[ratings_df['stock'] == symbol]
+    news_aligned, stock_aligned = run('align_dates', lambda: loader.align_dates(
+        news_df, stock_df, map_to_trading_days=True))
+
+    # A fresh analyzer per run: no cache, so every run scores every headline
+    scored = run('analyze_dataframe', lambda: SentimentAnalyzer(
+        vader_backend=vader_backend).analyze_dataframe(ratings_df))
+    analyzer = SentimentAnalyzer(vader_backend=vader_backend)
+    scored = scored[scored['stock'] == symbol]
+    daily = run('aggregate_daily_sentiment', lambda: analyzer.aggregate_daily_sentiment(scored))
+
+    calculator = CorrelationCalculator()
+    with contextlib.redirect_stdout(io.StringIO()):
+        returns = calculator.calculate_daily_returns(stock_aligned)
+    combined = pd.merge(daily, returns, on='date', how='inner')
+    run('calculate_correlations', lambda: calculator.calculate_correlations(combined))
+
+    prices = pd.read_csv(os.path.join(data_dir, f"{symbol}.csv"))
+    run('calculate_indicators', lambda: calculate_indicators(prices.copy()))
+
+    if 'create_dashboard' in stages:
+        from visualization import StockVisualizer
+        visualizer = StockVisualizer(dpi='standard', skip_unchanged=False)
+        with tempfile.TemporaryDirectory() as plot_dir:
+            run('create_dashboard', lambda: visualizer.create_dashboard(combined, symbol,
+                                                                        plot_dir))
+
+    for stage, rows in (('load_analyst_ratings', len(ratings_df)),
+                        ('analyze_dataframe', len(ratings_df)),
+                        ('align_dates', len(news_df)),
+                        ('aggregate_daily_sentiment', len(scored)),
+                        ('calculate_correlations', len(combined)),
+                        ('calculate_indicators', len(prices)),
+                        ('create_dashboard', len(combined)),
+                        ('load_stock_data', len(prices))):
+        if stage in timings:
+            timings[stage]['rows'] = rows
+    return {stage: timings[stage] for stage in STAGES if stage in timings}
+
+
+def run_suite(scales=('small',), stages=None, repeat=3, vader_backend='nltk', seed=0,
+              work_dir=None):
+    """Benchmark every scale on freshly generated data; returns a JSON-ready dict"""
+    results = {
+        'metadata': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'versions': _versions(),
+            'repeat': repeat,
+            'seed': seed,
+            'vader_backend': vader_backend
+        },
+        'scales': {}
+    }
+    with tempfile.TemporaryDirectory(dir=work_dir) as root:
+        for scale in scales:
+            params = SCALES[scale]
+            print(f"⏱ Benchmarking scale '{scale}' {params}")
+            data_dir = os.path.join(root, scale)
+            symbols = write_dataset(data_dir, seed=seed, **params)
+            stage_results = bench_scale(data_dir, symbols, stages, repeat, vader_backend)
+            results['scales'][scale] = {'params': params, 'stages': stage_results}
+            for stage, stats in stage_results.items():
+                print(f"   {stage:<28} {stats['seconds'] * 1000:9.1f} ms "
+                      f"{stats['peak_mb']:8.1f} MB")
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Stages slower or hungrier than the baseline by more than `threshold`
+
+    Returns one dict per regression; stages missing from either side and
+    changes smaller than MIN_DELTA are ignored.
+    """
+    regressions = []
+    for scale, current in results['scales'].items():
+        base_stages = baseline.get('scales', {}).get(scale, {}).get('stages', {})
+        for stage, stats in current['stages'].items():
+            if stage not in base_stages:
+                continue
+            for metric in ('seconds', 'peak_mb'):
+                before = base_stages[stage][metric]
+                after = stats[metric]
+                if after > before * (1 + threshold) and after - before > MIN_DELTA[metric]:
+                    regressions.append({'scale': scale, 'stage': stage, 'metric': metric,
+                                        'baseline': before, 'current': after,
+                                        'ratio': after / before if before else float('inf')})
+    return regressions
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each pipeline stage on synthetic data")
+    parser.add_argument("--scales", nargs="+", default=['small', 'medium'], choices=list(SCALES),
+                        help="Dataset sizes to benchmark")
+    parser.add_argument("--stages", nargs="+", choices=STAGES,
+                        help="Only benchmark these stages (default: all)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per stage; the best one is reported")
+    parser.add_argument("--vader-backend", choices=['nltk', 'fast'], default='nltk',
+                        help="VADER scorer used by the sentiment stage")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="Where to write the results JSON")
+    parser.add_argument("--baseline",
+                        help="Baseline results JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Also write the results to --baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.scales, args.stages, args.repeat, args.vader_backend)
+    save_results(results, args.output)
+    print(f"💾 Results saved: {args.output}")
+
+    if args.baseline and args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"💾 Baseline saved: {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"❌ {r['scale']}/{r['stage']} {r['metric']}: "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} ({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print(f"✅ No regressions beyond {args.threshold:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,82 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import pearsonr, spearmanr
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Daily sentiment columns correlated against returns
+SENTIMENT_COLUMNS = ['avg_polarity', 'avg_vader_compound', 'positive_ratio']
+
+# Sentiment column and method behind each entry of calculate_correlations()
+CORRELATION_PAIRS = {
+    'pearson_polarity': ('avg_polarity', 'pearson'),
+    'pearson_vader': ('avg_vader_compound', 'pearson'),
+    'pearson_positive_ratio': ('positive_ratio', 'pearson'),
+    'spearman_polarity': ('avg_polarity', 'spearman'),
+    'spearman_vader': ('avg_vader_compound', 'spearman')
+}
+
+def pearson_pvalue(r, n):
+    """Two-sided p-value of Pearson r for n pairs (same test as pearsonr)"""
+    from scipy.stats import t as t_dist
+    r = np.asarray(r, dtype=float)
+    n = np.asarray(n, dtype=float)
+    dof = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = r * np.sqrt(dof / np.clip(1 - r ** 2, 0, None))
+        p_val = 2 * t_dist.sf(np.abs(t_stat), dof)
+    return np.where(dof > 0, p_val, np.nan)
+
+class RunningCorrelation:
+    """Pearson correlation kept as mergeable sufficient statistics
+    
+    Pairs can be added in any number of batches (or merged from another
+    instance) and the correlation read back without revisiting old data.
+    """
+    FIELDS = ('n', 'sum_x', 'sum_y', 'sum_xx', 'sum_yy', 'sum_xy')
+    
+    def __init__(self, n=0, sum_x=0.0, sum_y=0.0, sum_xx=0.0, sum_yy=0.0, sum_xy=0.0):
+        self.n = n
+        self.sum_x = sum_x
+        self.sum_y = sum_y
+        self.sum_xx = sum_xx
+        self.sum_yy = sum_yy
+        self.sum_xy = sum_xy
+    
+    def update(self, x, y):
+        """Add paired observations (scalars or arrays without NaNs)"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.n += int(x.size)
+        self.sum_x += float(x.sum())
+        self.sum_y += float(y.sum())
+        self.sum_xx += float((x * x).sum())
+        self.sum_yy += float((y * y).sum())
+        self.sum_xy += float((x * y).sum())
+        return self
+    
+    def merge(self, other):
+        """Fold another RunningCorrelation into this one"""
+        for field in self.FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        return self
+    
+    def pearson(self):
+        """Return (r, p_value), NaN when fewer than 3 pairs or no variance"""
+        if self.n < 3:
+            return np.nan, np.nan
+        cov = self.sum_xy - self.sum_x * self.sum_y / self.n
+        var_x = self.sum_xx - self.sum_x ** 2 / self.n
+        var_y = self.sum_yy - self.sum_y ** 2 / self.n
+        if var_x <= 0 or var_y <= 0:
+            return np.nan, np.nan
+        r = float(np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0))
+        return r, float(pearson_pvalue(r, self.n))
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field, 0) for field in cls.FIELDS})
 
 class CorrelationCalculator:
     def __init__(self):
@@ -23,8 +99,13 @@ class CorrelationCalculator:
         
         return stock_df
     
-    def calculate_correlations(self, combined_df):
-        """Calculate correlations between sentiment and returns"""
+    def calculate_correlations(self, combined_df, n_resamples=0, block_size=None, seed=None):
+        """Calculate correlations between sentiment and returns
+        
+        With `n_resamples` > 0 each pair also gets a permutation p-value and
+        a block-bootstrap confidence interval under 'resampling'.
+        """
+        from scipy.stats import pearsonr, spearmanr
         clean_df = combined_df.dropna(subset=['avg_polarity', 'daily_return', 'avg_vader_compound'])
         
         if len(clean_df) < 2:
@@ -43,13 +124,522 @@ class CorrelationCalculator:
         else:
             results['pearson_positive_ratio'] = [np.nan, np.nan]
         
-        return {
+        output = {
             'summary': {
                 'total_days': len(clean_df),
                 'date_range': f"{clean_df['date'].min()} to {clean_df['date'].max()}"
             },
             'correlations': results
         }
+        
+        if n_resamples > 0:
+            output['resampling'] = self.resampling_significance(
+                clean_df, n_resamples=n_resamples, block_size=block_size, seed=seed
+            )
+        
+        return output
+    
+    def resampling_significance(self, clean_df, n_resamples=10000, block_size=None,
+                                confidence=0.95, seed=None):
+        """Permutation p-values and block-bootstrap CIs for every correlation pair"""
+        rng = np.random.default_rng(seed)
+        y = clean_df['daily_return'].to_numpy(dtype=float)
+        significance = {}
+        for name, (column, method) in CORRELATION_PAIRS.items():
+            if column not in clean_df.columns:
+                continue
+            x = clean_df[column].to_numpy(dtype=float)
+            r, p_val = self.permutation_test(x, y, n_resamples, method, seed=rng)
+            _, low, high = self.bootstrap_ci(x, y, n_resamples, block_size, confidence,
+                                             method, seed=rng)
+            significance[name] = {'corr': r, 'perm_pvalue': p_val,
+                                  'ci_low': low, 'ci_high': high}
+        return significance
+    
+    def permutation_test(self, x, y, n_resamples=10000, method='pearson', seed=None,
+                         max_memory_mb=64):
+        """Two-sided permutation test of the correlation between x and y
+        
+        Shuffled copies of y are drawn as a (resamples x n) matrix in chunks
+        that fit `max_memory_mb`. Returns (r, p_value).
+        """
+        rng = np.random.default_rng(seed)
+        x, y = self._prepare_pair(x, y, method)
+        x = x - x.mean()
+        y = y - y.mean()
+        scale = np.sqrt((x * x).sum() * (y * y).sum())
+        if scale == 0:
+            return np.nan, np.nan
+        observed = float(x @ y / scale)
+        
+        # Permuting y keeps its mean and variance, so r is a dot product
+        exceed = 0
+        for rows in self._chunk_sizes(n_resamples, len(y), max_memory_mb):
+            shuffled = rng.permuted(np.broadcast_to(y, (rows, len(y))), axis=1)
+            exceed += np.count_nonzero(np.abs(shuffled @ x / scale) >= abs(observed) - 1e-12)
+        return observed, (exceed + 1) / (n_resamples + 1)
+    
+    def bootstrap_ci(self, x, y, n_resamples=10000, block_size=None, confidence=0.95,
+                     method='pearson', seed=None, max_memory_mb=64):
+        """Moving-block bootstrap confidence interval of the correlation
+        
+        Blocks of `block_size` consecutive days (default n ** (1/3)) keep the
+        autocorrelation of returns inside each resample. Returns (r, low, high).
+        """
+        from scipy.stats import rankdata
+        rng = np.random.default_rng(seed)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n = len(x)
+        if n < 3:
+            return np.nan, np.nan, np.nan
+        if block_size is None:
+            block_size = max(1, int(round(n ** (1 / 3))))
+        block_size = min(block_size, n)
+        n_blocks = int(np.ceil(n / block_size))
+        offsets = np.arange(block_size)
+        
+        observed = self._rowwise_pearson(*[a[None, :] for a in self._prepare_pair(x, y, method)])[0]
+        estimates = []
+        for rows in self._chunk_sizes(n_resamples, n, max_memory_mb):
+            starts = rng.integers(0, n - block_size + 1, size=(rows, n_blocks))
+            idx = (starts[:, :, None] + offsets).reshape(rows, -1)[:, :n]
+            xb, yb = x[idx], y[idx]
+            if method == 'spearman':
+                xb, yb = rankdata(xb, axis=1), rankdata(yb, axis=1)
+            estimates.append(self._rowwise_pearson(xb, yb))
+        estimates = np.concatenate(estimates)
+        
+        alpha = (1 - confidence) / 2
+        low, high = np.nanquantile(estimates, [alpha, 1 - alpha])
+        return float(observed), float(low), float(high)
+    
+    def _prepare_pair(self, x, y, method):
+        """Float arrays for a pair, ranked for Spearman"""
+        from scipy.stats import rankdata
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if method == 'spearman':
+            return rankdata(x), rankdata(y)
+        if method != 'pearson':
+            raise ValueError(f"Unknown correlation method: {method}")
+        return x, y
+    
+    def _chunk_sizes(self, n_resamples, n, max_memory_mb):
+        """Split resamples into row chunks of a (resamples x n) float matrix"""
+        # A few temporaries of the chunk's size are alive at once
+        rows_per_chunk = max(1, int(max_memory_mb * 2 ** 20 // (n * 8 * 4)))
+        done = 0
+        while done < n_resamples:
+            rows = min(rows_per_chunk, n_resamples - done)
+            yield rows
+            done += rows
+    
+    def build_panel(self, frames, value_column, ticker_column='stock'):
+        """Date x ticker matrix of one column
+        
+        `frames` is either {ticker: frame with a 'date' column} (e.g. each
+        stock's combined data) or one long frame with a `ticker_column`.
+        Missing (date, ticker) cells are NaN.
+        """
+        if isinstance(frames, pd.DataFrame):
+            panel = frames.pivot_table(index='date', columns=ticker_column,
+                                       values=value_column, aggfunc='mean')
+        else:
+            panel = pd.DataFrame({
+                ticker: frame.set_index('date')[value_column]
+                for ticker, frame in frames.items()
+            })
+        return panel.sort_index()
+    
+    def panel_correlations(self, sentiment_panel, returns_panel, min_periods=3):
+        """Per-ticker and pooled sentiment/return correlations from two panels
+        
+        Both date x ticker panels are aligned and NaN cells masked, so every
+        ticker's correlation comes from the same few matrix reductions.
+        'pooled' uses all (date, ticker) pairs; 'pooled_within' first removes
+        each ticker's own means.
+        """
+        sentiment_panel, returns_panel = sentiment_panel.align(returns_panel, join='inner')
+        x = sentiment_panel.to_numpy(dtype=float)
+        y = returns_panel.to_numpy(dtype=float)
+        mask = ~np.isnan(x) & ~np.isnan(y)
+        
+        n = mask.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_x = np.where(mask, x, 0).sum(axis=0) / n
+            mean_y = np.where(mask, y, 0).sum(axis=0) / n
+            dx = np.where(mask, x - mean_x, 0)
+            dy = np.where(mask, y - mean_y, 0)
+            var_x = (dx * dx).sum(axis=0)
+            var_y = (dy * dy).sum(axis=0)
+            corr = (dx * dy).sum(axis=0) / np.sqrt(var_x * var_y)
+        valid = (n >= max(min_periods, 3)) & (var_x > 1e-12) & (var_y > 1e-12)
+        corr = np.where(valid, np.clip(corr, -1.0, 1.0), np.nan)
+        
+        per_ticker = pd.DataFrame({
+            'corr': corr,
+            'pvalue': pearson_pvalue(corr, n),
+            'n': n
+        }, index=sentiment_panel.columns)
+        
+        return {
+            'per_ticker': per_ticker,
+            'pooled': self._pooled_pearson(x[mask], y[mask]),
+            'pooled_within': self._pooled_pearson(dx[mask], dy[mask])
+        }
+    
+    def sentiment_correlation_matrix(self, panel, min_periods=3):
+        """Ticker x ticker Pearson matrix over pairwise-complete dates
+        
+        Uses masked matrix products, so no per-pair Python loop is needed.
+        """
+        x = panel.to_numpy(dtype=float)
+        mask = ~np.isnan(x)
+        m = mask.astype(float)
+        x = np.where(mask, x - np.nanmean(x, axis=0), 0.0)
+        
+        n = m.T @ m
+        sx = x.T @ m            # [i, j]: sum of ticker i over dates where j is present
+        sxx = (x * x).T @ m
+        sxy = x.T @ x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = sxy - sx * sx.T / n
+            var_i = sxx - sx * sx / n
+            var_j = var_i.T
+            corr = cov / np.sqrt(var_i * var_j)
+        valid = (n >= max(min_periods, 2)) & (var_i > 1e-12) & (var_j > 1e-12)
+        corr = np.where(valid, np.clip(corr, -1.0, 1.0), np.nan)
+        return pd.DataFrame(corr, index=panel.columns, columns=panel.columns)
+    
+    def _pooled_pearson(self, x, y):
+        """(r, p_value, n) over flat arrays of valid pairs"""
+        if len(x) < 3:
+            return np.nan, np.nan, len(x)
+        r = self._rowwise_pearson(x[None, :], y[None, :])[0]
+        return float(r), float(pearson_pvalue(r, len(x))), len(x)
+    
+    def rolling_correlations(self, combined_df, window=30, columns=None,
+                             target='daily_return', method='pearson', min_periods=None):
+        """Rolling correlation of each sentiment column with the target
+        
+        Pearson windows come from cumulative sums in O(n) for all columns
+        at once; NaN pairs are skipped and `min_periods` (default: window)
+        valid pairs are required. Spearman ranks the valid pairs of every
+        window in vectorized chunks, with the same NaN and `min_periods`
+        rules. Returns a frame with `{col}_corr`, `{col}_pvalue`
+        and `{col}_n` per column, aligned with the date-sorted input.
+        """
+        if min_periods is None:
+            min_periods = window
+        return self._windowed_correlations(combined_df, window, columns, target,
+                                           method, min_periods)
+    
+    def expanding_correlations(self, combined_df, columns=None, target='daily_return',
+                               min_periods=3):
+        """Expanding-window Pearson correlation of each sentiment column with the target"""
+        return self._windowed_correlations(combined_df, None, columns, target,
+                                           'pearson', min_periods)
+    
+    def _windowed_correlations(self, combined_df, window, columns, target, method, min_periods):
+        """Shared driver for rolling and expanding correlations"""
+        if columns is None:
+            columns = [col for col in SENTIMENT_COLUMNS if col in combined_df.columns]
+        if 'date' in combined_df.columns:
+            combined_df = combined_df.sort_values('date')
+        
+        x = combined_df[columns].to_numpy(dtype=float)
+        y = combined_df[target].to_numpy(dtype=float)
+        
+        if method == 'pearson':
+            corr, n_obs = self._cumsum_pearson(x, y, window, min_periods)
+        elif method == 'spearman':
+            corr, n_obs = self._rolling_spearman(x, y, window, min_periods)
+        else:
+            raise ValueError(f"Unknown correlation method: {method}")
+        pvalue = pearson_pvalue(corr, n_obs)
+        
+        result = pd.DataFrame(index=combined_df.index)
+        if 'date' in combined_df.columns:
+            result['date'] = combined_df['date']
+        for j, col in enumerate(columns):
+            result[f'{col}_corr'] = corr[:, j]
+            result[f'{col}_pvalue'] = pvalue[:, j]
+            result[f'{col}_n'] = n_obs[:, j]
+        return result.reset_index(drop=True)
+    
+    def _cumsum_pearson(self, x, y, window, min_periods):
+        """Windowed Pearson r of each column of x with y from cumulative sums"""
+        mask = ~np.isnan(x) & ~np.isnan(y)[:, None]
+        # Centering keeps the cumulative sums small (correlation is unchanged)
+        x = np.where(mask, x - np.nanmean(x, axis=0), 0.0)
+        y = np.where(mask, (y - np.nanmean(y))[:, None], 0.0)
+        
+        sums = [mask.astype(float), x, y, x * x, y * y, x * y]
+        zero = np.zeros((1, x.shape[1]))
+        cums = [np.concatenate([zero, np.cumsum(a, axis=0)]) for a in sums]
+        if window is None:
+            n, sx, sy, sxx, syy, sxy = [c[1:] for c in cums]
+        else:
+            start = np.maximum(np.arange(1, len(x) + 1) - window, 0)
+            n, sx, sy, sxx, syy, sxy = [c[1:] - c[start] for c in cums]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = sxy - sx * sy / n
+            var_x = sxx - sx * sx / n
+            var_y = syy - sy * sy / n
+            corr = cov / np.sqrt(var_x * var_y)
+        valid = (n >= max(min_periods, 2)) & (var_x > 1e-12) & (var_y > 1e-12)
+        corr = np.where(valid, np.clip(corr, -1.0, 1.0), np.nan)
+        return corr, np.rint(n).astype(int)
+    
+    def _rolling_spearman(self, x, y, window, min_periods, chunk_rows=4096):
+        """Rolling Spearman r over the valid pairs of each window, ranked in vectorized chunks
+        
+        Like the Pearson path, NaN pairs are skipped rather than voiding
+        the window, and `min_periods` valid pairs are required.
+        """
+        from scipy.stats import rankdata
+        n_rows, n_cols = x.shape
+        corr = np.full((n_rows, n_cols), np.nan)
+        n_obs = np.zeros((n_rows, n_cols), dtype=int)
+        
+        # Leading padding gives the first rows their partial windows
+        pad = np.full(window - 1, np.nan)
+        y_windows = sliding_window_view(np.concatenate([pad, y]), window)
+        for j in range(n_cols):
+            x_windows = sliding_window_view(np.concatenate([pad, x[:, j]]), window)
+            for start in range(0, n_rows, chunk_rows):
+                xw = x_windows[start:start + chunk_rows]
+                yw = y_windows[start:start + chunk_rows]
+                valid = ~(np.isnan(xw) | np.isnan(yw))
+                # Invalid pairs rank above all valid ones, which keep ranks 1..n
+                rx = rankdata(np.where(valid, xw, np.inf), axis=1)
+                ry = rankdata(np.where(valid, yw, np.inf), axis=1)
+                n = valid.sum(axis=1)
+                r = self._rowwise_pearson(rx, ry, valid)
+                rows = slice(start, start + len(xw))
+                corr[rows, j] = np.where(n >= max(min_periods, 2), r, np.nan)
+                n_obs[rows, j] = n
+        return corr, n_obs
+    
+    def lag_correlations(self, combined_df, max_lag=10, min_lag=None, columns=None,
+                         target='daily_return', min_periods=10, returns=None):
+        """Lead/lag correlation scan of each sentiment column against the target
+        
+        For lag k the pairs are (sentiment[t], target[t + k]), so positive
+        lags test whether sentiment leads returns. Lags are counted in
+        trading days when `returns` (a frame with date and target columns,
+        as from calculate_daily_returns) is given: the sentiment is
+        reindexed onto its dates, NaN on days without news. Otherwise they
+        are counted in rows of the date-sorted frame, which skips over news
+        gaps. Every lag in [min_lag, max_lag] (min_lag defaults to -max_lag)
+        comes from one set of FFT cross-correlations, with NaN pairs masked
+        out. Returns a long frame of lag, column, corr, pvalue, n.
+        """
+        if min_lag is None:
+            min_lag = -max_lag
+        if columns is None:
+            columns = [col for col in SENTIMENT_COLUMNS if col in combined_df.columns]
+        if returns is not None:
+            calendar = (returns[['date', target]].drop_duplicates('date')
+                        .sort_values('date').reset_index(drop=True))
+            combined_df = calendar.merge(combined_df[['date'] + columns], on='date', how='left')
+        elif 'date' in combined_df.columns:
+            combined_df = combined_df.sort_values('date')
+        
+        x = combined_df[columns].to_numpy(dtype=float)
+        y = combined_df[target].to_numpy(dtype=float)
+        n_rows = len(y)
+        lags = np.arange(min_lag, max_lag + 1)
+        
+        mask_x = ~np.isnan(x)
+        mask_y = ~np.isnan(y)
+        x = np.where(mask_x, x - np.nanmean(x, axis=0), 0.0)
+        y = np.where(mask_y, y - np.nanmean(y), 0.0)
+        mask_x = mask_x.astype(float)
+        mask_y = mask_y.astype(float)
+        
+        size = 1 << int(np.ceil(np.log2(max(2 * n_rows - 1, 1))))
+        fx = {name: np.fft.rfft(a, size, axis=0) for name, a in
+              [('m', mask_x), ('x', x), ('xx', x * x)]}
+        fy = {name: np.fft.rfft(a, size)[:, None] for name, a in
+              [('m', mask_y), ('y', y), ('yy', y * y)]}
+        
+        # Position of each lag in the circular cross-correlation output
+        positions = np.where(lags >= 0, lags, size + lags)
+        in_range = np.abs(lags) < n_rows
+        
+        def cross(a, b):
+            return np.fft.irfft(np.conj(fx[a]) * fy[b], size, axis=0)[positions]
+        
+        n = np.rint(cross('m', 'm'))
+        sx = cross('x', 'm')
+        sy = cross('m', 'y')
+        sxx = cross('xx', 'm')
+        syy = cross('m', 'yy')
+        sxy = cross('x', 'y')
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = sxy - sx * sy / n
+            var_x = sxx - sx * sx / n
+            var_y = syy - sy * sy / n
+            corr = cov / np.sqrt(var_x * var_y)
+        valid = (n >= max(min_periods, 3)) & (var_x > 1e-9) & (var_y > 1e-9) & in_range[:, None]
+        corr = np.where(valid, np.clip(corr, -1.0, 1.0), np.nan)
+        n = np.where(in_range[:, None], n, 0).astype(int)
+        pvalue = pearson_pvalue(corr, n)
+        
+        return pd.DataFrame({
+            'lag': np.repeat(lags, len(columns)),
+            'column': np.tile(columns, len(lags)),
+            'corr': corr.ravel(),
+            'pvalue': pvalue.ravel(),
+            'n': n.ravel()
+        })
+    
+    def event_correlations(self, combined_df, column='avg_polarity', target='daily_return',
+                           event_prefix='event_'):
+        """Sentiment/return correlation restricted to days with each event
+        
+        Uses the per-day event counts (`event_<name>` columns) merged in by
+        the event tagging stage. Returns one row per event with the number
+        of event days, the conditioned Pearson r and p-value, and the mean
+        return on event days versus all other days.
+        """
+        event_columns = [col for col in combined_df.columns if col.startswith(event_prefix)]
+        clean = combined_df.dropna(subset=[column, target])
+        x = clean[column].to_numpy(dtype=np.float64)
+        y = clean[target].to_numpy(dtype=np.float64)
+        
+        rows = []
+        for event_column in event_columns:
+            on_event = clean[event_column].to_numpy() > 0
+            corr, p_val, n = self._pooled_pearson(x[on_event], y[on_event])
+            rows.append({
+                'event': event_column[len(event_prefix):],
+                'days': n,
+                'corr': corr,
+                'pvalue': p_val,
+                'mean_return': y[on_event].mean() if n else np.nan,
+                'mean_return_other': y[~on_event].mean() if n < len(y) else np.nan
+            })
+        return pd.DataFrame(rows, columns=['event', 'days', 'corr', 'pvalue',
+                                           'mean_return', 'mean_return_other'])
+    
+    def event_study(self, returns_df, events_df, window=5, group_column=None, bins=None,
+                    target='daily_return', market_returns=None, ticker_column='stock'):
+        """Average and cumulative abnormal returns in a [-window, +window] day window
+        
+        `returns_df` holds dated returns and `events_df` dated events, both
+        optionally for many tickers in `ticker_column`. Abnormal returns are
+        the return minus `market_returns` (a Series indexed by date) when
+        given, else minus the ticker's mean return. Each event is placed at
+        its first trading day on or after the event date with searchsorted,
+        and all windows are cut at once from a strided view of the returns,
+        padded with NaN between tickers. Events are grouped by
+        `group_column` of `events_df`, cut into `bins` when given.
+        
+        Returns a dict with 'offsets', the (events x window) 'windows' matrix,
+        'event_rows' (positions in `events_df`), the 'groups' of those rows
+        and per-group 'aar', 'caar' (offsets x groups) and 'n' (events).
+        """
+        k = window
+        multi = ticker_column in returns_df.columns and ticker_column in events_df.columns
+        returns_df = returns_df.dropna(subset=['date'])
+        r_days = returns_df['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        e_days = events_df['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+        returns = returns_df[target].to_numpy(dtype=np.float64)
+        
+        if multi:
+            r_ticker, tickers = pd.factorize(returns_df[ticker_column].str.upper())
+            e_ticker = tickers.get_indexer(events_df[ticker_column].str.upper())
+        else:
+            r_ticker = np.zeros(len(returns_df), dtype=np.int64)
+            e_ticker = np.zeros(len(events_df), dtype=np.int64)
+        n_tickers = int(r_ticker.max()) + 1 if len(r_ticker) else 0
+        
+        # Abnormal returns
+        if market_returns is not None:
+            returns = returns - market_returns.reindex(returns_df['date']).to_numpy(dtype=np.float64)
+        else:
+            finite = ~np.isnan(returns)
+            totals = np.bincount(r_ticker[finite], weights=returns[finite], minlength=n_tickers)
+            counts = np.bincount(r_ticker[finite], minlength=n_tickers)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                returns = returns - (totals / counts)[r_ticker]
+        
+        # One ticker-then-date ordered array with k NaNs around every ticker
+        order = np.lexsort((r_days, r_ticker))
+        r_ticker, r_days, returns = r_ticker[order], r_days[order], returns[order]
+        padded = np.full(len(returns) + 2 * k * n_tickers, np.nan)
+        padded[np.arange(len(returns)) + (2 * r_ticker + 1) * k] = returns
+        
+        # First trading day on or after each event, within its ticker's history
+        keys = r_ticker * (1 << 32) + r_days
+        e_keys = e_ticker * (1 << 32) + e_days
+        pos = np.searchsorted(keys, e_keys, side='left')
+        first_day = np.full(n_tickers, np.iinfo(np.int64).max)
+        np.minimum.at(first_day, r_ticker, r_days)
+        valid = (e_ticker >= 0) & (pos < len(keys))
+        valid[valid] &= (r_ticker[pos[valid]] == e_ticker[valid]) & \
+            (e_days[valid] >= first_day[e_ticker[valid]])
+        event_rows = np.flatnonzero(valid)
+        start = pos[valid] + 2 * e_ticker[valid] * k
+        windows = sliding_window_view(padded, 2 * k + 1)[start]
+        
+        # Group events and aggregate with segment sums
+        if group_column is None:
+            groups = pd.Series('all', index=event_rows)
+        else:
+            groups = events_df[group_column].iloc[event_rows]
+            if bins is not None:
+                groups = pd.cut(groups, bins)
+        codes, labels = pd.factorize(groups, sort=True)
+        keep = codes >= 0
+        order = np.argsort(codes[keep], kind='stable')
+        grouped = windows[keep][order]
+        sorted_codes = codes[keep][order]
+        offsets = np.arange(-k, k + 1)
+        if len(grouped):
+            starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            present = ~np.isnan(grouped)
+            sums = np.add.reduceat(np.where(present, grouped, 0.0), starts, axis=0)
+            counts = np.add.reduceat(present, starts, axis=0)
+            n_events = np.diff(np.r_[starts, len(sorted_codes)])
+            labels = labels[sorted_codes[starts]]
+        else:
+            sums = counts = np.zeros((0, len(offsets)))
+            n_events = np.zeros(0, dtype=np.int64)
+            labels = labels[:0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            aar = pd.DataFrame((sums / counts).T, index=pd.Index(offsets, name='offset'),
+                               columns=labels)
+        
+        print(f"📐 Event study: {len(event_rows)} of {len(events_df)} events, "
+              f"window [-{k}, +{k}], {len(labels)} groups")
+        return {
+            'offsets': offsets,
+            'windows': windows,
+            'event_rows': event_rows,
+            'groups': np.asarray(groups),
+            'aar': aar,
+            'caar': aar.cumsum(),
+            'n': pd.Series(n_events, index=labels, name='events')
+        }
+    
+    def _rowwise_pearson(self, a, b, mask=None):
+        """Pearson r between matching rows of two 2-D arrays, over the `mask` entries if given"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if mask is None:
+                a = a - a.mean(axis=1, keepdims=True)
+                b = b - b.mean(axis=1, keepdims=True)
+            else:
+                n = mask.sum(axis=1, keepdims=True)
+                a = np.where(mask, a - np.where(mask, a, 0.0).sum(axis=1, keepdims=True) / n, 0.0)
+                b = np.where(mask, b - np.where(mask, b, 0.0).sum(axis=1, keepdims=True) / n, 0.0)
+            r = (a * b).sum(axis=1) / np.sqrt((a * a).sum(axis=1) * (b * b).sum(axis=1))
+        return np.clip(r, -1.0, 1.0)
     
     def _find_close_column(self, df):
         """Find the closing price column"""
@@ -79,6 +669,14 @@ class CorrelationCalculator:
         self._print_correlation_row("Polarity vs Returns", results['correlations']['spearman_polarity'])
         self._print_correlation_row("VADER vs Returns", results['correlations']['spearman_vader'])
         
+        if 'resampling' in results:
+            print("\nRESAMPLING (permutation p, block-bootstrap 95% CI):")
+            print("-" * 40)
+            for name, row in results['resampling'].items():
+                label = name.replace('_', ' ').title()
+                self._print_correlation_row(label, (row['corr'], row['perm_pvalue']))
+                print(f"{'':<30}  CI [{row['ci_low']:7.4f}, {row['ci_high']:7.4f}]")
+        
         print("\nSignificance: *** p<0.001, ** p<0.01, * p<0.05")
         print("=" * 60)
     
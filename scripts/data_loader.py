@@ -1,15 +1,57 @@
 import pandas as pd
 import numpy as np
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+except ImportError:
+    pa = None
+
+# Price columns projected by the universe loader, with fixed dtypes
+OHLCV_DTYPES = {
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'volume': 'float64'
+}
+
+RATINGS_FILE = "raw_analyst_ratings.csv"
+
+# Ratings columns the pipeline reads; compact loaders skip the rest (url, row index)
+RATINGS_COLUMNS = ['headline', 'publisher', 'date', 'stock']
+
+# Compact ratings dtypes: categoricals for low-cardinality columns, Arrow-backed text
+COMPACT_RATINGS_DTYPES = {
+    'headline': 'string[pyarrow]' if pa is not None else 'string',
+    'publisher': 'category',
+    'stock': 'category'
+}
+
+# Compact loads parse the ratings in chunks of this many rows, so raw text
+# columns (such as unparsed dates) never exist for the whole file at once
+COMPACT_CHUNKSIZE = 100_000
+
 class DataLoader:
-    def __init__(self, data_path=None):
+    def __init__(self, data_path=None, use_cache=False, cache_dir=None, compact=False):
         if data_path is None:
             # Try to find data folder automatically
             self.data_path = self._find_data_folder()
         else:
             self.data_path = data_path
+        
+        # Columnar cache of cleaned frames, invalidated by CSV mtime/size
+        self.use_cache = use_cache
+        self.cache_dir = cache_dir or os.path.join(self.data_path, ".cache")
+        
+        # Load ratings with only the used columns, in compact dtypes
+        self.compact = compact
             
         print(f"🔍 Data folder: {os.path.abspath(self.data_path)}")
         
@@ -31,26 +73,17 @@ class DataLoader:
         print("⚠ No data folder found, using ./data")
         return "./data"
     
-    def load_stock_data(self, stock_symbol):
-        """Load stock data for a specific symbol"""
+    def load_stock_data(self, stock_symbol, dtype=None, usecols=None, use_cache=None):
+        """Load stock data for a specific symbol
+        
+        `dtype` and `usecols` take the lowercase column names; the date
+        column is always loaded. `use_cache` overrides the loader default.
+        """
         file_path = os.path.join(self.data_path, f"{stock_symbol}.csv")
         
         if os.path.exists(file_path):
             try:
-                df = pd.read_csv(file_path)
-                df.columns = [col.lower() for col in df.columns]
-                
-                # Find date column
-                date_col = self._find_date_column(df)
-                if date_col:
-                    df = df.rename(columns={date_col: 'date'})
-                    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                    df = df.dropna(subset=['date'])
-                    # Ensure timezone-naive
-                    if df['date'].dt.tz is not None:
-                        df['date'] = df['date'].dt.tz_localize(None)
-                    df['date'] = df['date'].dt.normalize()
-                
+                df = self._load_csv(file_path, dtype, usecols, use_cache)
                 print(f"✅ Loaded {stock_symbol}: {len(df)} records")
                 return df
             except Exception as e:
@@ -60,26 +93,72 @@ class DataLoader:
             print(f"❌ File not found: {file_path}")
             return None
     
-    def load_analyst_ratings(self):
-        """Load analyst ratings data"""
-        file_path = os.path.join(self.data_path, "raw_analyst_ratings.csv")
+    def discover_stock_files(self):
+        """Symbols of every price CSV in the data folder"""
+        if not os.path.isdir(self.data_path):
+            return []
+        return sorted(
+            os.path.splitext(name)[0] for name in os.listdir(self.data_path)
+            if name.lower().endswith('.csv') and name != RATINGS_FILE
+        )
+    
+    def load_universe(self, symbols=None, max_workers=8, use_cache=None):
+        """Load many price files concurrently into one long OHLCV frame
+        
+        Files are read by a bounded thread pool, projecting only the OHLCV
+        columns with fixed dtypes. Returns (frame, report): the frame has
+        'date', 'stock' and the OHLCV columns sorted by date and stock; the
+        report lists seconds, rows and any error per file.
+        """
+        if symbols is None:
+            symbols = self.discover_stock_files()
+        
+        def load_one(symbol):
+            start = time.perf_counter()
+            file_path = os.path.join(self.data_path, f"{symbol}.csv")
+            try:
+                df = self._load_csv(file_path, OHLCV_DTYPES, list(OHLCV_DTYPES), use_cache)
+                error = None
+            except Exception as e:
+                df, error = None, f"{type(e).__name__}: {e}"
+            return symbol, df, time.perf_counter() - start, error
+        
+        frames = {}
+        report = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for symbol, df, seconds, error in pool.map(load_one, symbols):
+                if df is not None:
+                    frames[symbol] = df
+                report.append({'stock': symbol, 'seconds': seconds,
+                               'rows': 0 if df is None else len(df), 'error': error})
+        report = pd.DataFrame(report, columns=['stock', 'seconds', 'rows', 'error'])
+        
+        if frames:
+            universe = pd.concat(frames, names=['stock', None]).reset_index(level='stock')
+            universe = universe.sort_values(['date', 'stock'], kind='stable').reset_index(drop=True)
+            universe = universe[['date', 'stock'] + [c for c in universe.columns
+                                                     if c not in ('date', 'stock')]]
+        else:
+            universe = pd.DataFrame(columns=['date', 'stock'] + list(OHLCV_DTYPES))
+        
+        failed = report['error'].notna().sum()
+        print(f"✅ Loaded universe: {len(frames)} stocks, {len(universe)} rows "
+              f"in {report['seconds'].sum():.2f}s of file time ({failed} failed)")
+        return universe, report
+    
+    def load_analyst_ratings(self, dtype=None, usecols=None, use_cache=None):
+        """Load analyst ratings data
+        
+        `dtype` and `usecols` take the lowercase column names; the date
+        column is always loaded. `use_cache` overrides the loader default.
+        """
+        file_path = os.path.join(self.data_path, RATINGS_FILE)
+        dtype, usecols = self._ratings_options(dtype, usecols)
         
         if os.path.exists(file_path):
             try:
-                df = pd.read_csv(file_path)
-                df.columns = [col.lower() for col in df.columns]
-                
-                # Find date column
-                date_col = self._find_date_column(df)
-                if date_col:
-                    df = df.rename(columns={date_col: 'date'})
-                    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                    df = df.dropna(subset=['date'])
-                    # Ensure timezone-naive
-                    if df['date'].dt.tz is not None:
-                        df['date'] = df['date'].dt.tz_localize(None)
-                    df['date'] = df['date'].dt.normalize()
-                
+                df = self._load_csv(file_path, dtype, usecols, use_cache,
+                                    chunksize=COMPACT_CHUNKSIZE if self.compact else None)
                 print(f"✅ Loaded analyst ratings: {len(df)} records")
                 return df
             except Exception as e:
@@ -89,33 +168,273 @@ class DataLoader:
             print(f"❌ Analyst ratings file not found: {file_path}")
             return None
     
+    def iter_analyst_ratings(self, chunksize=100_000, dtype=None, usecols=None):
+        """Yield cleaned chunks of the analyst ratings file
+        
+        Only `chunksize` rows are parsed and held at a time.
+        """
+        file_path = os.path.join(self.data_path, RATINGS_FILE)
+        dtype, usecols = self._ratings_options(dtype, usecols)
+        read_kwargs = self._read_kwargs(file_path, dtype, usecols)
+        for chunk in pd.read_csv(file_path, chunksize=chunksize, **read_kwargs):
+            yield self._clean_frame(chunk)
+    
+    def partition_analyst_ratings(self, chunksize=100_000, out_dir=None, symbols=None,
+                                  dtype=None, usecols=None):
+        """Stream the ratings file into per-ticker partitions
+        
+        Each chunk is cleaned and routed by its uppercased `stock` value.
+        With `out_dir` the partitions are appended to `{SYMBOL}.csv` files
+        there and a dict of paths is returned; otherwise a dict of frames is
+        returned. `symbols` restricts which tickers are kept.
+        """
+        wanted = {symbol.upper() for symbol in symbols} if symbols is not None else None
+        in_memory = {}
+        counts = {}
+        total = 0
+        
+        if out_dir is not None:
+            os.makedirs(out_dir, exist_ok=True)
+        
+        for chunk in self.iter_analyst_ratings(chunksize, dtype, usecols):
+            total += len(chunk)
+            keys = chunk['stock'].astype(str).str.upper()
+            for symbol, part in chunk.groupby(keys.values, sort=False):
+                if wanted is not None and symbol not in wanted:
+                    continue
+                if out_dir is None:
+                    in_memory.setdefault(symbol, []).append(part)
+                else:
+                    path = self._partition_path(out_dir, symbol)
+                    first = symbol not in counts
+                    part.to_csv(path, mode='w' if first else 'a', header=first,
+                                index=False, date_format='%Y-%m-%d')
+                counts[symbol] = counts.get(symbol, 0) + len(part)
+        
+        print(f"✅ Partitioned {total} ratings into {len(counts)} tickers")
+        
+        if out_dir is None:
+            # Chunks carry their own categories, so recompact after concatenating
+            return {symbol: self._compact_ratings(pd.concat(parts))
+                    for symbol, parts in in_memory.items()}
+        
+        with open(os.path.join(out_dir, "_partitions.json"), 'w') as f:
+            json.dump(counts, f)
+        return {symbol: self._partition_path(out_dir, symbol) for symbol in counts}
+    
+    def load_ratings_partition(self, stock_symbol, partition_dir):
+        """Load one ticker's ratings written by partition_analyst_ratings"""
+        with open(os.path.join(partition_dir, "_partitions.json")) as f:
+            counts = json.load(f)
+        
+        if stock_symbol.upper() not in counts:
+            print(f"⚠ No ratings partition for {stock_symbol}")
+            return pd.DataFrame(columns=['date', 'stock'])
+        
+        dtype, usecols = self._ratings_options()
+        df = self._read_clean_csv(self._partition_path(partition_dir, stock_symbol),
+                                  dtype, usecols)
+        print(f"✅ Loaded {stock_symbol} ratings partition: {len(df)} records")
+        return df
+    
+    def _ratings_options(self, dtype=None, usecols=None):
+        """Ratings dtype/usecols, defaulting to the compact layout in compact mode"""
+        if not self.compact:
+            return dtype, usecols
+        return {**COMPACT_RATINGS_DTYPES, **(dtype or {})}, usecols or RATINGS_COLUMNS
+    
+    def _compact_ratings(self, df):
+        """Restore the compact dtypes of a frame built from several chunks"""
+        if not self.compact:
+            return df
+        return df.astype({col: col_type for col, col_type in COMPACT_RATINGS_DTYPES.items()
+                          if col in df.columns})
+    
+    def _partition_path(self, partition_dir, stock_symbol):
+        """File holding one ticker's partition"""
+        safe_name = stock_symbol.upper().replace('/', '_').replace('\\', '_')
+        return os.path.join(partition_dir, f"{safe_name}.csv")
+    
+    def _load_csv(self, file_path, dtype=None, usecols=None, use_cache=None, chunksize=None):
+        """Load a cleaned frame, from the columnar cache when it is fresh"""
+        if use_cache is None:
+            use_cache = self.use_cache
+        if use_cache and pa is None:
+            print("⚠ pyarrow is not installed, columnar cache disabled")
+            use_cache = False
+        
+        if not use_cache:
+            return self._read_clean_csv(file_path, dtype, usecols, chunksize)
+        
+        stat = os.stat(file_path)
+        cache_path = self._cache_path(file_path, dtype, usecols)
+        df = self._read_cache(cache_path, stat)
+        if df is None:
+            df = self._read_clean_csv(file_path, dtype, usecols, chunksize)
+            self._write_cache(df, cache_path, stat)
+        return df
+    
+    def _read_clean_csv(self, file_path, dtype=None, usecols=None, chunksize=None):
+        """Parse a CSV and apply the standard column/date cleaning
+        
+        With `chunksize` each chunk is cleaned as soon as it is parsed.
+        """
+        read_kwargs = self._read_kwargs(file_path, dtype, usecols)
+        if chunksize is None:
+            return self._clean_frame(pd.read_csv(file_path, **read_kwargs))
+        chunks = [self._clean_frame(chunk)
+                  for chunk in pd.read_csv(file_path, chunksize=chunksize, **read_kwargs)]
+        return self._compact_ratings(pd.concat(chunks, ignore_index=True))
+    
+    def _read_kwargs(self, file_path, dtype=None, usecols=None):
+        """Translate lowercase dtype/usecols options into read_csv arguments"""
+        read_kwargs = {}
+        if dtype is not None or usecols is not None:
+            # Map lowercase names back to the raw CSV header
+            header = pd.read_csv(file_path, nrows=0).columns
+            raw_names = {col.lower(): col for col in header}
+            if usecols is not None:
+                wanted = {col.lower() for col in usecols}
+                date_col = self._find_date_name(raw_names)
+                if date_col:
+                    wanted.add(date_col)
+                read_kwargs['usecols'] = [raw_names[col] for col in raw_names if col in wanted]
+            if dtype is not None:
+                read_kwargs['dtype'] = {raw_names[col.lower()]: col_type
+                                        for col, col_type in dtype.items()
+                                        if col.lower() in raw_names}
+        return read_kwargs
+    
+    def _clean_frame(self, df):
+        """Lowercase columns and normalize the date column to naive days"""
+        df.columns = [col.lower() for col in df.columns]
+        
+        # Find date column
+        date_col = self._find_date_column(df)
+        if date_col:
+            df = df.rename(columns={date_col: 'date'})
+            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+            df = df.dropna(subset=['date'])
+            # Ensure timezone-naive
+            if df['date'].dt.tz is not None:
+                df['date'] = df['date'].dt.tz_localize(None)
+            df['date'] = df['date'].dt.normalize()
+        return df
+    
+    def _cache_path(self, file_path, dtype=None, usecols=None):
+        """Cache file for a CSV and a given set of load options"""
+        options = repr((sorted(c.lower() for c in usecols) if usecols is not None else None,
+                        sorted((c.lower(), str(t)) for c, t in dtype.items()) if dtype else None))
+        key = hashlib.sha1(options.encode('utf-8')).hexdigest()[:12]
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        return os.path.join(self.cache_dir, f"{name}.{key}.arrow")
+    
+    def _read_cache(self, cache_path, stat):
+        """Memory-map a cached frame, or None when missing or stale"""
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with pa.memory_map(cache_path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+            meta = table.schema.metadata or {}
+            if (meta.get(b'source_mtime_ns') != str(stat.st_mtime_ns).encode()
+                    or meta.get(b'source_size') != str(stat.st_size).encode()):
+                return None
+            return table.to_pandas()
+        except (OSError, pa.ArrowInvalid):
+            return None
+    
+    def _write_cache(self, df, cache_path, stat):
+        """Store a cleaned frame as an uncompressed Arrow IPC file"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=None)
+            meta = dict(table.schema.metadata or {})
+            meta[b'source_mtime_ns'] = str(stat.st_mtime_ns).encode()
+            meta[b'source_size'] = str(stat.st_size).encode()
+            table = table.replace_schema_metadata(meta)
+            
+            tmp_path = cache_path + ".tmp"
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, cache_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"⚠ Could not write cache {cache_path}: {e}")
+    
     def _find_date_column(self, df):
         """Find the date column in a dataframe"""
-        date_columns = [col for col in df.columns if 'date' in col.lower()]
+        return self._find_date_name(df.columns)
+    
+    def _find_date_name(self, columns):
+        """Find the date column among column names"""
+        date_columns = [col for col in columns if 'date' in col.lower()]
         return date_columns[0] if date_columns else None
     
-    def align_dates(self, news_df, stock_df):
-        """Align dates between news and stock data with timezone handling"""
-        # Make copies to avoid modifying originals
-        news_df = news_df.copy()
-        stock_df = stock_df.copy()
+    def _naive_day_dates(self, df):
+        """Frame whose 'date' is timezone-naive and normalized to days
+        
+        Frames from the loaders already are and are returned untouched;
+        only the date column is replaced otherwise.
+        """
+        dates = df['date']
+        aware = dates.dt.tz is not None
+        if aware:
+            print("   Converting dates to timezone-naive...")
+            dates = dates.dt.tz_localize(None)
+        values = dates.to_numpy()
+        days = values.astype('datetime64[D]').astype(values.dtype)
+        if aware or (values != days).any():
+            df = df.assign(date=days)
+        return df
+    
+    def _slice_dates(self, df, start, end):
+        """Rows with start <= date <= end; a view when dates are sorted"""
+        dates = df['date']
+        if dates.is_monotonic_increasing:
+            values = dates.to_numpy()
+            lo = np.searchsorted(values, np.datetime64(start), side='left')
+            hi = np.searchsorted(values, np.datetime64(end), side='right')
+            return df.iloc[lo:hi]
+        return df[(dates >= start) & (dates <= end)]
+    
+    def align_dates(self, news_df, stock_df, map_to_trading_days=False):
+        """Align dates between news and stock data with timezone handling
         
+        Both frames are cut to their common date range without copying
+        when their dates are already sorted. With `map_to_trading_days`,
+        news published on weekends or holidays is moved to the next trading
+        day of the stock's calendar so the later merge does not drop it.
+        """
         print(f"📅 Date alignment started...")
         print(f"   News dates: {news_df['date'].min()} to {news_df['date'].max()} (tz: {'aware' if news_df['date'].dt.tz is not None else 'naive'})")
         print(f"   Stock dates: {stock_df['date'].min()} to {stock_df['date'].max()} (tz: {'aware' if stock_df['date'].dt.tz is not None else 'naive'})")
         
-        # Ensure both are timezone-naive for comparison
-        if news_df['date'].dt.tz is not None:
-            print("   Converting news dates to timezone-naive...")
-            news_df['date'] = news_df['date'].dt.tz_localize(None)
-        
-        if stock_df['date'].dt.tz is not None:
-            print("   Converting stock dates to timezone-naive...")
-            stock_df['date'] = stock_df['date'].dt.tz_localize(None)
+        # Ensure both are timezone-naive days
+        news_df = self._naive_day_dates(news_df)
+        stock_df = self._naive_day_dates(stock_df)
+        if len(news_df) == 0 or len(stock_df) == 0:
+            print("❌ No overlapping date range between news and stock data")
+            return pd.DataFrame(), pd.DataFrame()
         
-        # Normalize dates (remove time component)
-        news_df['date'] = news_df['date'].dt.normalize()
-        stock_df['date'] = stock_df['date'].dt.normalize()
+        if map_to_trading_days:
+            trading_days = stock_df['date'].to_numpy()
+            if not stock_df['date'].is_monotonic_increasing:
+                trading_days = np.unique(trading_days)
+            news_dates = news_df['date'].to_numpy()
+            # Next trading day on or after each headline inside the calendar
+            pos = np.searchsorted(trading_days, news_dates, side='left')
+            in_calendar = (pos < len(trading_days)) & (news_dates >= trading_days[0])
+            mapped = trading_days[np.minimum(pos, len(trading_days) - 1)]
+            moved = int((in_calendar & (mapped != news_dates)).sum())
+            if moved:
+                if not in_calendar.all():
+                    news_df, mapped = news_df[in_calendar], mapped[in_calendar]
+                news_df = news_df.assign(date=mapped)
+                print(f"   Mapped {moved} non-trading-day news records to the next trading day")
+            if len(news_df) == 0:
+                print("❌ No overlapping date range between news and stock data")
+                return pd.DataFrame(), pd.DataFrame()
         
         # Find common date range
         common_start = max(news_df['date'].min(), stock_df['date'].min())
@@ -126,15 +445,8 @@ class DataLoader:
             return pd.DataFrame(), pd.DataFrame()
         
         # Filter to common range
-        news_aligned = news_df[
-            (news_df['date'] >= common_start) & 
-            (news_df['date'] <= common_end)
-        ].copy()
-        
-        stock_aligned = stock_df[
-            (stock_df['date'] >= common_start) & 
-            (stock_df['date'] <= common_end)
-        ].copy()
+        news_aligned = self._slice_dates(news_df, common_start, common_end)
+        stock_aligned = self._slice_dates(stock_df, common_start, common_end)
         
         print(f"✅ Date alignment: {common_start} to {common_end}")
         print(f"   News records: {len(news_aligned)}")
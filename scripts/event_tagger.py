@@ -0,0 +1,167 @@
+import re
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Market events and the headline phrases that signal them
+DEFAULT_EVENTS = {
+    'fda_approval': ["fda approval", "fda approves", "fda approved", "fda clearance",
+                     "fda clears"],
+    'price_target': ["price target", "pt to", "raises pt", "lowers pt", "maintains pt"],
+    'upgrade': ["upgrade", "upgrades", "upgraded"],
+    'downgrade': ["downgrade", "downgrades", "downgraded"],
+    'earnings': ["earnings", "eps", "quarterly results", "beats estimates",
+                 "misses estimates", "q1", "q2", "q3", "q4"],
+    'guidance': ["guidance", "outlook", "forecast"],
+    'merger': ["merger", "acquisition", "to acquire", "acquires", "buyout", "takeover"],
+    'dividend': ["dividend", "dividends"],
+    'buyback': ["buyback", "share repurchase", "stock repurchase"],
+    'legal': ["lawsuit", "sues", "sued", "investigation", "probe", "settlement"],
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text):
+    return _WORD.findall(text.lower())
+
+
+class EventTagger:
+    """Tags headlines with market events using one word-level automaton
+
+    All phrases are compiled into a single Aho-Corasick automaton over
+    words, so every headline is tagged in one pass over its words whatever
+    the number of phrases. Repeated headlines are only tagged once.
+    """
+
+    def __init__(self, events=None):
+        self.events = dict(events or DEFAULT_EVENTS)
+        self.event_names = list(self.events)
+        self._build()
+
+    def _build(self):
+        """Trie of phrase words plus failure links and merged outputs"""
+        goto = [{}]
+        outputs = [set()]
+        for event_id, name in enumerate(self.event_names):
+            for phrase in self.events[name]:
+                state = 0
+                for word in _words(phrase):
+                    if word not in goto[state]:
+                        goto.append({})
+                        outputs.append(set())
+                        goto[state][word] = len(goto) - 1
+                    state = goto[state][word]
+                outputs[state].add(event_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and word not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(word, 0)
+                outputs[child] |= outputs[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [frozenset(out) for out in outputs]
+
+    def tag_text(self, text):
+        """Set of event ids found in one text"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = set()
+        state = 0
+        for word in _words(text):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+    def tag(self, texts):
+        """Tag a sequence of texts into an EventIndex over their positions"""
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+        unique_rows = []
+        unique_events = []
+        for i, text in enumerate(uniques):
+            for event_id in self.tag_text(str(text)):
+                unique_rows.append(i)
+                unique_events.append(event_id)
+
+        # Expand unique-text hits to every row carrying that text
+        hits = np.zeros((len(uniques), len(self.event_names)), dtype=bool)
+        hits[np.asarray(unique_rows, dtype=np.int64),
+             np.asarray(unique_events, dtype=np.int64)] = True
+        present = np.flatnonzero(codes >= 0)
+        events, positions = np.nonzero(hits[codes[present]].T)
+        return EventIndex(self.event_names, events, present[positions], len(codes))
+
+    def tag_dataframe(self, df, text_column='headline'):
+        """Tag a frame's headlines; row ids are positions in `df`"""
+        index = self.tag(df[text_column])
+        print(f"🏷 Tagged {index.tagged_rows()} of {len(df)} headlines with events")
+        return index
+
+
+class EventIndex:
+    """Inverted index from event to the sorted positions of its rows"""
+
+    def __init__(self, event_names, events, row_ids, n_rows):
+        self.event_names = list(event_names)
+        self.n_rows = n_rows
+        # `events` is sorted, so each event's rows form one block
+        counts = np.bincount(events, minlength=len(self.event_names))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.row_ids = np.asarray(row_ids, dtype=np.int64)
+        self._slots = {name: i for i, name in enumerate(self.event_names)}
+
+    def rows(self, event):
+        """Positions of the rows tagged with `event`"""
+        slot = self._slots[event]
+        return self.row_ids[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def mask(self, event):
+        """Boolean row mask for `event`"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.rows(event)] = True
+        return mask
+
+    def counts(self):
+        """Number of tagged rows per event"""
+        return pd.Series(np.diff(self.offsets), index=self.event_names, name='rows')
+
+    def tagged_rows(self):
+        """Number of rows with at least one event"""
+        return len(np.unique(self.row_ids))
+
+    def daily_counts(self, dates):
+        """Per-day row counts of each event as 'event_<name>' columns
+
+        `dates` holds the date of every indexed row.
+        """
+        day_codes, days = pd.factorize(pd.Series(dates), sort=True)
+        events = np.repeat(np.arange(len(self.event_names)), np.diff(self.offsets))
+        flat = day_codes[self.row_ids] * len(self.event_names) + events
+        valid = day_codes[self.row_ids] >= 0
+        counts = np.bincount(flat[valid], minlength=len(days) * len(self.event_names))
+        daily = pd.DataFrame(counts.reshape(len(days), len(self.event_names)),
+                             columns=[f"event_{name}" for name in self.event_names])
+        daily.insert(0, 'date', days)
+        return daily
+
+    def __contains__(self, event):
+        return event in self._slots
+
+    def __len__(self):
+        return len(self.event_names)
+
+
+if __name__ == "__main__":
+    tagger = EventTagger()
+    print(tagger.tag(["FDA approves new drug", "Goldman raises price target"]).counts())
@@ -0,0 +1,236 @@
+import string
+
+import numpy as np
+import pandas as pd
+
+# Identity of the vectorized scorer, used to namespace cached scores
+FAST_VADER_VERSION = "1"
+
+# Documented agreement with NLTK's polarity_scores: the rules are the same,
+# so only float rounding of the final 4 (compound) / 3 (pos, neg, neu)
+# decimals can differ
+COMPOUND_TOLERANCE = 1e-4
+PROPORTION_TOLERANCE = 1e-3
+
+_PUNCTUATION = set(string.punctuation)
+
+
+class FastVader:
+    """Batch VADER scorer over a compiled lexicon
+
+    The lexicon is compiled once into a token -> index table and a valence
+    array. A batch is split into one flat token array; per-token features
+    (valence, boosters, negations, capitals) are looked up for the unique
+    tokens only, and VADER's rules - capital emphasis, the three-word
+    booster/negation window, "least", "but" and punctuation emphasis - are
+    applied as array operations before a bincount per headline.
+    """
+
+    def __init__(self, lexicon):
+        from nltk.sentiment.vader import VaderConstants
+        self.constants = VaderConstants()
+        self.token_ids = {token: i for i, token in enumerate(lexicon)}
+        self.valences = np.fromiter(lexicon.values(), dtype=np.float64, count=len(lexicon))
+
+    def _token_form(self, token):
+        """NLTK's token after stripping one leading or trailing punctuation mark"""
+        for punc in self.constants.PUNC_LIST:
+            for word in (token[len(punc):] if token.startswith(punc) else None,
+                         token[:-len(punc)] if token.endswith(punc) else None):
+                if word and len(word) > 1 and not _PUNCTUATION.intersection(word):
+                    return word
+        return token
+
+    def _tokenize(self, texts):
+        """Flat token codes, their headline ids and the unique token strings"""
+        words = [text.split() for text in texts]
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        raw_codes, raw_uniques = pd.factorize(
+            pd.Series([word for text_words in words for word in text_words], dtype=object)
+        )
+        doc = np.repeat(np.arange(len(texts)), lengths)
+
+        # Singletons are dropped and punctuation stripped per unique token
+        keep = np.fromiter((len(word) > 1 for word in raw_uniques), dtype=bool,
+                           count=len(raw_uniques))[raw_codes]
+        codes, uniques = pd.factorize(
+            pd.Series([self._token_form(word) for word in raw_uniques], dtype=object)
+        )
+        return codes[raw_codes[keep]], doc[keep], list(uniques)
+
+    def _token_features(self, uniques):
+        """Per unique token: lexicon valence, flags and booster scalar"""
+        constants = self.constants
+        lower = [word.lower() for word in uniques]
+        lex_ids = np.fromiter((self.token_ids.get(word, -1) for word in lower),
+                              dtype=np.int64, count=len(lower))
+        in_lexicon = lex_ids >= 0
+        valence = np.where(in_lexicon, self.valences[lex_ids], 0.0)
+
+        def flags(predicate):
+            return np.fromiter(map(predicate, lower), dtype=bool, count=len(lower))
+
+        return {
+            'valence': valence,
+            'in_lexicon': in_lexicon,
+            'upper': np.fromiter((word.isupper() for word in uniques), dtype=bool,
+                                 count=len(uniques)),
+            'booster': np.fromiter((constants.BOOSTER_DICT.get(word, 0.0) for word in lower),
+                                   dtype=np.float64, count=len(lower)),
+            'negated': flags(lambda word: word in constants.NEGATE or "n't" in word),
+            'least': flags(lambda word: word == "least"),
+            'at_very': flags(lambda word: word in ("at", "very")),
+            'never': np.array([word == "never" for word in uniques], dtype=bool),
+            'so_this': np.array([word in ("so", "this") for word in uniques], dtype=bool),
+            'kind': flags(lambda word: word == "kind"),
+            'of': flags(lambda word: word == "of"),
+            'but': flags(lambda word: word == "but"),
+        }
+
+    def polarity_scores(self, texts):
+        """Score a batch of texts; returns arrays 'compound', 'pos', 'neg', 'neu'"""
+        constants = self.constants
+        texts = [str(text) for text in texts]
+        n_docs = len(texts)
+        codes, doc, uniques = self._tokenize(texts)
+        n = len(codes)
+        unique_features = self._token_features(uniques)
+        f = {name: values[codes] for name, values in unique_features.items()}
+
+        # Position of each token within its headline
+        starts = np.searchsorted(doc, np.arange(n_docs))
+        pos = np.arange(n) - starts[doc]
+
+        # Capital emphasis only counts when some but not all tokens are capitals
+        n_tokens = np.bincount(doc, minlength=n_docs)
+        n_upper = np.bincount(doc, weights=f['upper'], minlength=n_docs)
+        cap_diff = ((n_tokens - n_upper > 0) & (n_upper > 0))[doc]
+
+        def prev(name, k):
+            """Feature of the token k places earlier in the same headline"""
+            shifted = np.zeros(n, dtype=f[name].dtype)
+            shifted[k:] = f[name][:-k] if k else f[name]
+            return np.where(pos >= k, shifted, shifted.dtype.type(0))
+
+        code_of = {word: i for i, word in enumerate(uniques)}
+        offset_codes = {}
+
+        def phrase_at(phrase, offsets):
+            """Whether the tokens at `offsets` from each token spell `phrase`"""
+            words = phrase.split(" ")
+            match = np.full(n, len(words) == len(offsets))
+            for word, offset in zip(words, offsets):
+                if offset not in offset_codes:
+                    index = np.arange(n) + offset
+                    valid = (index >= 0) & (index < n)
+                    index = np.clip(index, 0, max(n - 1, 0))
+                    offset_codes[offset] = np.where(valid & (doc[index] == doc), codes[index], -1)
+                match &= offset_codes[offset] == code_of.get(word, -2)
+            return match
+
+        valence = f['valence'].copy()
+        caps = f['upper'] & cap_diff
+        valence += np.where(caps, np.where(valence > 0, constants.C_INCR, -constants.C_INCR), 0)
+
+        # Boosters and negations in the three preceding words
+        for k, damping in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            active = (pos >= k) & ~prev('in_lexicon', k)
+            scalar = np.where(valence < 0, -prev('booster', k), prev('booster', k))
+            cap_boost = (prev('booster', k) != 0) & prev('upper', k) & cap_diff
+            scalar += np.where(cap_boost, np.where(valence > 0, constants.C_INCR,
+                                                   -constants.C_INCR), 0)
+            valence = np.where(active, valence + scalar * damping, valence)
+
+            if k == 1:
+                factor = np.where(prev('negated', 1), constants.N_SCALAR, 1.0)
+            elif k == 2:
+                factor = np.where(prev('never', 2) & prev('so_this', 1), 1.5,
+                                  np.where(prev('negated', 2), constants.N_SCALAR, 1.0))
+            else:
+                emphasis = (prev('never', 3) & prev('so_this', 2)) | prev('so_this', 1)
+                factor = np.where(emphasis, 1.25,
+                                  np.where(prev('negated', 3), constants.N_SCALAR, 1.0))
+            valence = np.where(active, valence * factor, valence)
+            if k == 3:
+                valence = np.where(active, self._idiom_valence(valence, phrase_at), valence)
+
+        least = (pos >= 1) & prev('least', 1) & ~prev('in_lexicon', 1)
+        least &= ~((pos >= 2) & prev('at_very', 2))
+        valence = np.where(least, valence * constants.N_SCALAR, valence)
+
+        # Boosters and "kind of" carry no sentiment of their own
+        next_of = np.zeros(n, dtype=bool)
+        next_of[:-1] = f['of'][1:] & (doc[1:] == doc[:-1])
+        skip = (f['booster'] != 0) | (f['kind'] & next_of)
+        valence = np.where(f['in_lexicon'] & ~skip, valence, 0.0)
+
+        # NLTK scores every repeat of a token at its first position
+        keys = doc * len(uniques) + codes
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        sentiment = valence[first[inverse]]
+
+        # Words before the first "but" are halved, words after it weigh 1.5x
+        but_pos = np.full(n_docs, np.iinfo(np.int64).max)
+        np.minimum.at(but_pos, doc[f['but']], pos[f['but']])
+        has_but = but_pos[doc] != np.iinfo(np.int64).max
+        sentiment = np.where(has_but & (pos < but_pos[doc]), sentiment * 0.5, sentiment)
+        sentiment = np.where(has_but & (pos > but_pos[doc]), sentiment * 1.5, sentiment)
+
+        return self._score_valence(texts, doc, sentiment, n_tokens)
+
+    def _idiom_valence(self, valence, phrase_at):
+        """Special-case idioms and two-word dampeners around each token"""
+        constants = self.constants
+        idioms = constants.SPECIAL_CASE_IDIOMS
+        # The first matching sequence before the word wins ...
+        matched = np.zeros(len(valence), dtype=bool)
+        idiom_valence = np.zeros(len(valence))
+        for offsets in ((-1, 0), (-2, -1, 0), (-2, -1), (-3, -2, -1), (-3, -2)):
+            for phrase, value in idioms.items():
+                hit = phrase_at(phrase, offsets) & ~matched
+                idiom_valence[hit] = value
+                matched |= hit
+        valence = np.where(matched, idiom_valence, valence)
+        # ... and sequences starting at the word override it
+        for offsets in ((0, 1), (0, 1, 2)):
+            for phrase, value in idioms.items():
+                valence = np.where(phrase_at(phrase, offsets), value, valence)
+
+        dampened = np.zeros(len(valence), dtype=bool)
+        for phrase in constants.BOOSTER_DICT:
+            if " " in phrase:
+                dampened |= phrase_at(phrase, (-3, -2)) | phrase_at(phrase, (-2, -1))
+        return np.where(dampened, valence + constants.B_DECR, valence)
+
+    def _score_valence(self, texts, doc, sentiment, n_tokens):
+        """Compound and pos/neg/neu proportions per headline"""
+        n_docs = len(texts)
+        series = pd.Series(texts, dtype=object)
+        ep = np.minimum(series.str.count("!").to_numpy(), 4) * 0.292
+        qm_count = series.str.count(r"\?").to_numpy()
+        qm = np.where(qm_count > 3, 0.96, np.where(qm_count > 1, qm_count * 0.18, 0.0))
+        amplifier = ep + qm
+
+        sum_s = np.bincount(doc, weights=sentiment, minlength=n_docs)
+        sum_s = sum_s + np.sign(sum_s) * amplifier
+        compound = sum_s / np.sqrt(sum_s * sum_s + 15)
+
+        pos_sum = np.bincount(doc, weights=np.where(sentiment > 0, sentiment + 1, 0),
+                              minlength=n_docs)
+        neg_sum = np.bincount(doc, weights=np.where(sentiment < 0, sentiment - 1, 0),
+                              minlength=n_docs)
+        neu_count = np.bincount(doc, weights=sentiment == 0, minlength=n_docs)
+        pos_sum = np.where(pos_sum > -neg_sum, pos_sum + amplifier, pos_sum)
+        neg_sum = np.where(pos_sum < -neg_sum, neg_sum - amplifier, neg_sum)
+
+        total = pos_sum - neg_sum + neu_count
+        has_tokens = n_tokens > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            proportions = [np.where(has_tokens, np.abs(s / total), 0.0)
+                           for s in (pos_sum, neg_sum, neu_count)]
+        return {
+            'compound': np.where(has_tokens, np.round(compound, 4), 0.0),
+            'pos': np.round(proportions[0], 3),
+            'neg': np.round(proportions[1], 3),
+            'neu': np.round(proportions[2], 3)
+        }
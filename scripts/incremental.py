@@ -0,0 +1,200 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from correlation_calculator import RunningCorrelation
+
+# Sentiment columns whose correlation with daily_return is tracked
+TRACKED_COLUMNS = ['avg_polarity', 'avg_vader_compound', 'positive_ratio']
+
+
+class CheckpointStore:
+    """Per-ticker JSON checkpoints for incremental analysis"""
+
+    def __init__(self, checkpoint_dir="./results/checkpoints"):
+        self.checkpoint_dir = checkpoint_dir
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def _path(self, stock_symbol):
+        return os.path.join(self.checkpoint_dir, f"{stock_symbol.upper()}.json")
+
+    def load(self, stock_symbol):
+        """Return the stored checkpoint dict, or None for a first run"""
+        path = self._path(stock_symbol)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save(self, stock_symbol, checkpoint):
+        """Atomically replace a ticker's checkpoint"""
+        path = self._path(stock_symbol)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def clear(self, stock_symbol):
+        path = self._path(stock_symbol)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class IncrementalAnalyzer:
+    """Append-only analysis that only processes days after the last checkpoint
+
+    A checkpoint holds the last processed trading date, that day's close
+    (to compute the next return) and the running sufficient statistics of
+    each sentiment/return correlation. A run loads price and news rows
+    after the checkpoint, scores, tags and aggregates only those (news on
+    non-trading days counts toward the next session, as in analyze_stock),
+    appends them to `{SYMBOL}_results.csv` and folds them into the running
+    correlations.
+
+    The returned 'combined_data' is the whole results file, so plots and
+    panel correlations see every day; 'new_data' holds the appended days.
+    Headlines dated on or before the checkpoint that arrive late are not
+    revisited. Spearman correlations need the full ranks and are not
+    maintained incrementally.
+    """
+
+    def __init__(self, components, results_dir="./results", checkpoint_dir=None):
+        self.loader = components['loader']
+        self.sentiment_analyzer = components['sentiment_analyzer']
+        self.event_tagger = components['event_tagger']
+        self.correlation_calculator = components['correlation_calculator']
+        self.results_dir = results_dir
+        self.store = CheckpointStore(checkpoint_dir or os.path.join(results_dir, "checkpoints"))
+
+    def update(self, stock_symbol, stock_ratings):
+        """Process new days for one ticker; returns the same dict as analyze_stock"""
+        checkpoint = self.store.load(stock_symbol)
+        results_path = os.path.join(self.results_dir, f"{stock_symbol}_results.csv")
+        if checkpoint is not None and not os.path.exists(results_path):
+            # The running statistics cover days the results file no longer has
+            print(f"⚠ {stock_symbol}_results.csv is missing; rebuilding from scratch")
+            self.store.clear(stock_symbol)
+            checkpoint = None
+        last_date = pd.Timestamp(checkpoint['last_date']) if checkpoint else None
+
+        stock_df = self.loader.load_stock_data(stock_symbol)
+        if stock_df is None:
+            return None
+        close_col = self.correlation_calculator._find_close_column(stock_df)
+        if not close_col:
+            raise ValueError("Could not find closing price column")
+
+        # 1. Keep only rows after the checkpoint
+        new_stock = stock_df.sort_values('date')
+        if last_date is not None:
+            new_stock = new_stock[new_stock['date'] > last_date]
+        if len(new_stock) == 0:
+            print(f"✅ {stock_symbol} is up to date ({checkpoint['last_date']})")
+            return self._result(stock_symbol, None, self._stats(checkpoint),
+                                checkpoint['first_date'], last_date)
+
+        end_date = new_stock['date'].iloc[-1]
+        stock_ratings = self.loader._naive_day_dates(stock_ratings)
+        news_mask = stock_ratings['date'] <= end_date
+        if last_date is not None:
+            news_mask &= stock_ratings['date'] > last_date
+        new_news = stock_ratings[news_mask]
+        print(f"🆕 {stock_symbol}: {len(new_news)} new ratings, {len(new_stock)} new price rows")
+
+        # 2. Returns; the first new day is measured from the checkpointed close
+        stock_with_returns = self.correlation_calculator.calculate_daily_returns(new_stock.copy())
+        if checkpoint is not None:
+            first_close = stock_with_returns[close_col].iloc[0]
+            stock_with_returns.iloc[0, stock_with_returns.columns.get_loc('daily_return')] = (
+                (first_close / checkpoint['last_close'] - 1) * 100
+            )
+
+        # 3. Sentiment and events for the new headlines only
+        if len(new_news) > 0:
+            new_news, _ = self.loader.align_dates(new_news, new_stock, map_to_trading_days=True)
+        if len(new_news) > 0:
+            news_with_sentiment = self.sentiment_analyzer.analyze_dataframe(new_news)
+            daily_sentiment = self.sentiment_analyzer.aggregate_daily_sentiment(news_with_sentiment)
+            events = self.event_tagger.tag_dataframe(news_with_sentiment)
+            daily_sentiment = pd.merge(daily_sentiment,
+                                       events.daily_counts(news_with_sentiment['date']),
+                                       on='date', how='left')
+            new_combined = pd.merge(daily_sentiment, stock_with_returns, on='date', how='inner')
+        else:
+            new_combined = pd.DataFrame()
+
+        # 4. Fold the new days into the running correlations
+        stats = self._stats(checkpoint)
+        first_date = (checkpoint or {}).get('first_date')
+        if len(new_combined) > 0:
+            clean = new_combined.dropna(subset=['avg_polarity', 'daily_return', 'avg_vader_compound'])
+            for col in TRACKED_COLUMNS:
+                stats[col].update(clean[col].to_numpy(), clean['daily_return'].to_numpy())
+
+            # 5. Append to the stored combined data
+            os.makedirs(self.results_dir, exist_ok=True)
+            first_write = checkpoint is None
+            new_combined.to_csv(results_path, mode='w' if first_write else 'a',
+                                header=first_write, index=False)
+            print(f"💾 Appended {len(new_combined)} days to {stock_symbol}_results.csv")
+            first_date = first_date or str(new_combined['date'].min().date())
+
+        last_row = stock_with_returns.iloc[-1]
+        self.store.save(stock_symbol, {
+            'last_date': str(last_row['date'].date()),
+            'last_close': float(last_row[close_col]),
+            'first_date': first_date,
+            'correlations': {col: stats[col].to_dict() for col in TRACKED_COLUMNS}
+        })
+
+        return self._result(stock_symbol, new_combined, stats, first_date, last_row['date'])
+
+    def _stats(self, checkpoint):
+        """Running correlations restored from a checkpoint, or empty ones"""
+        return {
+            col: RunningCorrelation.from_dict(checkpoint['correlations'][col]) if checkpoint
+            else RunningCorrelation()
+            for col in TRACKED_COLUMNS
+        }
+
+    def _result(self, stock_symbol, new_combined, stats, first_date, last_date):
+        """analyze_stock-shaped result over the whole stored history"""
+        results_path = os.path.join(self.results_dir, f"{stock_symbol}_results.csv")
+        if not os.path.exists(results_path):
+            return None
+        combined_data = pd.read_csv(results_path, parse_dates=['date'])
+        results = self._correlation_results(stats, first_date, last_date)
+        if results:
+            self.correlation_calculator.print_results(results, stock_symbol)
+
+        return {
+            'combined_data': combined_data,
+            'new_data': new_combined if new_combined is not None else combined_data.iloc[:0],
+            'correlation_results': results
+        }
+
+    def _correlation_results(self, stats, first_date, last_date):
+        """Build a calculate_correlations-shaped dict from running statistics"""
+        total_days = stats['avg_polarity'].n
+        if total_days < 2:
+            return None
+        return {
+            'summary': {
+                'total_days': total_days,
+                'date_range': f"{first_date} to {last_date.date()}"
+            },
+            'correlations': {
+                'pearson_polarity': stats['avg_polarity'].pearson(),
+                'pearson_vader': stats['avg_vader_compound'].pearson(),
+                'pearson_positive_ratio': stats['positive_ratio'].pearson(),
+                'spearman_polarity': [np.nan, np.nan],
+                'spearman_vader': [np.nan, np.nan]
+            }
+        }
+
+
+if __name__ == "__main__":
+    store = CheckpointStore()
+    print(f"CheckpointStore initialized: {store.checkpoint_dir}")
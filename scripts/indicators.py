@@ -1,14 +1,411 @@
-import talib
+from collections import deque
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
 
-def calculate_indicators(df):
+try:
+    import talib
+except ImportError:
+    talib = None
+
+
+def sma(values, period=20):
+    """
+    Simple moving average; NaN until `period` values are available.
+    Like every indicator here, works along axis 0 of 1-D or 2-D input.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if len(values) >= period:
+        out[period - 1:] = sliding_window_view(values, period, axis=0).mean(axis=-1)
+    return out
+
+
+def _ema_from(values, period, start, alpha=None):
+    """
+    EMA seeded at index `start` with the mean of the `period` values ending
+    there (TA-Lib's seeding), then updated recursively via a linear filter.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if start >= len(values) or start < period - 1:
+        return out
+    if alpha is None:
+        alpha = 2.0 / (period + 1)
+    seed = values[start - period + 1:start + 1].mean(axis=0)
+    out[start] = seed
+    if start + 1 < len(values):
+        out[start + 1:], _ = lfilter([alpha], [1.0, alpha - 1.0], values[start + 1:], axis=0,
+                                     zi=np.expand_dims((1.0 - alpha) * seed, 0))
+    return out
+
+
+def ema(values, period=20):
+    """
+    Exponential moving average seeded with the SMA of the first `period` values.
+    """
+    return _ema_from(values, period, period - 1)
+
+
+def rsi(values, period=14):
+    """
+    Relative Strength Index with Wilder smoothing (first value at index `period`).
+    A missing price makes the RSI NaN from there on, like the EMA.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if len(values) <= period:
+        return out
+
+    change = np.diff(values, axis=0)
+    gains = np.where(np.isnan(change), np.nan, np.maximum(change, 0.0))
+    losses = np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0))
+    # Wilder smoothing is an EMA with alpha = 1 / period over the changes
+    avg_gain = _ema_from(gains, period, period - 1, alpha=1.0 / period)
+    avg_loss = _ema_from(losses, period, period - 1, alpha=1.0 / period)
+
+    total = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(np.isnan(total) | (total > 0), 100.0 * avg_gain / total, 0.0)
+    out[period:] = result[period - 1:]
+    return out
+
+
+def macd(values, fastperiod=12, slowperiod=26, signalperiod=9):
+    """
+    MACD line, signal line and histogram, aligned the way TA-Lib aligns them:
+    both EMAs start at index slowperiod - 1 and all outputs start once the
+    signal EMA is seeded.
     """
-    Calculate SMA, EMA, RSI, and MACD indicators.
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    macd_line = np.full(values.shape, np.nan)
+    signal = np.full(values.shape, np.nan)
+    start = slowperiod - 1
+    first = start + signalperiod - 1
+    if n <= first:
+        return macd_line, signal, macd_line - signal
+
+    line = _ema_from(values, fastperiod, start) - _ema_from(values, slowperiod, start)
+    signal[start:] = _ema_from(line[start:], signalperiod, signalperiod - 1)
+    macd_line[first:] = line[first:]
+    signal[:first] = np.nan
+    return macd_line, signal, macd_line - signal
+
+
+def bollinger_bands(values, period=20, nbdev=2.0):
     """
-    df['SMA_20'] = talib.SMA(df['Close'], timeperiod=20)
-    df['EMA_20'] = talib.EMA(df['Close'], timeperiod=20)
-    df['RSI'] = talib.RSI(df['Close'], timeperiod=14)
-    df['MACD'], df['MACD_signal'], df['MACD_hist'] = talib.MACD(
-        df['Close'], fastperiod=12, slowperiod=26, signalperiod=9
-    )
+    Upper, middle and lower Bollinger Bands (SMA +/- nbdev population stdevs).
+    """
+    values = np.asarray(values, dtype=float)
+    middle = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    if len(values) >= period:
+        windows = sliding_window_view(values, period, axis=0)
+        middle[period - 1:] = windows.mean(axis=-1)
+        std[period - 1:] = windows.std(axis=-1)
+    return middle + nbdev * std, middle, middle - nbdev * std
+
+
+def stochastic(high, low, close, fastk_period=14, slowk_period=3, slowd_period=3):
+    """
+    Slow Stochastic Oscillator (%K and %D, both SMA-smoothed). Like TA-Lib,
+    both outputs start once %D is available. Windows with a missing bar
+    give NaN.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    fastk = np.full(close.shape, np.nan)
+    if n >= fastk_period:
+        highest = sliding_window_view(high, fastk_period, axis=0).max(axis=-1)
+        lowest = sliding_window_view(low, fastk_period, axis=0).min(axis=-1)
+        span = highest - lowest
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fastk[fastk_period - 1:] = np.where(
+                np.isnan(span) | (span > 0), 100.0 * (close[fastk_period - 1:] - lowest) / span,
+                0.0
+            )
+
+    first = fastk_period + slowk_period + slowd_period - 3
+    slowk = np.full(close.shape, np.nan)
+    slowd = np.full(close.shape, np.nan)
+    if n > first:
+        k = _shifted_sma(fastk, slowk_period, fastk_period - 1)
+        d = _shifted_sma(k, slowd_period, fastk_period + slowk_period - 2)
+        slowk[first:] = k[first:]
+        slowd[first:] = d[first:]
+    return slowk, slowd
+
+
+def _shifted_sma(values, period, offset):
+    """
+    SMA of values[offset:], placed back at the original positions.
+    """
+    out = np.full(values.shape, np.nan)
+    out[offset:] = sma(values[offset:], period)
+    return out
+
+
+class SMAStream:
+    """
+    O(1) simple moving average over a fixed window.
+    """
+
+    def __init__(self, period=20):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.value = np.nan
+
+    def update(self, x):
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        if len(self.window) == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+
+class EMAStream:
+    """
+    O(1) exponential moving average, seeded with the SMA of the first values.
+    """
+
+    def __init__(self, period=20, alpha=None):
+        self.period = period
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self.count = 0
+        self.total = 0.0
+        self.value = np.nan
+
+    def update(self, x):
+        self.count += 1
+        if self.count < self.period:
+            self.total += x
+        elif self.count == self.period:
+            self.value = (self.total + x) / self.period
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class RSIStream:
+    """
+    O(1) Relative Strength Index with Wilder smoothing.
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self.previous = None
+        self.avg_gain = EMAStream(period, alpha=1.0 / period)
+        self.avg_loss = EMAStream(period, alpha=1.0 / period)
+        self.value = np.nan
+
+    def update(self, x):
+        if self.previous is not None:
+            change = x - self.previous
+            gain = self.avg_gain.update(max(change, 0.0))
+            loss = self.avg_loss.update(max(-change, 0.0))
+            if not np.isnan(gain):
+                total = gain + loss
+                self.value = 100.0 * gain / total if total > 0 else 0.0
+        self.previous = x
+        return self.value
+
+
+class MACDStream:
+    """
+    O(1) MACD returning (macd, signal, hist), aligned like macd().
+    """
+
+    def __init__(self, fastperiod=12, slowperiod=26, signalperiod=9):
+        self.fastperiod = fastperiod
+        self.slowperiod = slowperiod
+        self.warmup = deque(maxlen=slowperiod)
+        self.fast = np.nan
+        self.slow = np.nan
+        self.signal = EMAStream(signalperiod)
+        self.value = (np.nan, np.nan, np.nan)
+
+    def update(self, x):
+        if len(self.warmup) < self.slowperiod:
+            self.warmup.append(x)
+            if len(self.warmup) < self.slowperiod:
+                return self.value
+            # Both EMAs are seeded on the same bar, as TA-Lib does
+            history = list(self.warmup)
+            self.fast = float(np.mean(history[-self.fastperiod:]))
+            self.slow = float(np.mean(history))
+        else:
+            self.fast += 2.0 / (self.fastperiod + 1) * (x - self.fast)
+            self.slow += 2.0 / (self.slowperiod + 1) * (x - self.slow)
+
+        line = self.fast - self.slow
+        signal = self.signal.update(line)
+        if not np.isnan(signal):
+            self.value = (line, signal, line - signal)
+        return self.value
+
+
+class BollingerStream:
+    """
+    O(1) Bollinger Bands returning (upper, middle, lower).
+    """
+
+    def __init__(self, period=20, nbdev=2.0):
+        self.period = period
+        self.nbdev = nbdev
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.value = (np.nan, np.nan, np.nan)
+
+    def update(self, x):
+        if len(self.window) == self.period:
+            old = self.window[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.window.append(x)
+        self.total += x
+        self.total_sq += x * x
+        if len(self.window) == self.period:
+            mean = self.total / self.period
+            std = np.sqrt(max(self.total_sq / self.period - mean * mean, 0.0))
+            self.value = (mean + self.nbdev * std, mean, mean - self.nbdev * std)
+        return self.value
+
+
+class StochasticStream:
+    """
+    O(1) amortized slow Stochastic Oscillator returning (slowk, slowd).
+    Rolling highs and lows are kept in monotonic deques.
+    """
+
+    def __init__(self, fastk_period=14, slowk_period=3, slowd_period=3):
+        self.fastk_period = fastk_period
+        self.count = 0
+        self.highs = deque()
+        self.lows = deque()
+        self.slowk = SMAStream(slowk_period)
+        self.slowd = SMAStream(slowd_period)
+        self.value = (np.nan, np.nan)
+
+    def update(self, high, low, close):
+        i = self.count
+        self.count += 1
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((i, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((i, low))
+        oldest = i - self.fastk_period + 1
+        if self.highs[0][0] < oldest:
+            self.highs.popleft()
+        if self.lows[0][0] < oldest:
+            self.lows.popleft()
+        if oldest < 0:
+            return self.value
+
+        span = self.highs[0][1] - self.lows[0][1]
+        fastk = 100.0 * (close - self.lows[0][1]) / span if span > 0 else 0.0
+        k = self.slowk.update(fastk)
+        if not np.isnan(k):
+            d = self.slowd.update(k)
+            if not np.isnan(d):
+                self.value = (k, d)
+        return self.value
+
+
+def _left_align(panel, start):
+    """
+    Shift each column up so its history starts at row 0 (NaN padded).
+    """
+    rows = np.arange(len(panel))[:, None] + start[None, :]
+    cols = np.arange(panel.shape[1])[None, :]
+    return np.where(rows < len(panel), panel[np.minimum(rows, len(panel) - 1), cols], np.nan)
+
+
+def _restore_alignment(aligned, start):
+    """
+    Undo _left_align, putting each column back at its original rows.
+    """
+    rows = np.arange(len(aligned))[:, None] - start[None, :]
+    cols = np.arange(aligned.shape[1])[None, :]
+    return np.where(rows >= 0, aligned[np.maximum(rows, 0), cols], np.nan)
+
+
+def calculate_indicator_panel(close, high=None, low=None):
+    """
+    Compute every indicator for a (bars x tickers) price panel at once.
+
+    Tickers may start on different bars (leading NaNs): each column is
+    shifted to start at row 0, all tickers are processed in one vectorized
+    pass along the time axis, and the results are shifted back. Gaps inside
+    a history yield NaN for the windows they touch (and onward for the
+    recursive EMA-based indicators). Returns a dict of float arrays with the
+    panel's shape, keyed like the calculate_indicators columns.
+    """
+    close = np.asarray(close, dtype=float)
+    if close.ndim == 1:
+        close = close[:, None]
+    valid = ~np.isnan(close)
+    start = np.where(valid.any(axis=0), valid.argmax(axis=0), len(close))
+    aligned = _left_align(close, start)
+
+    results = {
+        'SMA_20': sma(aligned, 20),
+        'EMA_20': ema(aligned, 20),
+        'RSI': rsi(aligned, 14),
+    }
+    results['MACD'], results['MACD_signal'], results['MACD_hist'] = macd(aligned, 12, 26, 9)
+    results['BB_upper'], results['BB_middle'], results['BB_lower'] = bollinger_bands(aligned, 20, 2.0)
+    if high is not None and low is not None:
+        high = _left_align(np.asarray(high, dtype=float).reshape(close.shape), start)
+        low = _left_align(np.asarray(low, dtype=float).reshape(close.shape), start)
+        results['STOCH_K'], results['STOCH_D'] = stochastic(high, low, aligned, 14, 3, 3)
+
+    return {name: _restore_alignment(values, start) for name, values in results.items()}
+
+
+def calculate_indicators(df, engine='numpy'):
+    """
+    Calculate SMA, EMA, RSI, MACD, Bollinger Bands and (when High/Low are
+    present) the Stochastic Oscillator. The built-in NumPy engine needs no
+    C library; engine='talib' uses TA-Lib when it is installed.
+    """
+    if engine == 'talib' and talib is None:
+        raise ImportError("TA-Lib is not installed; use engine='numpy'")
+    lib = talib if engine == 'talib' else None
+    close = df['Close'].to_numpy(dtype=float)
+
+    if lib is not None:
+        df['SMA_20'] = lib.SMA(close, timeperiod=20)
+        df['EMA_20'] = lib.EMA(close, timeperiod=20)
+        df['RSI'] = lib.RSI(close, timeperiod=14)
+        df['MACD'], df['MACD_signal'], df['MACD_hist'] = lib.MACD(
+            close, fastperiod=12, slowperiod=26, signalperiod=9
+        )
+        df['BB_upper'], df['BB_middle'], df['BB_lower'] = lib.BBANDS(
+            close, timeperiod=20, nbdevup=2, nbdevdn=2
+        )
+    else:
+        df['SMA_20'] = sma(close, 20)
+        df['EMA_20'] = ema(close, 20)
+        df['RSI'] = rsi(close, 14)
+        df['MACD'], df['MACD_signal'], df['MACD_hist'] = macd(close, 12, 26, 9)
+        df['BB_upper'], df['BB_middle'], df['BB_lower'] = bollinger_bands(close, 20, 2.0)
+
+    if 'High' in df.columns and 'Low' in df.columns:
+        high = df['High'].to_numpy(dtype=float)
+        low = df['Low'].to_numpy(dtype=float)
+        if lib is not None:
+            df['STOCH_K'], df['STOCH_D'] = lib.STOCH(high, low, close, fastk_period=14,
+                                                     slowk_period=3, slowd_period=3)
+        else:
+            df['STOCH_K'], df['STOCH_D'] = stochastic(high, low, close, 14, 3, 3)
     return df
@@ -0,0 +1,174 @@
+import cProfile
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Fields of every stage record, in output order
+RECORD_FIELDS = ['ticker', 'stage', 'started', 'wall_s', 'cpu_s', 'peak_rss_delta_mb',
+                 'rows_in', 'rows_out', 'cache_hits', 'error', 'profile']
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+_RSS_UNIT_MB = 1 / 2**20 if sys.platform == 'darwin' else 1 / 2**10
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT_MB
+
+
+class _NullStage:
+    """Stand-in returned by disabled instrumentation; ignores everything"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Stage:
+    """One timed stage; set `rows_out` on it before the block ends"""
+
+    def __init__(self, owner, ticker, name, rows_in=None, cache=None):
+        self.owner = owner
+        self.ticker = ticker
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.cache = cache
+        self._profiler = None
+
+    def __enter__(self):
+        if self.owner.profile_stage == self.name:
+            self._profiler = cProfile.Profile()
+        self._hits = self.cache.hits if self.cache is not None else None
+        self._rss = _peak_rss_mb()
+        self._started = time.time()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is not None:
+            self._profiler.disable()
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        rss = _peak_rss_mb()
+        record = {
+            'ticker': self.ticker,
+            'stage': self.name,
+            'started': round(self._started, 3),
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'peak_rss_delta_mb': rss - self._rss if rss is not None else None,
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'cache_hits': self.cache.hits - self._hits if self._hits is not None else None,
+            'error': f"{exc_type.__name__}: {exc}" if exc_type is not None else None,
+            'profile': self.owner._dump_profile(self) if self._profiler is not None else None
+        }
+        self.owner.add([record])
+        # Never swallow the stage's exception
+        return False
+
+
+class Instrumentation:
+    """Per-ticker, per-stage metrics: wall/CPU time, peak RSS growth, rows, cache hits
+
+    Records are kept in memory and, with `output`, appended to that file as
+    JSON lines as each stage finishes. `profile_stage` runs that stage under
+    cProfile and writes one .prof file per ticker into `profile_dir`.
+    When disabled, stage() returns a shared no-op context manager.
+    """
+
+    def __init__(self, enabled=True, output=None, profile_stage=None,
+                 profile_dir="./results/profiles"):
+        self.enabled = enabled
+        self.output = output
+        self.profile_stage = profile_stage
+        self.profile_dir = profile_dir
+        self.records = []
+
+    def stage(self, ticker, name, rows_in=None, cache=None):
+        """Context manager timing one stage; `cache` is read for its hit count"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return Stage(self, ticker, name, rows_in, cache)
+
+    def add(self, records):
+        """Keep finished records, appending them to the JSON lines output"""
+        if not records:
+            return
+        self.records.extend(records)
+        if self.output:
+            os.makedirs(os.path.dirname(self.output) or ".", exist_ok=True)
+            with open(self.output, 'a') as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+
+    def drain(self):
+        """Return and forget the records collected so far (for worker hand-off)"""
+        records, self.records = self.records, []
+        return records
+
+    def worker_options(self):
+        """Constructor arguments for the per-worker instances; they never write files"""
+        return {'enabled': self.enabled, 'profile_stage': self.profile_stage,
+                'profile_dir': self.profile_dir}
+
+    def _dump_profile(self, stage):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{stage.ticker}_{stage.name}.prof")
+        stage._profiler.dump_stats(path)
+        return path
+
+    def summary(self):
+        """One row per stage with totals across tickers"""
+        if not self.records:
+            return pd.DataFrame(columns=['stage', 'calls', 'wall_s', 'cpu_s',
+                                         'max_rss_delta_mb', 'rows_in', 'rows_out',
+                                         'cache_hits', 'errors'])
+        df = pd.DataFrame(self.records, columns=RECORD_FIELDS)
+        counts = ['rows_in', 'rows_out', 'cache_hits']
+        df[counts] = df[counts].astype(float)
+        grouped = df.groupby('stage', sort=False)
+        summary = grouped.agg(
+            calls=('stage', 'size'),
+            wall_s=('wall_s', 'sum'),
+            cpu_s=('cpu_s', 'sum'),
+            max_rss_delta_mb=('peak_rss_delta_mb', 'max')
+        )
+        # Stages that never set a count show <NA>, not 0
+        summary[counts] = grouped[counts].sum(min_count=1).astype('Int64')
+        summary['errors'] = grouped['error'].count()
+        summary = summary.reset_index()
+        return summary.sort_values('wall_s', ascending=False, ignore_index=True)
+
+    def print_summary(self):
+        summary = self.summary()
+        if len(summary) == 0:
+            print("📏 No stage metrics recorded")
+            return
+        print("\n📏 STAGE METRICS")
+        print(summary.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+
+if __name__ == "__main__":
+    instrumentation = Instrumentation()
+    with instrumentation.stage('DEMO', 'sleep', rows_in=1) as stage:
+        time.sleep(0.01)
+        stage.rows_out = 1
+    instrumentation.print_summary()
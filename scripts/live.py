@@ -0,0 +1,450 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from correlation_calculator import SENTIMENT_COLUMNS, RunningCorrelation
+from sentiment_analyzer import DailySentimentStats, SENTIMENT_FIELDS, get_analyzer
+
+# Score rows kept from each micro-batch (the ones daily stats are built from)
+_SCORE_ROWS = [SENTIMENT_FIELDS.index('polarity'), SENTIMENT_FIELDS.index('vader_compound')]
+
+# Headline-to-publication latencies kept for the percentiles in summary()
+LATENCY_SAMPLES = 10_000
+
+
+def _score_headlines(texts, vader_backend):
+    """Score a micro-batch inside a worker, each distinct text once"""
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
+    scores = get_analyzer(vader_backend)._score_texts(list(uniques))
+    return scores[_SCORE_ROWS][:, codes]
+
+
+def _event_stock(event):
+    """Upper-cased ticker of an event, rejecting anything but a non-empty string"""
+    stock = event['stock']
+    if not isinstance(stock, str) or not stock.strip():
+        raise ValueError("stock must be a non-empty string")
+    return stock.upper()
+
+
+def _event_day(value):
+    """Naive calendar day of an event timestamp (now when missing)"""
+    ts = pd.Timestamp(value) if value is not None else pd.Timestamp.now()
+    if ts.tz is not None:
+        ts = ts.tz_localize(None)
+    return ts.normalize()
+
+
+class QueueSource:
+    """In-process feed, mainly for tests: put events, then None to end it"""
+
+    def __init__(self, queue=None):
+        self.queue = queue or asyncio.Queue()
+
+    async def put(self, event):
+        await self.queue.put(event)
+
+    async def events(self):
+        while True:
+            event = await self.queue.get()
+            if event is None:
+                return
+            yield event
+
+
+class TailFileSource:
+    """JSON-lines file that is followed as it grows, like `tail -f`
+
+    Without `follow` the stream ends at the end of the file.
+    """
+
+    def __init__(self, path, follow=True, poll_interval=0.1):
+        self.path = path
+        self.follow = follow
+        self.poll_interval = poll_interval
+
+    async def events(self):
+        while not os.path.exists(self.path):
+            if not self.follow:
+                return
+            await asyncio.sleep(self.poll_interval)
+        with open(self.path) as f:
+            partial = ""
+            read = 0
+            while True:
+                line = f.readline()
+                if not line:
+                    if not self.follow:
+                        return
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                partial += line
+                if not partial.endswith("\n") and self.follow:
+                    # The writer has not finished this line yet
+                    continue
+                line, partial = partial.strip(), ""
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        print(f"⚠ Skipping malformed line in {self.path}: {e}")
+                read += 1
+                if read % 256 == 0:
+                    # Let the other feeds run during a burst
+                    await asyncio.sleep(0)
+
+
+class UnixSocketSource:
+    """JSON-lines events from any number of clients of a Unix socket"""
+
+    def __init__(self, path):
+        self.path = path
+
+    async def events(self):
+        queue = asyncio.Queue()
+
+        async def handle(reader, writer):
+            async for line in reader:
+                if line.strip():
+                    try:
+                        await queue.put(json.loads(line))
+                    except json.JSONDecodeError as e:
+                        print(f"⚠ Skipping malformed event on {self.path}: {e}")
+            writer.close()
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        server = await asyncio.start_unix_server(handle, path=self.path)
+        print(f"🔌 Listening on {self.path}")
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            server.close()
+            await server.wait_closed()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def open_source(spec):
+    """Source for a 'unix:PATH' or '[file:]PATH' specification"""
+    if spec.startswith("unix:"):
+        return UnixSocketSource(spec[len("unix:"):])
+    if spec.startswith("file:"):
+        spec = spec[len("file:"):]
+    return TailFileSource(spec)
+
+
+class TickerState:
+    """Constant-size live state of one ticker
+
+    Only the days not closed yet are kept as DailySentimentStats. When a
+    bar of a later day arrives, the trading day closes: its headlines
+    (and those of the non-trading days before it) and its return are
+    folded into one RunningCorrelation per sentiment column, and the day
+    joins a short window of recent days for the rolling averages.
+    """
+
+    def __init__(self, stock, rolling_days=5):
+        self.stock = stock
+        self.sentiment = DailySentimentStats()
+        self.correlations = {col: RunningCorrelation() for col in SENTIMENT_COLUMNS}
+        self.recent = deque(maxlen=rolling_days)
+        self.trading_day = None
+        self.last_close = None
+        self.prev_close = None
+        self.headlines = 0
+        self.arrivals = []
+
+    def add_headlines(self, scored):
+        """Fold a scored frame ('date', 'sentiment_polarity', ...) into the open days"""
+        if self.trading_day is not None:
+            # Late headlines of closed days count toward the open trading day
+            scored['date'] = scored['date'].clip(lower=self.trading_day)
+        self.sentiment.update(scored)
+        self.headlines += len(scored)
+
+    def add_bar(self, day, close):
+        """Apply a price bar; a bar of a later day closes the current one"""
+        if self.trading_day is not None and day < self.trading_day:
+            return
+        if self.trading_day is not None and day > self.trading_day:
+            self._close_day()
+            self.prev_close = self.last_close
+        self.trading_day = day
+        self.last_close = close
+
+    def _daily_return(self):
+        if self.prev_close is None or self.prev_close == 0:
+            return np.nan
+        return (self.last_close / self.prev_close - 1) * 100
+
+    def _day_row(self, pop=False):
+        """Sentiment row of the open trading day, or None without headlines"""
+        total = self.sentiment.total_through(self.trading_day, pop=pop)
+        if len(total) == 0:
+            return None
+        row = total.to_frame().iloc[0].to_dict()
+        row['daily_return'] = self._daily_return()
+        return row
+
+    def _close_day(self):
+        row = self._day_row(pop=True)
+        if row is None:
+            return
+        if not np.isnan(row['daily_return']):
+            for col in SENTIMENT_COLUMNS:
+                self.correlations[col].update(row[col], row['daily_return'])
+        self.recent.append(row)
+
+    def snapshot(self):
+        """Current view: today's provisional row folded into closed-day statistics"""
+        today = self._day_row() if self.trading_day is not None else None
+        days = list(self.recent) + ([today] if today is not None else [])
+        days = days[-self.recent.maxlen:]
+        snapshot = {
+            'stock': self.stock,
+            'trading_day': str(self.trading_day.date()) if self.trading_day is not None else None,
+            'headlines': self.headlines,
+            'articles_today': int(today['article_count']) if today else 0,
+            'daily_return': self._daily_return() if self.trading_day is not None else np.nan,
+        }
+        for col in SENTIMENT_COLUMNS:
+            snapshot[col] = today[col] if today else np.nan
+            snapshot[f"rolling_{col}"] = (float(np.mean([day[col] for day in days]))
+                                          if days else np.nan)
+            running = RunningCorrelation.from_dict(self.correlations[col].to_dict())
+            if today and not np.isnan(today['daily_return']):
+                running.update(today[col], today['daily_return'])
+            snapshot[f"corr_{col}"], snapshot[f"pvalue_{col}"] = running.pearson()
+        snapshot['days'] = running.n
+        return snapshot
+
+
+def print_snapshots(snapshots):
+    """Default publisher: one line per updated ticker"""
+    for s in snapshots:
+        print(f"📡 {s['stock']} {s['trading_day']}: {s['articles_today']} headlines today, "
+              f"polarity {s['avg_polarity']:.3f}, return {s['daily_return']:.2f}%, "
+              f"r(polarity, return) {s['corr_avg_polarity']:.3f} over {s['days']} days")
+
+
+class LiveAnalyzer:
+    """Asyncio live mode: rolling sentiment and running correlations per ticker
+
+    Headline and price-bar events are read from pluggable sources (see
+    QueueSource, TailFileSource, UnixSocketSource). Headlines are events
+    with 'stock', 'headline' and an optional 'date'; bars have 'stock',
+    'close' and an optional 'date'. Events missing those fields are
+    counted as rejected. Headlines are dated by calendar day: weekend
+    news counts toward the next trading day, after-close news toward its
+    own day, as in the batch pipeline. Headlines are scored in micro-batches
+    of up to `batch_size` (or whatever arrived within `batch_interval`
+    seconds) on a worker pool; the state of every updated ticker is handed
+    to `publisher` every `publish_interval` seconds. Scores are not cached,
+    since live headlines are new by definition.
+    """
+
+    def __init__(self, vader_backend='nltk', workers=1, batch_size=256, batch_interval=0.05,
+                 publish_interval=0.5, rolling_days=5, publisher=print_snapshots, output=None):
+        self.vader_backend = vader_backend
+        self.workers = max(workers, 1)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.publish_interval = publish_interval
+        self.rolling_days = rolling_days
+        self.publisher = publisher
+        # Optional JSON-lines file receiving every published snapshot
+        self.output = output
+        self.states = {}
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.counts = {'headlines': 0, 'bars': 0, 'rejected': 0, 'batches': 0, 'published': 0}
+        self._pending = []
+        self._tasks = set()
+        self._dirty = set()
+
+    def state(self, stock):
+        stock = stock.upper()
+        if stock not in self.states:
+            self.states[stock] = TickerState(stock, self.rolling_days)
+        return self.states[stock]
+
+    async def run(self, headline_source, bar_source=None):
+        """Consume the sources until they end; returns summary()
+
+        A single source may carry both kinds of events in order.
+        """
+        loop = asyncio.get_running_loop()
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.workers)
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=get_analyzer,
+                                                 initargs=(self.vader_backend,))
+        else:
+            self._executor = ThreadPoolExecutor(1, initializer=get_analyzer,
+                                                initargs=(self.vader_backend,))
+        background = []
+        try:
+            # Load the scorers before the first headline arrives
+            await asyncio.gather(*[
+                loop.run_in_executor(self._executor, _score_headlines, ["warm up"],
+                                     self.vader_backend)
+                for _ in range(self.workers)
+            ])
+            background = [asyncio.create_task(self._batch_loop()),
+                          asyncio.create_task(self._publish_loop())]
+            feeds = [self._consume(headline_source)]
+            if bar_source is not None:
+                feeds.append(self._consume(bar_source))
+            await asyncio.gather(*feeds)
+            await self.flush()
+            self.publish()
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            self._executor.shutdown(cancel_futures=True)
+        return self.summary()
+
+    async def _consume(self, source):
+        async for event in source.events():
+            try:
+                if not isinstance(event, dict):
+                    raise TypeError("event must be a JSON object")
+                if event.get('type', 'bar' if 'close' in event else 'headline') == 'bar':
+                    await self._on_bar(event)
+                else:
+                    self._on_headline(event)
+            except (KeyError, TypeError, ValueError) as e:
+                self.counts['rejected'] += 1
+                print(f"⚠ Rejected event {event!r}: {e}")
+
+    def _on_headline(self, event):
+        headline = event['headline']
+        if not isinstance(headline, str) or not headline.strip():
+            raise ValueError("empty headline")
+        self._pending.append((_event_stock(event), _event_day(event.get('date')),
+                              headline, time.perf_counter()))
+        self.counts['headlines'] += 1
+        self._has_pending.set()
+        if len(self._pending) >= self.batch_size:
+            self._batch_full.set()
+
+    async def _on_bar(self, event):
+        # Validate everything before a rejected bar can register its ticker
+        stock = _event_stock(event)
+        day = _event_day(event.get('date'))
+        close = float(event['close'])
+        state = self.state(stock)
+        if state.trading_day is not None and day > state.trading_day:
+            # Closing a day needs all of its headlines scored first
+            await self.flush()
+        state.add_bar(day, close)
+        self.counts['bars'] += 1
+        self._dirty.add(state.stock)
+
+    def _take_pending(self):
+        batch, self._pending = self._pending, []
+        self._has_pending.clear()
+        self._batch_full.clear()
+        return batch
+
+    def _dispatch(self, batch):
+        task = asyncio.create_task(self._score(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _batch_loop(self):
+        """Send a micro-batch once it is full or `batch_interval` has passed"""
+        while True:
+            await self._has_pending.wait()
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), self.batch_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._pending:
+                self._dispatch(self._take_pending())
+
+    async def _score(self, batch):
+        stocks, days, texts, arrivals = zip(*batch)
+        async with self._slots:
+            scores = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _score_headlines, list(texts), self.vader_backend
+            )
+        self.counts['batches'] += 1
+        scored = pd.DataFrame({
+            'stock': stocks,
+            'date': pd.DatetimeIndex(days),
+            'sentiment_polarity': scores[0],
+            'vader_compound': scores[1],
+            # Same classification as SentimentAnalyzer, as compact int8 codes
+            'sentiment_label': np.sign(scores[0] - 0.5).astype(np.int8),
+            'arrival': arrivals
+        })
+        for stock, rows in scored.groupby('stock', sort=False):
+            state = self.state(stock)
+            state.add_headlines(rows.drop(columns=['stock', 'arrival']))
+            state.arrivals.extend(rows['arrival'])
+            self._dirty.add(stock)
+
+    async def flush(self):
+        """Score every pending headline and wait until all batches are applied"""
+        if self._pending:
+            self._dispatch(self._take_pending())
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    async def _publish_loop(self):
+        while True:
+            await asyncio.sleep(self.publish_interval)
+            self.publish()
+
+    def publish(self):
+        """Hand the snapshots of every ticker updated since the last call to the publisher"""
+        if not self._dirty:
+            return []
+        now = time.perf_counter()
+        snapshots = []
+        for stock in sorted(self._dirty):
+            state = self.states[stock]
+            self.latencies.extend(now - arrival for arrival in state.arrivals)
+            state.arrivals = []
+            snapshots.append(state.snapshot())
+        self._dirty.clear()
+        self.counts['published'] += len(snapshots)
+        if self.output:
+            with open(self.output, 'a') as f:
+                f.writelines(json.dumps(s, default=str) + "\n" for s in snapshots)
+        if self.publisher is not None:
+            self.publisher(snapshots)
+        return snapshots
+
+    def summary(self):
+        """Event counts and headline-to-publication latency percentiles (ms)"""
+        summary = dict(self.counts, tickers=len(self.states))
+        if self.latencies:
+            latencies = np.array(self.latencies) * 1000
+            summary.update(latency_p50_ms=float(np.percentile(latencies, 50)),
+                           latency_p95_ms=float(np.percentile(latencies, 95)),
+                           latency_max_ms=float(latencies.max()))
+        return summary
+
+
+if __name__ == "__main__":
+    async def demo():
+        feed = QueueSource()
+        for event in [{'stock': 'AAPL', 'date': '2024-01-02', 'close': 100.0},
+                      {'stock': 'AAPL', 'date': '2024-01-02', 'headline': "Apple soars"},
+                      {'stock': 'AAPL', 'date': '2024-01-03', 'close': 102.0},
+                      None]:
+            await feed.put(event)
+        print(await LiveAnalyzer(publish_interval=0.2).run(feed))
+
+    asyncio.run(demo())
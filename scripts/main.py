@@ -1,110 +1,551 @@
+import argparse
+import asyncio
 import pandas as pd
 import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from data_loader import DataLoader
-from sentiment_analyzer import SentimentAnalyzer
-from correlation_calculator import CorrelationCalculator
-from visualization import StockVisualizer
+from event_tagger import EventTagger
+from incremental import IncrementalAnalyzer
+from instrumentation import Instrumentation
+from live import LiveAnalyzer, open_source
+from ratings_index import RatingsIndex
+from sentiment_analyzer import (LABEL_NAMES, LEXICON_PATH_ENV, OFFLINE_ENV, SentimentAnalyzer,
+                                VADER_BACKENDS, load_vader)
+from sentiment_cache import SentimentCache
+from correlation_calculator import CorrelationCalculator, SENTIMENT_COLUMNS
+from visualization import DPI_TIERS, StockVisualizer
 
-def analyze_stock(stock_symbol, ratings_df):
-    """Complete analysis for a single stock"""
+DEFAULT_STOCKS = ['AAPL', 'AMZN', 'GOOG', 'META', 'MSFT', 'NVDA']
+
+# Per-process state of the pipeline runner workers
+_worker_state = {}
+
+def build_components(vader_backend='nltk', dpi='print', instrumentation=None, compact=False,
+                     n_resamples=0, score_jobs=1, use_cache=False, seed=None):
+    """Create the pipeline components shared by every analyzed stock
+    
+    `n_resamples` > 0 adds permutation/bootstrap significance to every
+    stock's correlations, drawn from `seed`. `score_jobs` > 1 scores
+    headlines on a process pool.
+    `use_cache` keeps the columnar CSV cache (in the data folder) and the
+    sentiment score cache (in ./cache); without it nothing is written there.
+    """
+    return {
+        'n_resamples': n_resamples,
+        'seed': seed,
+        'instrumentation': instrumentation or Instrumentation(enabled=False),
+        'loader': DataLoader(use_cache=use_cache, compact=compact),
+        'sentiment_analyzer': SentimentAnalyzer(cache=SentimentCache() if use_cache else None,
+                                                vader_backend=vader_backend, compact=compact,
+                                                n_jobs=score_jobs),
+        'event_tagger': EventTagger(),
+        'correlation_calculator': CorrelationCalculator(),
+        'visualizer': StockVisualizer(dpi=dpi)
+    }
+
+def select_ratings(stock_symbol, ratings_df, ratings_index=None):
+    """Ratings rows for one stock, falling back to all ratings"""
+    if ratings_index is not None:
+        stock_ratings = ratings_index.get(stock_symbol)
+    elif 'stock' in ratings_df.columns:
+        stock_ratings = ratings_df[ratings_df['stock'].str.upper() == stock_symbol.upper()]
+    else:
+        stock_ratings = ratings_df
+    if len(stock_ratings) == 0:
+        print(f"⚠ No specific ratings for {stock_symbol}, using all ratings")
+        stock_ratings = ratings_df
+    
+    print(f"📰 Using {len(stock_ratings)} ratings for analysis")
+    return stock_ratings
+
+def analyze_stock(stock_symbol, ratings_df, ratings_index=None, components=None,
+                  raise_errors=False, render=True, n_resamples=None):
+    """Complete analysis for a single stock
+    
+    With a prebuilt `ratings_index` the ticker's rows are sliced from it
+    instead of scanning `ratings_df`. `components` reuses the objects from
+    build_components(); `raise_errors` propagates failures to the caller.
+    With `render=False` plots are left to a later render_dashboards pass.
+    `n_resamples` overrides the components' resampling setting.
+    """
     print(f"\n{'='*60}")
     print(f"📈 ANALYZING: {stock_symbol}")
     print(f"{'='*60}")
     
     # Initialize components
-    loader = DataLoader()
-    sentiment_analyzer = SentimentAnalyzer()
-    correlation_calculator = CorrelationCalculator()
-    visualizer = StockVisualizer()
+    if components is None:
+        components = build_components()
+    loader = components['loader']
+    sentiment_analyzer = components['sentiment_analyzer']
+    event_tagger = components['event_tagger']
+    correlation_calculator = components['correlation_calculator']
+    visualizer = components['visualizer']
+    instrumentation = components['instrumentation']
+    if n_resamples is None:
+        n_resamples = components.get('n_resamples', 0)
+    
+    def stage(name, **kwargs):
+        """Metrics context for one stage of this ticker; a no-op unless enabled"""
+        return instrumentation.stage(stock_symbol, name, **kwargs)
+    
+    if len(ratings_df) == 0:
+        print(f"❌ No ratings available for {stock_symbol}")
+        return None
     
     try:
         # 1. Load stock data
-        stock_df = loader.load_stock_data(stock_symbol)
+        with stage('load_stock_data') as s:
+            stock_df = loader.load_stock_data(stock_symbol)
+            s.rows_out = len(stock_df) if stock_df is not None else 0
         if stock_df is None:
             return None
         
         # 2. Filter ratings for this stock
-        if 'stock' in ratings_df.columns:
-            stock_ratings = ratings_df[ratings_df['stock'].str.upper() == stock_symbol.upper()].copy()
-            if len(stock_ratings) == 0:
-                print(f"⚠ No specific ratings for {stock_symbol}, using all ratings")
-                stock_ratings = ratings_df.copy()
-        else:
-            stock_ratings = ratings_df.copy()
-        
-        print(f"📰 Using {len(stock_ratings)} ratings for analysis")
+        with stage('select_ratings', rows_in=len(ratings_df)) as s:
+            stock_ratings = select_ratings(stock_symbol, ratings_df, ratings_index)
+            s.rows_out = len(stock_ratings)
         
-        # 3. Align dates
-        news_aligned, stock_aligned = loader.align_dates(stock_ratings, stock_df)
+        # 3. Align dates; weekend and holiday news counts toward the next session
+        with stage('align_dates', rows_in=len(stock_ratings)) as s:
+            news_aligned, stock_aligned = loader.align_dates(stock_ratings, stock_df,
+                                                             map_to_trading_days=True)
+            s.rows_out = len(news_aligned)
         if len(news_aligned) == 0 or len(stock_aligned) == 0:
             print("❌ No overlapping dates")
             return None
         
         # 4. Calculate returns
-        stock_with_returns = correlation_calculator.calculate_daily_returns(stock_aligned)
+        with stage('daily_returns', rows_in=len(stock_aligned)) as s:
+            stock_with_returns = correlation_calculator.calculate_daily_returns(stock_aligned)
+            s.rows_out = len(stock_with_returns)
         
         # 5. Sentiment analysis
-        news_with_sentiment = sentiment_analyzer.analyze_dataframe(news_aligned)
-        daily_sentiment = sentiment_analyzer.aggregate_daily_sentiment(news_with_sentiment)
+        with stage('analyze_dataframe', rows_in=len(news_aligned),
+                   cache=sentiment_analyzer.cache) as s:
+            news_with_sentiment = sentiment_analyzer.analyze_dataframe(news_aligned)
+            s.rows_out = len(news_with_sentiment)
+        with stage('aggregate_daily_sentiment', rows_in=len(news_with_sentiment)) as s:
+            daily_sentiment = sentiment_analyzer.aggregate_daily_sentiment(news_with_sentiment)
+            s.rows_out = len(daily_sentiment)
+        
+        # 5b. Tag market events and count them per day
+        with stage('tag_events', rows_in=len(news_with_sentiment)) as s:
+            events = event_tagger.tag_dataframe(news_with_sentiment)
+            daily_sentiment = pd.merge(daily_sentiment,
+                                       events.daily_counts(news_with_sentiment['date']),
+                                       on='date', how='left')
+            s.rows_out = events.tagged_rows()
         
         # 6. Combine data
-        combined_data = pd.merge(daily_sentiment, stock_with_returns, on='date', how='inner')
+        with stage('combine', rows_in=len(daily_sentiment)) as s:
+            combined_data = pd.merge(daily_sentiment, stock_with_returns, on='date', how='inner')
+            s.rows_out = len(combined_data)
         if len(combined_data) < 5:
             print(f"⚠ Insufficient combined data: {len(combined_data)} days")
             return None
         
         # 7. Calculate correlations
-        results = correlation_calculator.calculate_correlations(combined_data)
-        if results:
-            correlation_calculator.print_results(results, stock_symbol)
+        with stage('correlations', rows_in=len(combined_data)):
+            results = correlation_calculator.calculate_correlations(
+                combined_data, n_resamples=n_resamples, seed=components.get('seed'))
+            if results:
+                correlation_calculator.print_results(results, stock_symbol)
+            event_results = correlation_calculator.event_correlations(combined_data)
+        for row in event_results[event_results['days'] > 0].itertuples():
+            print(f"🏷 {row.event}: {row.days} days, polarity vs returns {row.corr:.4f}, "
+                  f"mean return {row.mean_return:.3f}% vs {row.mean_return_other:.3f}%")
+        with stage('event_study', rows_in=len(news_with_sentiment)):
+            event_study = correlation_calculator.event_study(stock_with_returns,
+                                                             news_with_sentiment, window=5,
+                                                             group_column='sentiment_label')
+        for label, caar in event_study['caar'].iloc[-1].items():
+            print(f"📐 CAAR[-5, +5] after {LABEL_NAMES.get(label, label)} news: {caar:.3f}% "
+                  f"({event_study['n'][label]} headlines)")
         
         # 8. Create visualizations
-        visualizer.create_dashboard(combined_data, stock_symbol)
+        if render:
+            with stage('create_dashboard', rows_in=len(combined_data)):
+                visualizer.create_dashboard(combined_data, stock_symbol)
         
         # 9. Save results
-        results_dir = "./results"
-        os.makedirs(results_dir, exist_ok=True)
-        combined_data.to_csv(os.path.join(results_dir, f"{stock_symbol}_results.csv"), index=False)
+        with stage('save_results', rows_in=len(combined_data)):
+            results_dir = "./results"
+            os.makedirs(results_dir, exist_ok=True)
+            combined_data.to_csv(os.path.join(results_dir, f"{stock_symbol}_results.csv"),
+                                 index=False)
         print(f"💾 Results saved: {stock_symbol}_results.csv")
         
         return {
             'combined_data': combined_data,
-            'correlation_results': results
+            'correlation_results': results,
+            'event_correlations': event_results,
+            'event_study': event_study
         }
         
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"❌ Error analyzing {stock_symbol}: {e}")
         return None
 
-def main():
+def analyze_stock_incremental(stock_symbol, ratings_df, ratings_index=None, components=None,
+                              render=True):
+    """Append-only analysis of the days after a stock's last checkpoint
+    
+    Only new days are scored, but the returned 'combined_data' (and the
+    dashboard drawn with `render`) covers the ticker's whole results file.
+    """
+    print(f"\n{'='*60}")
+    print(f"📈 UPDATING: {stock_symbol}")
+    print(f"{'='*60}")
+    
+    if components is None:
+        components = build_components()
+    if len(ratings_df) == 0:
+        print(f"❌ No ratings available for {stock_symbol}")
+        return None
+    
+    stock_ratings = select_ratings(stock_symbol, ratings_df, ratings_index)
+    with components['instrumentation'].stage(stock_symbol, 'incremental_update',
+                                             rows_in=len(stock_ratings)):
+        result = IncrementalAnalyzer(components).update(stock_symbol, stock_ratings)
+    if render and result is not None:
+        with components['instrumentation'].stage(stock_symbol, 'create_dashboard',
+                                                 rows_in=len(result['combined_data'])):
+            components['visualizer'].create_dashboard(result['combined_data'], stock_symbol)
+    return result
+
+def _init_worker(ratings_df, ratings_index, partition_dir, incremental=False,
+                 vader_backend='nltk', dpi='print', render=True, instrument=None,
+                 compact=False, n_resamples=0, score_jobs=1, use_cache=False, seed=None):
+    """Set up one worker: shared ratings plus components built once"""
+    if ratings_df is None and ratings_index is not None:
+        ratings_df = ratings_index.frame
+    _worker_state['ratings_df'] = ratings_df
+    _worker_state['ratings_index'] = ratings_index
+    _worker_state['partition_dir'] = partition_dir
+    _worker_state['incremental'] = incremental
+    _worker_state['render'] = render
+    instrumentation = Instrumentation(**instrument) if instrument else None
+    _worker_state['components'] = build_components(vader_backend, dpi, instrumentation,
+                                                   compact, n_resamples, score_jobs,
+                                                   use_cache, seed)
+
+def _run_ticker(stock_symbol):
+    """Analyze one ticker inside a worker, returning (result, error, stage records)"""
+    instrumentation = _worker_state['components']['instrumentation']
+    result, error = _analyze_ticker(stock_symbol)
+    return result, error, instrumentation.drain()
+
+def _analyze_ticker(stock_symbol):
+    """Analyze one ticker inside a worker, returning (result, error)"""
+    try:
+        ratings_df = _worker_state['ratings_df']
+        if _worker_state['partition_dir'] is not None:
+            loader = _worker_state['components']['loader']
+            ratings_df = loader.load_ratings_partition(stock_symbol, _worker_state['partition_dir'])
+        if _worker_state['incremental']:
+            result = analyze_stock_incremental(stock_symbol, ratings_df,
+                                               _worker_state['ratings_index'],
+                                               components=_worker_state['components'],
+                                               render=_worker_state['render'])
+        else:
+            result = analyze_stock(stock_symbol, ratings_df, _worker_state['ratings_index'],
+                                   components=_worker_state['components'], raise_errors=True,
+                                   render=_worker_state['render'])
+        return result, None
+    except Exception:
+        return None, traceback.format_exc()
+
+def run_universe(stocks, ratings_df=None, ratings_index=None, partition_dir=None, workers=1,
+                 incremental=False, vader_backend='nltk', dpi='print', render=True,
+                 instrumentation=None, compact=False, n_resamples=0, score_jobs=1,
+                 use_cache=False, seed=None):
+    """Analyze many tickers, optionally across a process pool
+    
+    Ratings come from `ratings_index`, `ratings_df` or per-ticker files in
+    `partition_dir`. They are handed to each worker
+    once at start-up rather than with every task. Returns the results of
+    successful tickers and a dict of tracebacks for failed ones.
+    `incremental` only processes days after each ticker's checkpoint.
+    `vader_backend` selects the SentimentAnalyzer VADER implementation,
+    `dpi` the plot resolution; `render=False` skips plotting per ticker.
+    Stage metrics from every worker are collected into `instrumentation`.
+    `compact` loads and scores ratings in the compact dtypes.
+    `n_resamples` > 0 adds resampling significance to the correlations,
+    drawn from `seed` so repeated runs agree.
+    `score_jobs` scoring processes are used inside each worker.
+    `use_cache` enables the on-disk CSV and sentiment caches.
+    """
+    all_results = {}
+    failures = {}
+    instrument = instrumentation.worker_options() if instrumentation is not None else None
+    init_args = (ratings_df, ratings_index, partition_dir, incremental, vader_backend,
+                 dpi, render, instrument, compact, n_resamples, score_jobs, use_cache,
+                 seed)
+    
+    if workers <= 1:
+        _init_worker(*init_args)
+        for stock in stocks:
+            result, error, records = _run_ticker(stock)
+            if instrumentation is not None:
+                instrumentation.add(records)
+            if error:
+                failures[stock] = error
+            elif result:
+                all_results[stock] = result
+        return all_results, failures
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=init_args) as pool:
+        futures = {pool.submit(_run_ticker, stock): stock for stock in stocks}
+        for future in as_completed(futures):
+            stock = futures[future]
+            try:
+                result, error, records = future.result()
+            except Exception:
+                # The worker itself died (e.g. out of memory)
+                result, error, records = None, traceback.format_exc(), []
+            if instrumentation is not None:
+                instrumentation.add(records)
+            if error:
+                failures[stock] = error
+            elif result:
+                all_results[stock] = result
+    
+    return all_results, failures
+
+def run_panel_analysis(all_results, results_dir="./results"):
+    """Cross-sectional correlations over every analyzed stock at once"""
+    calculator = CorrelationCalculator()
+    frames = {stock: result['combined_data'] for stock, result in all_results.items()}
+    returns_panel = calculator.build_panel(frames, 'daily_return')
+    
+    rows = []
+    for column in SENTIMENT_COLUMNS:
+        sentiment_panel = calculator.build_panel(frames, column)
+        panel_results = calculator.panel_correlations(sentiment_panel, returns_panel)
+        per_ticker = panel_results['per_ticker'].reset_index(names='stock')
+        per_ticker['column'] = column
+        rows.append(per_ticker)
+        for scope in ['pooled', 'pooled_within']:
+            corr, p_val, n = panel_results[scope]
+            rows.append(pd.DataFrame([{'stock': scope.upper(), 'corr': corr, 'pvalue': p_val,
+                                       'n': n, 'column': column}]))
+            print(f"📊 {scope} {column} vs returns: {corr:.4f} (p={p_val:.4f}, n={n})")
+    
+    os.makedirs(results_dir, exist_ok=True)
+    pd.concat(rows, ignore_index=True).to_csv(
+        os.path.join(results_dir, "panel_correlations.csv"), index=False
+    )
+    matrix = calculator.sentiment_correlation_matrix(calculator.build_panel(frames, 'avg_polarity'))
+    matrix.to_csv(os.path.join(results_dir, "sentiment_correlation_matrix.csv"))
+    print("💾 Panel results saved: panel_correlations.csv, sentiment_correlation_matrix.csv")
+
+def run_live(args):
+    """Live mode: follow headline/bar feeds and publish rolling correlations"""
+    live = LiveAnalyzer(vader_backend=args.vader_backend, workers=args.workers,
+                        batch_size=args.batch_size, publish_interval=args.publish_interval,
+                        output=args.live_output)
+    bar_source = open_source(args.bars) if args.bars else None
+    print(f"📡 Live mode: headlines from {args.headlines}"
+          + (f", bars from {args.bars}" if args.bars else ""))
+    try:
+        summary = asyncio.run(live.run(open_source(args.headlines), bar_source))
+    except KeyboardInterrupt:
+        summary = live.summary()
+    print(f"\n🛑 Live mode stopped: {summary}")
+    return summary
+
+def _dpi(value):
+    """Plot resolution option: a DPI_TIERS name or a number"""
+    return value if value in DPI_TIERS else int(value)
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(
+        description="Correlation analysis of news sentiment vs stock movements"
+    )
+    parser.add_argument('--stream', action='store_true',
+                        help="stream the ratings file into per-ticker partitions "
+                             "instead of loading it whole")
+    parser.add_argument('--chunksize', type=int, default=100_000,
+                        help="rows per chunk in streaming mode")
+    parser.add_argument('--tickers', nargs='+', default=DEFAULT_STOCKS,
+                        help="ticker symbols to analyze, or 'all' for every "
+                             "price file in the data folder")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of worker processes")
+    parser.add_argument('--score-jobs', type=int, default=1,
+                        help="processes scoring each ticker's headlines (-1: every "
+                             "core); multiplies with --workers")
+    parser.add_argument('--panel', action='store_true',
+                        help="also compute cross-sectional panel correlations "
+                             "across all analyzed stocks")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only score days after each ticker's last checkpoint "
+                             "and append to its results; plots and --panel still "
+                             "cover the full results")
+    parser.add_argument('--vader-backend', choices=VADER_BACKENDS, default='nltk',
+                        help="VADER implementation: NLTK per headline or the "
+                             "vectorized batch scorer")
+    parser.add_argument('--dpi', type=_dpi, default='print',
+                        help=f"plot resolution: one of {', '.join(DPI_TIERS)} or a number")
+    parser.add_argument('--render-workers', type=int, default=1,
+                        help="render plots after the analysis across this many "
+                             "processes instead of inside each ticker's run")
+    parser.add_argument('--no-plots', action='store_true',
+                        help="skip all plotting")
+    parser.add_argument('--offline', action='store_true',
+                        help="never download NLP data; fail fast if the VADER "
+                             "lexicon is missing")
+    parser.add_argument('--lexicon-path',
+                        help="local vader_lexicon.txt or nltk_data directory")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="do not read or write the columnar CSV cache "
+                             "(<data>/.cache) or the sentiment cache (./cache)")
+    parser.add_argument('--compact', action='store_true',
+                        help="keep ratings in compact dtypes (categoricals, Arrow "
+                             "strings, float32 scores, int8 labels) to cut memory")
+    parser.add_argument('--live', action='store_true',
+                        help="follow live feeds instead of analyzing the CSV files")
+    parser.add_argument('--headlines', default="file:./data/live_headlines.jsonl",
+                        help="live headline feed: file:PATH (JSON lines, followed) "
+                             "or unix:PATH (socket); bars may share this feed")
+    parser.add_argument('--bars',
+                        help="separate live price-bar feed, same formats as --headlines")
+    parser.add_argument('--batch-size', type=int, default=256,
+                        help="largest micro-batch of headlines scored at once in live mode")
+    parser.add_argument('--publish-interval', type=float, default=0.5,
+                        help="seconds between live snapshots")
+    parser.add_argument('--live-output',
+                        help="append every live snapshot to this file as JSON lines")
+    parser.add_argument('--resamples', type=int, default=0,
+                        help="permutation/block-bootstrap resamples per correlation "
+                             "(0 keeps only the parametric p-values; not used with "
+                             "--incremental)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="random seed for the --resamples draws, so repeated runs "
+                             "give the same p-values")
+    parser.add_argument('--metrics',
+                        help="append per-ticker, per-stage metrics to this file "
+                             "as JSON lines")
+    parser.add_argument('--metrics-summary', action='store_true',
+                        help="print a per-stage metrics table at the end")
+    parser.add_argument('--profile-stage',
+                        help="run this stage (e.g. analyze_dataframe) under cProfile, "
+                             "writing results/profiles/<TICKER>_<stage>.prof")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main analysis pipeline"""
+    args = parse_args(argv)
+    
     print("🚀 Starting Correlation Analysis: News Sentiment vs Stock Movements")
     print("=" * 70)
     
+    # Worker processes read the lexicon settings from the environment
+    if args.offline:
+        os.environ[OFFLINE_ENV] = "1"
+    if args.lexicon_path:
+        os.environ[LEXICON_PATH_ENV] = args.lexicon_path
+    try:
+        load_vader()
+    except LookupError as e:
+        print(f"❌ {e}")
+        return
+    
+    if args.live:
+        return run_live(args)
+    
+    # Stage metrics are only collected when asked for
+    instrumentation = Instrumentation(
+        enabled=bool(args.metrics or args.metrics_summary or args.profile_stage),
+        output=args.metrics, profile_stage=args.profile_stage
+    )
+    
     # Initialize data loader
-    loader = DataLoader()
+    loader = DataLoader(use_cache=not args.no_cache, compact=args.compact)
     
-    # Load analyst ratings
-    ratings_df = loader.load_analyst_ratings()
-    if ratings_df is None:
-        print("❌ Failed to load analyst ratings")
-        return
+    # Plots are drawn per ticker unless a separate render pass is requested
+    render_inline = args.render_workers <= 1 and not args.no_plots
     
     # Stocks to analyze
-    stocks = ['AAPL', 'AMZN', 'GOOG', 'META', 'MSFT', 'NVDA']
+    stocks = [stock.upper() for stock in args.tickers]
+    if stocks == ['ALL']:
+        stocks = loader.discover_stock_files()
     
-    all_results = {}
+    if args.stream:
+        # Route ratings to per-ticker files so the full frame never exists
+        partition_dir = os.path.join(loader.data_path, ".partitions")
+        with instrumentation.stage(None, 'partition_analyst_ratings'):
+            loader.partition_analyst_ratings(chunksize=args.chunksize, out_dir=partition_dir,
+                                             symbols=stocks)
+        all_results, failures = run_universe(stocks, partition_dir=partition_dir,
+                                             workers=args.workers,
+                                             incremental=args.incremental,
+                                             vader_backend=args.vader_backend,
+                                             dpi=args.dpi, render=render_inline,
+                                             instrumentation=instrumentation,
+                                             compact=args.compact,
+                                             n_resamples=args.resamples,
+                                             score_jobs=args.score_jobs,
+                                             use_cache=not args.no_cache,
+                                             seed=args.seed)
+    else:
+        # Load analyst ratings
+        with instrumentation.stage(None, 'load_analyst_ratings') as s:
+            ratings_df = loader.load_analyst_ratings()
+            s.rows_out = len(ratings_df) if ratings_df is not None else 0
+        if ratings_df is None:
+            print("❌ Failed to load analyst ratings")
+            return
+        
+        # Index tickers once instead of scanning the table per stock
+        ratings_index = RatingsIndex(ratings_df) if 'stock' in ratings_df.columns else None
+        
+        # Analyze each stock; the index already holds the full frame
+        if ratings_index is not None:
+            ratings_df = None
+        all_results, failures = run_universe(stocks, ratings_df, ratings_index,
+                                             workers=args.workers,
+                                             incremental=args.incremental,
+                                             vader_backend=args.vader_backend,
+                                             dpi=args.dpi, render=render_inline,
+                                             instrumentation=instrumentation,
+                                             compact=args.compact,
+                                             n_resamples=args.resamples,
+                                             score_jobs=args.score_jobs,
+                                             use_cache=not args.no_cache,
+                                             seed=args.seed)
+    
+    if not render_inline and not args.no_plots and all_results:
+        with instrumentation.stage(None, 'render_dashboards', rows_in=len(all_results)):
+            StockVisualizer(dpi=args.dpi).render_dashboards(
+                {stock: result['combined_data'] for stock, result in all_results.items()},
+                workers=args.render_workers
+            )
     
-    # Analyze each stock
-    for stock in stocks:
-        result = analyze_stock(stock, ratings_df)
-        if result:
-            all_results[stock] = result
+    if args.panel and all_results:
+        with instrumentation.stage(None, 'panel_analysis', rows_in=len(all_results)):
+            run_panel_analysis(all_results)
     
     # Summary
     print(f"\n🎉 ANALYSIS COMPLETED!")
     print(f"✅ Successful: {len(all_results)} stocks")
+    skipped = [stock for stock in stocks if stock not in all_results and stock not in failures]
+    if skipped:
+        print(f"⚠ No results: {', '.join(skipped)}")
+    if failures:
+        print(f"❌ Failed: {len(failures)} stocks")
+        for stock, error in failures.items():
+            print(f"   {stock}: {error.strip().splitlines()[-1]}")
     print(f"📊 Results saved in './results/' folder")
+    if args.metrics_summary:
+        instrumentation.print_summary()
+    if args.metrics:
+        print(f"📏 Stage metrics appended to {args.metrics}")
     
     return all_results
 
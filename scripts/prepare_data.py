@@ -10,3 +10,12 @@ def load_and_prepare(file_path):
     df['Date'] = pd.to_datetime(df['Date'])
     df.set_index('Date', inplace=True)
     return df
+
+
+def build_price_panel(frames, column='Close'):
+    """
+    Align one price column of several load_and_prepare outputs into a
+    (dates x tickers) frame; dates missing for a ticker are NaN.
+    """
+    panel = pd.concat({ticker: df[column] for ticker, df in frames.items()}, axis=1)
+    return panel.sort_index()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+
+class RatingsIndex:
+    """Per-ticker row index over an analyst ratings frame
+
+    The frame is reordered once by uppercased ticker code, so the rows of
+    any ticker form one contiguous block and `get` returns a zero-copy
+    slice instead of scanning the whole table.
+    """
+
+    def __init__(self, ratings_df, column='stock'):
+        # One uppercase pass and one stable sort for the whole table
+        keys = ratings_df[column].str.upper()
+        codes, symbols = pd.factorize(keys, sort=True)
+        order = np.argsort(codes, kind='stable')
+
+        self.frame = ratings_df.take(order)
+        self.codes = codes[order]
+        self.symbols = list(symbols)
+
+        # Rows without a ticker (code -1) sort first
+        counts = np.bincount(codes[codes >= 0], minlength=len(symbols))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+        self._slots = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        print(f"🗂 Indexed {len(ratings_df)} ratings across {len(self.symbols)} tickers")
+
+    def get(self, stock_symbol):
+        """Rows for one ticker as a slice of the indexed frame (empty if unknown)"""
+        slot = self._slots.get(stock_symbol.upper())
+        if slot is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def counts(self):
+        """Number of ratings per ticker"""
+        return pd.Series(np.diff(self.offsets), index=self.symbols, name='ratings')
+
+    def __contains__(self, stock_symbol):
+        return stock_symbol.upper() in self._slots
+
+    def __len__(self):
+        return len(self.symbols)
+
+
+if __name__ == "__main__":
+    index = RatingsIndex(pd.DataFrame({'stock': ['aapl', 'MSFT', 'AAPL']}))
+    print(index.counts())
@@ -1,29 +1,193 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
+
+import numpy as np
 import pandas as pd
-from textblob import TextBlob
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
 
-try:
-    nltk.data.find('vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon')
+from fast_vader import FAST_VADER_VERSION
+
+# Local VADER lexicon: a vader_lexicon.txt file or an nltk_data directory
+LEXICON_PATH_ENV = "VADER_LEXICON_PATH"
+
+# Set to 1 to never download the lexicon and fail fast when it is missing
+OFFLINE_ENV = "SENTIMENT_OFFLINE"
+
+
+def _package_version(name):
+    """Installed version of a package, or 'unknown'"""
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+# Identity of the scoring methods, used to namespace cached scores
+ANALYZER_NAME = "textblob+vader"
+ANALYZER_VERSION = f"textblob-{_package_version('textblob')}/nltk-{_package_version('nltk')}"
+
+# Order of the score rows returned by SentimentAnalyzer.score_batch
+SENTIMENT_FIELDS = [
+    'polarity', 'subjectivity', 'vader_compound',
+    'vader_positive', 'vader_negative', 'vader_neutral'
+]
+
+# VADER implementations selectable with SentimentAnalyzer(vader_backend=...)
+VADER_BACKENDS = ('nltk', 'fast')
+
+# int8 codes stored in 'sentiment_label' by compact analyzers
+LABEL_CODES = {'negative': -1, 'neutral': 0, 'positive': 1}
+LABEL_NAMES = {code: name for name, code in LABEL_CODES.items()}
+
+# Process-wide scorers, loaded on first use and shared by every analyzer
+_shared = {}
+
+# Per-process analyzer used by the scoring pool workers
+_worker_analyzer = None
+
+
+def load_vader(lexicon_path=None, offline=None):
+    """Process-wide NLTK VADER analyzer, loading the lexicon on first call
+    
+    `lexicon_path` (default: $VADER_LEXICON_PATH) is a vader_lexicon.txt
+    file or an nltk_data directory. Offline (default: $SENTIMENT_OFFLINE)
+    a missing lexicon raises LookupError instead of being downloaded.
+    """
+    if 'vader' in _shared:
+        return _shared['vader']
+    
+    import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    
+    lexicon_path = lexicon_path or os.environ.get(LEXICON_PATH_ENV)
+    if offline is None:
+        offline = os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes")
+    
+    if lexicon_path and os.path.isfile(lexicon_path):
+        # nltk.data only opens files under its own search paths
+        lexicon_path = os.path.abspath(lexicon_path)
+        nltk.data.path.insert(0, os.path.dirname(lexicon_path))
+        sia = SentimentIntensityAnalyzer(lexicon_file=f"file:{lexicon_path}")
+    else:
+        if lexicon_path:
+            nltk.data.path.insert(0, lexicon_path)
+        try:
+            nltk.data.find('sentiment/vader_lexicon.zip')
+        except LookupError:
+            if offline:
+                raise LookupError(
+                    f"VADER lexicon not found and offline mode is on; set "
+                    f"{LEXICON_PATH_ENV} to a vader_lexicon.txt or nltk_data directory"
+                ) from None
+            nltk.download('vader_lexicon', quiet=True)
+        sia = SentimentIntensityAnalyzer()
+    
+    _shared['vader'] = sia
+    return sia
+
+
+def _fast_vader():
+    """Process-wide FastVader compiled from the shared lexicon"""
+    if 'fast_vader' not in _shared:
+        from fast_vader import FastVader
+        _shared['fast_vader'] = FastVader(load_vader().lexicon)
+    return _shared['fast_vader']
+
+
+def _textblob_sentiment(text):
+    """TextBlob (polarity, subjectivity), importing TextBlob on first use"""
+    if 'textblob' not in _shared:
+        from textblob import TextBlob
+        _shared['textblob'] = TextBlob
+    return _shared['textblob'](str(text)).sentiment
+
+
+def get_analyzer(vader_backend='nltk'):
+    """The process-wide SentimentAnalyzer for a VADER backend (no cache)"""
+    key = ('analyzer', vader_backend)
+    if key not in _shared:
+        _shared[key] = SentimentAnalyzer(vader_backend=vader_backend)
+    return _shared[key]
+
+
+def label_names(labels):
+    """'sentiment_label' values as names, whether stored as names or int8 codes"""
+    labels = pd.Series(labels)
+    if pd.api.types.is_numeric_dtype(labels):
+        return labels.map(LABEL_NAMES)
+    return labels
+
+
+def _init_worker(vader_backend='nltk'):
+    """Set up the analyzer of a worker process (loads the VADER lexicon once)"""
+    global _worker_analyzer
+    _worker_analyzer = get_analyzer(vader_backend)
+
+
+def _score_chunk(texts):
+    """Score a chunk of texts inside a pool worker"""
+    return _worker_analyzer._score_texts(texts)
+
 
 class SentimentAnalyzer:
-    def __init__(self):
-        self.sia = SentimentIntensityAnalyzer()
+    def __init__(self, cache=None, vader_backend='nltk', compact=False, n_jobs=1,
+                 chunk_size=2000):
+        """`vader_backend='fast'` scores VADER for whole batches with FastVader
+        
+        Scorers and the VADER lexicon are loaded on first use and shared
+        by every analyzer in the process (see load_vader). `compact` stores
+        scores as float32 and labels as int8 codes (see LABEL_CODES).
+        `n_jobs` and `chunk_size` are analyze_dataframe's scoring pool defaults.
+        """
+        if vader_backend not in VADER_BACKENDS:
+            raise ValueError(f"Unknown VADER backend: {vader_backend}")
+        self.vader_backend = vader_backend
+        self.compact = compact
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        # Optional SentimentCache shared across runs
+        self.cache = cache
+        self.cache_namespace = f"{ANALYZER_NAME}/{ANALYZER_VERSION}"
+        if vader_backend == 'fast':
+            self.cache_namespace += f"/fast-vader-{FAST_VADER_VERSION}"
+    
+    @property
+    def sia(self):
+        """Shared NLTK SentimentIntensityAnalyzer"""
+        return load_vader()
+    
+    @property
+    def fast_vader(self):
+        """Shared FastVader, or None with the NLTK backend"""
+        return _fast_vader() if self.vader_backend == 'fast' else None
     
     def analyze_sentiment(self, text):
         """Analyze sentiment of a text using multiple methods"""
         if pd.isna(text) or text == "":
             return {'polarity': 0, 'subjectivity': 0, 'vader_compound': 0}
         
+        if self.cache is None:
+            return self._compute_sentiment(text)
+        
+        cached = self.cache.get(text, self.cache_namespace)
+        if cached is not None:
+            return cached
+        
+        result = self._compute_sentiment(text)
+        self.cache.put(text, result, self.cache_namespace)
+        return result
+    
+    def _compute_sentiment(self, text):
+        """Score a non-empty text with TextBlob and VADER"""
         # TextBlob analysis
-        blob = TextBlob(str(text))
-        polarity = blob.sentiment.polarity
-        subjectivity = blob.sentiment.subjectivity
+        polarity, subjectivity = _textblob_sentiment(text)
         
         # VADER analysis
-        vader_scores = self.sia.polarity_scores(str(text))
+        if self.vader_backend == 'fast':
+            vader_scores = {key: float(values[0]) for key, values
+                            in self.fast_vader.polarity_scores([text]).items()}
+        else:
+            vader_scores = self.sia.polarity_scores(str(text))
         
         return {
             'polarity': polarity,
@@ -34,46 +198,246 @@ class SentimentAnalyzer:
             'vader_neutral': vader_scores['neu']
         }
     
-    def analyze_dataframe(self, df, text_column='headline'):
-        """Perform sentiment analysis on a dataframe"""
+    def _score_texts(self, texts):
+        """Score texts into a (fields x texts) float array"""
+        scores = np.zeros((len(SENTIMENT_FIELDS), len(texts)), dtype=np.float64)
+        if self.vader_backend == 'fast':
+            return self._score_texts_fast(texts, scores)
+        for i, text in enumerate(texts):
+            if pd.isna(text) or text == "":
+                continue
+            result = self._compute_sentiment(text)
+            for j, field in enumerate(SENTIMENT_FIELDS):
+                scores[j, i] = result.get(field, 0)
+        return scores
+    
+    def _score_texts_fast(self, texts, scores):
+        """TextBlob per text, VADER for the whole batch at once"""
+        present = [i for i, text in enumerate(texts) if not (pd.isna(text) or text == "")]
+        for i in present:
+            scores[0, i], scores[1, i] = _textblob_sentiment(texts[i])
+        vader_scores = self.fast_vader.polarity_scores([texts[i] for i in present])
+        for j, key in enumerate(['compound', 'pos', 'neg', 'neu'], start=2):
+            scores[j, present] = vader_scores[key]
+        return scores
+    
+    def score_batch(self, texts, n_jobs=1, chunk_size=2000, fields=None):
+        """Score many texts at once, scoring each unique text only once
+        
+        Unique texts are split into chunks of `chunk_size` and spread over
+        `n_jobs` worker processes (None or -1 uses every core). Returns a
+        dict mapping each name in SENTIMENT_FIELDS to a contiguous array
+        aligned with `texts`; missing texts score 0 everywhere. With a cache
+        attached, only texts missing from it are scored. `fields` limits the
+        returned arrays to those names.
+        """
+        # Factorize Series in their own dtype; Arrow-backed text is never
+        # expanded into one Python string per row
+        if not isinstance(texts, pd.Series):
+            texts = pd.Series(texts, dtype=object)
+        codes, uniques = pd.factorize(texts)
+        uniques = list(uniques)
+        
+        cached = {}
+        if self.cache is not None:
+            cached = self.cache.get_many(uniques, self.cache_namespace)
+        todo = [i for i, text in enumerate(uniques) if text not in cached]
+        
+        unique_scores = np.zeros((len(SENTIMENT_FIELDS), len(uniques)), dtype=np.float64)
+        for i, text in enumerate(uniques):
+            if text in cached:
+                unique_scores[:, i] = [cached[text][field] for field in SENTIMENT_FIELDS]
+        
+        if todo:
+            todo_texts = [uniques[i] for i in todo]
+            new_scores = self._score_parallel(todo_texts, n_jobs, chunk_size)
+            unique_scores[:, todo] = new_scores
+            if self.cache is not None:
+                self.cache.put_many(
+                    {text: dict(zip(SENTIMENT_FIELDS, new_scores[:, i]))
+                     for i, text in enumerate(todo_texts)},
+                    self.cache_namespace
+                )
+        
+        # Extra all-zero column for missing texts (factorize code -1)
+        unique_scores = np.concatenate(
+            [unique_scores, np.zeros((len(SENTIMENT_FIELDS), 1))], axis=1
+        )
+        codes = np.where(codes < 0, len(uniques), codes)
+        fields = list(fields or SENTIMENT_FIELDS)
+        rows = [SENTIMENT_FIELDS.index(field) for field in fields]
+        scores = unique_scores[rows].take(codes, axis=1)
+        
+        print(f"🧮 Scored {len(todo)} new of {len(uniques)} unique texts for {len(codes)} rows")
+        return {field: scores[j] for j, field in enumerate(fields)}
+    
+    def _score_parallel(self, texts, n_jobs, chunk_size):
+        """Score texts in chunks, on a process pool when n_jobs > 1"""
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        
+        if n_jobs == 1 or len(texts) <= chunk_size:
+            return self._score_texts(texts)
+        
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks)),
+                                 initializer=_init_worker,
+                                 initargs=(self.vader_backend,)) as pool:
+            return np.concatenate(list(pool.map(_score_chunk, chunks)), axis=1)
+    
+    def analyze_dataframe(self, df, text_column='headline', n_jobs=None, chunk_size=None):
+        """Perform sentiment analysis on a dataframe
+        
+        `n_jobs` and `chunk_size` default to the analyzer's settings (see
+        score_batch; pass -1 for every core).
+        """
         print("🔍 Performing sentiment analysis...")
+        if n_jobs is None:
+            n_jobs = self.n_jobs
+        if chunk_size is None:
+            chunk_size = self.chunk_size
         
-        # Apply sentiment analysis
-        sentiment_results = df[text_column].apply(self.analyze_sentiment)
+        # Score every unique headline once
+        scores = self.score_batch(df[text_column], n_jobs=n_jobs, chunk_size=chunk_size,
+                                  fields=['polarity', 'subjectivity', 'vader_compound'])
         
         # Add sentiment columns to dataframe
-        df['sentiment_polarity'] = sentiment_results.apply(lambda x: x['polarity'])
-        df['sentiment_subjectivity'] = sentiment_results.apply(lambda x: x['subjectivity'])
-        df['vader_compound'] = sentiment_results.apply(lambda x: x['vader_compound'])
+        score_dtype = np.float32 if self.compact else np.float64
+        df['sentiment_polarity'] = scores['polarity'].astype(score_dtype, copy=False)
+        df['sentiment_subjectivity'] = scores['subjectivity'].astype(score_dtype, copy=False)
+        df['vader_compound'] = scores['vader_compound'].astype(score_dtype, copy=False)
         
-        # Classify sentiment
-        df['sentiment_label'] = df['sentiment_polarity'].apply(
-            lambda x: 'positive' if x > 0.5 else 'negative' if x < 0.5 else 'neutral'
-        )
+        # Classify sentiment (from the full-precision scores)
+        polarity = scores['polarity']
+        if self.compact:
+            df['sentiment_label'] = np.sign(polarity - 0.5).astype(np.int8)
+        else:
+            df['sentiment_label'] = np.where(
+                polarity > 0.5, 'positive', np.where(polarity < 0.5, 'negative', 'neutral')
+            ).astype(object)
         
         print("✅ Sentiment analysis completed")
-        print(f"Sentiment distribution:\n{df['sentiment_label'].value_counts()}")
+        print(f"Sentiment distribution:\n{label_names(df['sentiment_label']).value_counts()}")
         
         return df
     
     def aggregate_daily_sentiment(self, df):
         """Aggregate sentiment scores by date"""
-        daily_sentiment = df.groupby('date').agg({
-            'sentiment_polarity': ['mean', 'std', 'count'],
-            'vader_compound': ['mean', 'std'],
-            'sentiment_label': lambda x: (x == 'positive').sum() / len(x) if len(x) > 0 else 0
-        }).round(4)
+        daily_sentiment = DailySentimentStats.from_frame(df).to_frame()
+        print(f"📊 Aggregated sentiment for {len(daily_sentiment)} days")
         
-        # Flatten column names
-        daily_sentiment.columns = [
-            'avg_polarity', 'std_polarity', 'article_count',
-            'avg_vader_compound', 'std_vader_compound',
-            'positive_ratio'
-        ]
+        return daily_sentiment
+
+
+class DailySentimentStats:
+    """Per-day sufficient statistics of scored headlines
+    
+    Each day holds (count, sum, sum of squares) of polarity and VADER
+    compound plus the positive-label count, computed with segment
+    reductions over date-sorted arrays. Days are mergeable, so late or
+    partial batches fold into existing days without regrouping history.
+    """
+    
+    FIELDS = ['count', 'sum_polarity', 'sumsq_polarity',
+              'sum_vader', 'sumsq_vader', 'positive_count']
+    
+    def __init__(self, dates=None, stats=None):
+        self.dates = dates
+        self.stats = stats if stats is not None else np.zeros((0, len(self.FIELDS)))
+    
+    @classmethod
+    def from_frame(cls, df):
+        """Reduce a scored frame ('date', 'sentiment_polarity', ...) to daily stats"""
+        dates = df['date'].to_numpy()
+        polarity = df['sentiment_polarity'].to_numpy(dtype=np.float64)
+        vader = df['vader_compound'].to_numpy(dtype=np.float64)
+        if df['vader_compound'].dtype == np.float32:
+            # Compounds have 4 decimals; recover the exact values from float32
+            vader = np.round(vader, 4)
+        labels = df['sentiment_label']
+        if pd.api.types.is_numeric_dtype(labels):
+            positive = (labels == LABEL_CODES['positive']).to_numpy(dtype=np.float64)
+        else:
+            positive = (labels == 'positive').to_numpy(dtype=np.float64)
         
-        daily_sentiment = daily_sentiment.reset_index()
-        print(f"📊 Aggregated sentiment for {len(daily_sentiment)} days")
+        order = np.argsort(dates, kind='stable')
+        dates = dates[order]
+        values = np.column_stack([
+            np.ones(len(dates)), polarity, polarity ** 2, vader, vader ** 2, positive
+        ])[order]
+        if len(dates) == 0:
+            return cls(dates)
+        starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+        return cls(dates[starts], np.add.reduceat(values, starts, axis=0))
+    
+    def update(self, df):
+        """Fold a batch of newly scored headlines into the daily state"""
+        self.merge(DailySentimentStats.from_frame(df))
+        return self
+    
+    def merge(self, other):
+        """Add another set of daily stats, combining days present in both"""
+        if other.dates is None or len(other.dates) == 0:
+            return self
+        if self.dates is None or len(self.dates) == 0:
+            self.dates, self.stats = other.dates.copy(), other.stats.copy()
+            return self
         
+        other_dates = other.dates.astype(self.dates.dtype)
+        pos = np.searchsorted(self.dates, other_dates)
+        known = pos < len(self.dates)
+        known[known] = self.dates[pos[known]] == other_dates[known]
+        self.stats[pos[known]] += other.stats[known]
+        
+        new = ~known
+        if new.any():
+            self.dates = np.insert(self.dates, pos[new], other_dates[new])
+            self.stats = np.insert(self.stats, pos[new], other.stats[new], axis=0)
+        return self
+    
+    def total_through(self, date, pop=False):
+        """Days up to and including `date` summed into one day labelled `date`
+        
+        With `pop` those days are also removed from this instance.
+        """
+        if len(self) == 0:
+            return DailySentimentStats()
+        date = pd.Timestamp(date).to_datetime64().astype(self.dates.dtype)
+        end = np.searchsorted(self.dates, date, side='right')
+        total = DailySentimentStats()
+        if end:
+            total = DailySentimentStats(np.array([date]),
+                                        self.stats[:end].sum(axis=0, keepdims=True))
+        if pop:
+            self.dates, self.stats = self.dates[end:], self.stats[end:]
+        return total
+    
+    def __len__(self):
+        return 0 if self.dates is None else len(self.dates)
+    
+    def to_frame(self):
+        """Daily means, sample stds, counts and positive ratio"""
+        columns = ['date', 'avg_polarity', 'std_polarity', 'article_count',
+                   'avg_vader_compound', 'std_vader_compound', 'positive_ratio']
+        if len(self) == 0:
+            return pd.DataFrame(columns=columns)
+        
+        count, sum_pol, sumsq_pol, sum_vader, sumsq_vader, positive = self.stats.T
+        
+        def sample_std(total, total_sq):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                variance = (total_sq - total * total / count) / (count - 1)
+            return np.sqrt(np.clip(variance, 0, None))
+        
+        daily_sentiment = pd.DataFrame({
+            'avg_polarity': sum_pol / count,
+            'std_polarity': sample_std(sum_pol, sumsq_pol),
+            'article_count': count.astype(np.int64),
+            'avg_vader_compound': sum_vader / count,
+            'std_vader_compound': sample_std(sum_vader, sumsq_vader),
+            'positive_ratio': positive / count
+        }).round(4)
+        daily_sentiment.insert(0, 'date', self.dates)
         return daily_sentiment
 
 if __name__ == "__main__":
@@ -0,0 +1,188 @@
+import atexit
+import hashlib
+import os
+import sqlite3
+import time
+
+# Score fields stored for every cached text (same order as SENTIMENT_FIELDS)
+CACHE_FIELDS = [
+    'polarity', 'subjectivity', 'vader_compound',
+    'vader_positive', 'vader_negative', 'vader_neutral'
+]
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+_QUERY_BATCH = 500
+
+
+class SentimentCache:
+    """On-disk, content-addressed cache of sentiment scores
+
+    Entries are keyed by a SHA-256 of the analyzer namespace (name and
+    version) plus the text, so a new analyzer version never reads stale
+    scores. The cache holds at most `max_entries` rows and evicts the least
+    recently used ones first. Eviction runs once the table outgrows the
+    cap by `evict_margin` rows (default 1%), so the rows are only counted
+    then, not on every insert.
+
+    Single puts and LRU refreshes are buffered in memory and written in
+    one transaction every `write_batch` operations, on put_many(), flush()
+    and close().
+    """
+
+    def __init__(self, path="./cache/sentiment_cache.sqlite", max_entries=2_000_000,
+                 write_batch=256, evict_margin=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.write_batch = write_batch
+        self.evict_margin = max_entries // 100 if evict_margin is None else evict_margin
+        self.hits = 0
+        self.misses = 0
+        # Rows not yet written (key -> row) and hits not yet refreshed (key -> time)
+        self._pending = {}
+        self._touched = {}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "key BLOB PRIMARY KEY, "
+            + ", ".join(f"{field} REAL" for field in CACHE_FIELDS)
+            + ", last_used REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON scores(last_used)")
+        self.conn.commit()
+        # Upper bound on the row count; replaced keys are counted twice
+        # until the next exact count
+        self._size = self._count()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def make_key(text, namespace):
+        """Hash a text together with the analyzer namespace"""
+        return hashlib.sha256(f"{namespace}\0{text}".encode('utf-8')).digest()
+
+    def get_many(self, texts, namespace):
+        """Look up many texts at once, returning {text: scores dict} for the hits"""
+        keys = {self.make_key(text, namespace): text for text in texts}
+        found = {}
+        for key in keys:
+            if key in self._pending:
+                found[key] = dict(zip(CACHE_FIELDS, self._pending[key][1:-1]))
+
+        key_list = [key for key in keys if key not in found]
+        columns = ", ".join(CACHE_FIELDS)
+        for i in range(0, len(key_list), _QUERY_BATCH):
+            batch = key_list[i:i + _QUERY_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, {columns} FROM scores WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for row in rows:
+                found[row[0]] = dict(zip(CACHE_FIELDS, row[1:]))
+
+        # Refresh recency of the hits for LRU eviction
+        if found:
+            now = time.time()
+            self._touched.update((key, now) for key in found)
+            if len(self._touched) >= self.write_batch:
+                self.flush()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return {keys[key]: scores for key, scores in found.items()}
+
+    def get(self, text, namespace):
+        """Look up a single text, returning its scores dict or None"""
+        return self.get_many([text], namespace).get(text)
+
+    def put_many(self, scores_by_text, namespace):
+        """Insert {text: scores dict} entries now, with anything buffered"""
+        self._buffer(scores_by_text, namespace)
+        self.flush()
+
+    def put(self, text, scores, namespace):
+        """Buffer a single text's scores; written every `write_batch` puts"""
+        self._buffer({text: scores}, namespace)
+        if len(self._pending) >= self.write_batch:
+            self.flush()
+
+    def _buffer(self, scores_by_text, namespace):
+        now = time.time()
+        for text, scores in scores_by_text.items():
+            key = self.make_key(text, namespace)
+            self._pending[key] = (key, *[float(scores.get(field, 0)) for field in CACHE_FIELDS],
+                                  now)
+        self._size += len(scores_by_text)
+
+    def _write(self):
+        """Write buffered rows and recency refreshes in one transaction"""
+        if not self._pending and not self._touched:
+            return
+        if self._pending:
+            placeholders = ", ".join("?" * (len(CACHE_FIELDS) + 2))
+            self.conn.executemany(f"INSERT OR REPLACE INTO scores VALUES ({placeholders})",
+                                  list(self._pending.values()))
+        if self._touched:
+            self.conn.executemany("UPDATE scores SET last_used = ? WHERE key = ?",
+                                  [(now, key) for key, now in self._touched.items()])
+        self.conn.commit()
+        self._pending.clear()
+        self._touched.clear()
+
+    def flush(self):
+        """Write everything buffered, evicting once the cap is exceeded by the margin"""
+        self._write()
+        if self._size > self.max_entries + self.evict_margin:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used entries beyond max_entries"""
+        self._write()
+        self._size = self._count()
+        excess = self._size - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM scores WHERE key IN "
+                "(SELECT key FROM scores ORDER BY last_used LIMIT ?)", (excess,)
+            )
+            self.conn.commit()
+            self._size = self.max_entries
+        return max(excess, 0)
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        self._pending.clear()
+        self._touched.clear()
+        self.conn.execute("DELETE FROM scores")
+        self.conn.commit()
+        self._size = 0
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+        self.conn.close()
+
+    def _count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def __len__(self):
+        self.flush()
+        return self._count()
+
+
+if __name__ == "__main__":
+    cache = SentimentCache()
+    print(f"SentimentCache initialized: {cache.stats()}")
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Headline building blocks; words carry TextBlob/VADER sentiment and some
+# phrases match the event tagger's dictionary
+SUBJECTS = ["{s} shares", "{s} stock", "Analysts on {s}", "{s}", "Traders in {s}"]
+VERBS = ["surge after", "fall after", "rise on", "slip on", "hold steady despite",
+         "jump following", "tumble amid", "rally on", "drop ahead of", "climb after"]
+OBJECTS = ["strong earnings", "weak guidance", "price target raise", "FDA approval",
+           "analyst upgrade", "analyst downgrade", "dividend hike", "lawsuit news",
+           "merger talks", "record revenue", "disappointing outlook", "buyback plan",
+           "great quarterly results", "terrible sales data", "mixed Q3 numbers"]
+PUBLISHERS = ["Benzinga Newsdesk", "Lisa Levin", "Charles Gross", "Monica Gerson", "Vick Meyer"]
+
+
+def generate_prices(symbols, days, seed=0, start="2020-01-01"):
+    """Daily OHLCV frames per symbol, shaped like the yfinance CSVs
+
+    Prices follow a geometric random walk over `days` business days.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=days)
+    frames = {}
+    for symbol in symbols:
+        returns = rng.normal(0.0003, 0.02, days)
+        close = 100 * np.exp(np.cumsum(returns))
+        spread = np.abs(rng.normal(0, 0.01, days)) * close
+        open_ = close * (1 + rng.normal(0, 0.005, days))
+        frames[symbol] = pd.DataFrame({
+            'Date': dates.strftime('%Y-%m-%d'),
+            'Open': open_,
+            'High': np.maximum(open_, close) + spread,
+            'Low': np.minimum(open_, close) - spread,
+            'Close': close,
+            'Adj Close': close,
+            'Volume': rng.integers(100_000, 10_000_000, days),
+            'Dividends': 0.0,
+            'Stock Splits': 0.0
+        })
+    return frames
+
+
+def generate_ratings(symbols, days, headlines_per_day, seed=0, start="2020-01-01"):
+    """Analyst ratings frame with `headlines_per_day` headlines per symbol and day
+
+    Headlines are drawn from a fixed vocabulary (so repeats occur, as in the
+    real feed) and timestamped across every calendar day, weekends included,
+    in the feed's UTC-offset format.
+    """
+    rng = np.random.default_rng(seed + 1)
+    calendar_days = int(days * 7 / 5) + 1
+    n = len(symbols) * calendar_days * headlines_per_day
+    stock = np.repeat(np.asarray(symbols, dtype=object), calendar_days * headlines_per_day)
+
+    subjects = rng.choice(SUBJECTS, n)
+    headline = [
+        f"{subject.format(s=s)} {verb} {obj}"
+        for subject, s, verb, obj in zip(subjects, stock, rng.choice(VERBS, n),
+                                         rng.choice(OBJECTS, n))
+    ]
+    timestamps = (pd.Timestamp(start)
+                  + pd.to_timedelta(rng.integers(0, calendar_days, n), unit='D')
+                  + pd.to_timedelta(rng.integers(6 * 3600, 22 * 3600, n), unit='s'))
+
+    return pd.DataFrame({
+        'headline': headline,
+        'url': [f"https://example.com/news/{i}" for i in range(n)],
+        'publisher': rng.choice(PUBLISHERS, n),
+        'date': timestamps.strftime('%Y-%m-%d %H:%M:%S') + "-04:00",
+        'stock': stock
+    })
+
+
+def write_dataset(out_dir, n_tickers=5, days=250, headlines_per_day=10, seed=0):
+    """Write price CSVs and raw_analyst_ratings.csv into `out_dir`
+
+    The same arguments always produce the same files. Returns the symbols.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    symbols = [f"T{i:03d}" for i in range(n_tickers)]
+    for symbol, frame in generate_prices(symbols, days, seed).items():
+        frame.to_csv(os.path.join(out_dir, f"{symbol}.csv"), index=False)
+    generate_ratings(symbols, days, headlines_per_day, seed).to_csv(
+        os.path.join(out_dir, "raw_analyst_ratings.csv")
+    )
+    return symbols
+
+
+if __name__ == "__main__":
+    print(write_dataset("./data/synthetic", n_tickers=2, days=20, headlines_per_day=3))
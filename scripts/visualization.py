@@ -1,16 +1,68 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-import os
+
+# matplotlib.pyplot, imported by the first StockVisualizer that draws
+plt = None
+
+# Named resolution tiers accepted by StockVisualizer(dpi=...)
+DPI_TIERS = {'preview': 72, 'standard': 150, 'print': 300}
+
+# Bump when the figure layout changes so stored hashes stop matching
+RENDER_VERSION = "3"
+
+# Columns whose values determine the rendered figures
+PLOT_COLUMNS = ['date', 'avg_polarity', 'daily_return', 'avg_vader_compound']
+
+
+def _load_pyplot(backend):
+    """Import pyplot on first use, switching to `backend` if given"""
+    global plt
+    if plt is None:
+        import matplotlib
+        if backend is not None:
+            matplotlib.use(backend)
+        import matplotlib.pyplot as pyplot
+        plt = pyplot
+    elif backend is not None and plt.get_backend().lower() != backend.lower():
+        plt.switch_backend(backend)
+    return plt
+
+
+def _render_dashboard(job):
+    """Render one ticker's figures inside a worker process"""
+    options, combined_data, stock_symbol, save_dir = job
+    StockVisualizer(**options).create_dashboard(combined_data, stock_symbol, save_dir)
+    return stock_symbol
+
 
 class StockVisualizer:
-    def __init__(self):
-        plt.style.use('default')
-        # Set better default styles
-        plt.rcParams['font.size'] = 10
-        plt.rcParams['axes.titlesize'] = 12
-        plt.rcParams['axes.labelsize'] = 11
+    def __init__(self, dpi='print', skip_unchanged=True, backend='Agg'):
+        """`dpi` is a number or a DPI_TIERS name ('preview' for quick looks)
+        
+        Figures whose input data is unchanged since the last render are
+        skipped when `skip_unchanged` is set. `backend` forces a
+        non-interactive matplotlib backend (None keeps the current one).
+        """
+        self.options = {'dpi': dpi, 'skip_unchanged': skip_unchanged, 'backend': backend}
+        self.dpi = DPI_TIERS.get(dpi, dpi)
+        self.skip_unchanged = skip_unchanged
+        self.backend = backend
+        self._styled = False
+    
+    def _setup(self):
+        """Import matplotlib and apply the plot style before the first figure"""
+        _load_pyplot(self.backend)
+        if not self._styled:
+            plt.style.use('default')
+            # Set better default styles
+            plt.rcParams['font.size'] = 10
+            plt.rcParams['axes.titlesize'] = 12
+            plt.rcParams['axes.labelsize'] = 11
+            self._styled = True
     
     def create_dashboard(self, combined_data, stock_symbol, save_dir="./results"):
         """Create comprehensive dashboard for a stock"""
@@ -21,8 +73,20 @@ class StockVisualizer:
             return
         
         os.makedirs(save_dir, exist_ok=True)
+        plot_dir = os.path.join(save_dir, "individual_plots", stock_symbol)
+        dashboard_path = os.path.join(save_dir, f"{stock_symbol}_dashboard.png")
+        scatter_paths = [os.path.join(plot_dir, f'{stock_symbol}_polarity_vs_returns.png'),
+                         os.path.join(plot_dir, f'{stock_symbol}_vader_vs_returns.png')]
+        hash_path = os.path.join(plot_dir, ".render_hash")
+        
+        data_hash = self._data_hash(plot_data, stock_symbol)
+        if self.skip_unchanged and self._is_current(hash_path, data_hash,
+                                                    [dashboard_path] + scatter_paths):
+            print(f"⏭ Plots for {stock_symbol} are up to date")
+            return
         
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        self._setup()
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12), dpi=self.dpi)
         fig.suptitle(f'News Sentiment vs Stock Returns: {stock_symbol}', fontsize=16, fontweight='bold')
         
         # 1. Scatter: Polarity vs Returns
@@ -44,15 +108,64 @@ class StockVisualizer:
         plt.tight_layout()
         plt.subplots_adjust(top=0.93)
         
-        # Save dashboard
-        dashboard_path = os.path.join(save_dir, f"{stock_symbol}_dashboard.png")
-        plt.savefig(dashboard_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
-        
+        # Render once; the individual scatter plots are crops of the dashboard
+        fig.canvas.draw()
+        renderer = fig.canvas.get_renderer()
+        image = np.asarray(fig.canvas.buffer_rgba())[..., :3]
+        # Same framing as savefig(bbox_inches='tight') with its 0.1 inch padding
+        tight = fig.get_tightbbox(renderer).transformed(fig.dpi_scale_trans)
+        self._save_png(dashboard_path, self._crop(image, tight, pad=round(0.1 * fig.dpi)))
         print(f"✅ Dashboard saved: {dashboard_path}")
         
-        # Create individual plots
-        self.create_individual_plots(plot_data, stock_symbol, save_dir)
+        os.makedirs(plot_dir, exist_ok=True)
+        for ax, path in zip([axes[0, 0], axes[0, 1]], scatter_paths):
+            self._save_png(path, self._crop(image, ax.get_tightbbox(renderer)))
+        plt.close(fig)
+        print(f"✅ Individual plots saved for {stock_symbol}")
+        
+        with open(hash_path, 'w') as f:
+            f.write(data_hash)
+    
+    def render_dashboards(self, frames, save_dir="./results", workers=1):
+        """Render dashboards for many tickers, across worker processes when workers > 1
+        
+        `frames` maps each stock symbol to its combined data.
+        """
+        jobs = [(self.options, data, symbol, save_dir) for symbol, data in frames.items()]
+        if workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                _render_dashboard(job)
+            return
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            list(pool.map(_render_dashboard, jobs))
+    
+    def _data_hash(self, plot_data, stock_symbol):
+        """Digest of everything a ticker's figures are drawn from"""
+        digest = hashlib.sha1(f"{RENDER_VERSION}|{stock_symbol}|{self.dpi}".encode('utf-8'))
+        columns = [col for col in PLOT_COLUMNS if col in plot_data.columns]
+        digest.update(pd.util.hash_pandas_object(plot_data[columns], index=False).to_numpy())
+        return digest.hexdigest()
+    
+    def _is_current(self, hash_path, data_hash, paths):
+        """Whether every output exists and was rendered from the same data"""
+        if not all(os.path.exists(path) for path in paths + [hash_path]):
+            return False
+        with open(hash_path) as f:
+            return f.read().strip() == data_hash
+    
+    def _save_png(self, path, image):
+        """Write rendered pixels; lighter compression keeps encoding fast"""
+        plt.imsave(path, image, dpi=self.dpi, pil_kwargs={'compress_level': 3})
+    
+    def _crop(self, image, bbox, pad=8):
+        """Pixels of a rendered canvas inside a display-space bounding box"""
+        height, width = image.shape[:2]
+        x0 = max(int(bbox.x0) - pad, 0)
+        x1 = min(int(np.ceil(bbox.x1)) + pad, width)
+        # Display coordinates start at the bottom, image rows at the top
+        y0 = max(height - int(np.ceil(bbox.y1)) - pad, 0)
+        y1 = min(height - int(bbox.y0) + pad, height)
+        return image[y0:y1, x0:x1]
     
     def _plot_scatter(self, ax, data, x_col, y_col, x_label, y_label, title, color):
         """Create scatter plot with trend line"""
@@ -112,33 +225,6 @@ class StockVisualizer:
         ax.set_title(f'{stock_symbol}: Distributions', fontweight='bold')
         ax.legend()
         ax.grid(True, alpha=0.3)
-    
-    def create_individual_plots(self, data, stock_symbol, save_dir):
-        """Create individual plot files"""
-        plot_dir = os.path.join(save_dir, "individual_plots", stock_symbol)
-        os.makedirs(plot_dir, exist_ok=True)
-        
-        # Scatter: Polarity vs Returns
-        plt.figure(figsize=(10, 6))
-        self._plot_scatter(plt.gca(), data, 'avg_polarity', 'daily_return',
-                          'Sentiment Polarity', 'Daily Return (%)',
-                          f'{stock_symbol}: TextBlob Sentiment vs Returns', 'blue')
-        plt.tight_layout()
-        plt.savefig(os.path.join(plot_dir, f'{stock_symbol}_polarity_vs_returns.png'), 
-                   dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        # Scatter: VADER vs Returns
-        plt.figure(figsize=(10, 6))
-        self._plot_scatter(plt.gca(), data, 'avg_vader_compound', 'daily_return',
-                          'VADER Compound Score', 'Daily Return (%)',
-                          f'{stock_symbol}: VADER Sentiment vs Returns', 'orange')
-        plt.tight_layout()
-        plt.savefig(os.path.join(plot_dir, f'{stock_symbol}_vader_vs_returns.png'), 
-                   dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"✅ Individual plots saved for {stock_symbol}")
 
 if __name__ == "__main__":
     visualizer = StockVisualizer()
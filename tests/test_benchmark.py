@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+
+from benchmark import compare, run_suite
+from synthetic_data import generate_ratings, write_dataset
+
+
+def test_synthetic_dataset_is_deterministic(tmp_path):
+    symbols = write_dataset(str(tmp_path / "a"), n_tickers=2, days=10, headlines_per_day=3, seed=7)
+    write_dataset(str(tmp_path / "b"), n_tickers=2, days=10, headlines_per_day=3, seed=7)
+
+    for name in symbols + ["raw_analyst_ratings"]:
+        first = (tmp_path / "a" / f"{name}.csv").read_bytes()
+        assert first == (tmp_path / "b" / f"{name}.csv").read_bytes()
+
+    prices = pd.read_csv(tmp_path / "a" / f"{symbols[0]}.csv")
+    assert len(prices) == 10
+    assert (prices['High'] >= prices[['Open', 'Close']].max(axis=1)).all()
+
+    ratings = generate_ratings(symbols, days=10, headlines_per_day=3, seed=7)
+    assert set(ratings['stock']) == set(symbols)
+    assert ratings['headline'].str.len().gt(0).all()
+
+
+def test_run_suite_and_compare(tmp_path):
+    stages = ['load_stock_data', 'align_dates', 'aggregate_daily_sentiment',
+              'calculate_indicators']
+    results = run_suite(['small'], stages=stages, repeat=1, work_dir=str(tmp_path))
+
+    timed = results['scales']['small']['stages']
+    assert list(timed) == stages
+    assert all(stats['seconds'] > 0 and stats['rows'] > 0 for stats in timed.values())
+    assert not os.listdir(tmp_path)
+
+    assert compare(results, results) == []
+    slower = {'scales': {'small': {'stages': {
+        stage: dict(stats, seconds=stats['seconds'] + 1.0) for stage, stats in timed.items()
+    }}}}
+    regressions = compare(slower, results)
+    assert {r['stage'] for r in regressions} == set(stages)
+    assert all(r['metric'] == 'seconds' for r in regressions)
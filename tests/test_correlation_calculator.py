@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import pearsonr, spearmanr
+
+from correlation_calculator import CorrelationCalculator, RunningCorrelation
+
+
+def test_running_correlation_matches_pearsonr_across_batches():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=200)
+    y = 0.3 * x + rng.normal(size=200)
+
+    running = RunningCorrelation().update(x[:50], y[:50])
+    running.merge(RunningCorrelation().update(x[50:], y[50:]))
+    restored = RunningCorrelation.from_dict(running.to_dict())
+
+    r, p = restored.pearson()
+    expected_r, expected_p = pearsonr(x, y)
+    assert np.isclose(r, expected_r)
+    assert np.isclose(p, expected_p)
+
+
+def _combined_frame(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=n),
+        'avg_polarity': rng.normal(size=n),
+        'avg_vader_compound': rng.normal(size=n),
+        'positive_ratio': rng.integers(0, 4, n) / 3,
+        'daily_return': rng.normal(size=n),
+    })
+
+
+def test_rolling_pearson_and_spearman_match_scipy():
+    df = _combined_frame()
+    calculator = CorrelationCalculator()
+    pearson = calculator.rolling_correlations(df, window=25)
+    spearman = calculator.rolling_correlations(df, window=25, method='spearman')
+
+    window = df.iloc[50:75]
+    r, p = pearsonr(window['avg_vader_compound'], window['daily_return'])
+    assert np.isclose(pearson.loc[74, 'avg_vader_compound_corr'], r)
+    assert np.isclose(pearson.loc[74, 'avg_vader_compound_pvalue'], p)
+    rho, _ = spearmanr(window['positive_ratio'], window['daily_return'])
+    assert np.isclose(spearman.loc[74, 'positive_ratio_corr'], rho)
+    assert pearson['avg_polarity_corr'].iloc[:24].isna().all()
+
+
+def test_rolling_spearman_skips_nan_pairs_like_pearson():
+    df = _combined_frame()
+    df.loc[60, 'avg_polarity'] = np.nan
+    calculator = CorrelationCalculator()
+    pearson = calculator.rolling_correlations(df, window=25, min_periods=20)
+    spearman = calculator.rolling_correlations(df, window=25, method='spearman', min_periods=20)
+
+    window = df.iloc[50:75].dropna()
+    rho, p = spearmanr(window['avg_polarity'], window['daily_return'])
+    assert np.isclose(spearman.loc[74, 'avg_polarity_corr'], rho)
+    assert np.isclose(spearman.loc[74, 'avg_polarity_pvalue'], p)
+    assert (spearman['avg_polarity_n'] == pearson['avg_polarity_n']).all()
+    assert spearman.loc[74, 'avg_polarity_n'] == 24
+    # Partial windows at the start follow min_periods, as for Pearson
+    pd.testing.assert_series_equal(spearman['avg_polarity_corr'].isna(),
+                                   pearson['avg_polarity_corr'].isna())
+
+
+def test_expanding_correlation_ends_at_full_sample_value():
+    df = _combined_frame()
+    df.loc[5, 'avg_polarity'] = np.nan
+    expanding = CorrelationCalculator().expanding_correlations(df)
+    clean = df.dropna()
+    r, _ = pearsonr(clean['avg_polarity'], clean['daily_return'])
+    assert np.isclose(expanding['avg_polarity_corr'].iloc[-1], r)
+    assert expanding['avg_polarity_n'].iloc[-1] == len(df) - 1
+
+
+def test_lag_scan_matches_shifted_pearson():
+    df = _combined_frame(n=200, seed=3)
+    df['daily_return'] += 0.8 * df['avg_polarity'].shift(2).fillna(0)
+    df.loc[20, 'daily_return'] = np.nan
+    scan = CorrelationCalculator().lag_correlations(df, max_lag=4)
+    assert sorted(scan['lag'].unique()) == list(range(-4, 5))
+
+    x = df['avg_polarity'].to_numpy()
+    y = df['daily_return'].to_numpy()
+    for lag in [-2, 0, 2]:
+        a, b = (x[:len(x) - lag], y[lag:]) if lag >= 0 else (x[-lag:], y[:lag])
+        valid = ~np.isnan(a) & ~np.isnan(b)
+        row = scan[(scan['lag'] == lag) & (scan['column'] == 'avg_polarity')].iloc[0]
+        assert np.isclose(row['corr'], pearsonr(a[valid], b[valid])[0])
+        assert row['n'] == valid.sum()
+
+    best = scan[scan['column'] == 'avg_polarity'].sort_values('corr').iloc[-1]
+    assert best['lag'] == 2
+
+
+def test_lag_scan_counts_trading_days_across_news_gaps():
+    df = _combined_frame(n=200, seed=5)
+    df['daily_return'] += 0.8 * df['avg_polarity'].shift(2).fillna(0)
+    returns = df[['date', 'daily_return']]
+    # Every third day has no news, so the merged frame skips those days
+    news = df[df.index % 3 != 1].reset_index(drop=True)
+    scan = CorrelationCalculator().lag_correlations(news, max_lag=4, returns=returns)
+
+    x = df['avg_polarity'].where(df.index % 3 != 1).to_numpy()
+    y = df['daily_return'].to_numpy()
+    a, b = x[:-2], y[2:]
+    valid = ~np.isnan(a)
+    row = scan[(scan['lag'] == 2) & (scan['column'] == 'avg_polarity')].iloc[0]
+    assert np.isclose(row['corr'], pearsonr(a[valid], b[valid])[0])
+    assert row['n'] == valid.sum()
+
+    best = scan[scan['column'] == 'avg_polarity'].sort_values('corr').iloc[-1]
+    assert best['lag'] == 2
+
+
+def test_resampling_is_reproducible_and_brackets_the_estimate():
+    df = _combined_frame(n=150, seed=4)
+    df['daily_return'] += 0.5 * df['avg_vader_compound']
+    calculator = CorrelationCalculator()
+
+    first = calculator.calculate_correlations(df, n_resamples=2000, seed=7)['resampling']
+    second = calculator.calculate_correlations(df, n_resamples=2000, seed=7)['resampling']
+    assert first == second
+
+    vader = first['pearson_vader']
+    assert vader['perm_pvalue'] < 0.01
+    assert vader['ci_low'] < vader['corr'] < vader['ci_high']
+
+
+def test_permutation_test_respects_small_memory_budget():
+    rng = np.random.default_rng(5)
+    x, y = rng.normal(size=500), rng.normal(size=500)
+    r, p = CorrelationCalculator().permutation_test(x, y, n_resamples=999, seed=1,
+                                                    max_memory_mb=0.1)
+    assert np.isclose(r, pearsonr(x, y)[0])
+    assert 0 < p <= 1
+
+
+def test_panel_correlations_match_per_ticker_and_pairwise_values():
+    calculator = CorrelationCalculator()
+    frames = {
+        'AAA': _combined_frame(n=80, seed=10),
+        'BBB': _combined_frame(n=60, seed=11),
+    }
+    frames['AAA'].loc[3, 'avg_polarity'] = np.nan
+    sentiment = calculator.build_panel(frames, 'avg_polarity')
+    returns = calculator.build_panel(frames, 'daily_return')
+
+    results = calculator.panel_correlations(sentiment, returns)
+    clean = frames['AAA'].dropna()
+    r, p = pearsonr(clean['avg_polarity'], clean['daily_return'])
+    assert np.isclose(results['per_ticker'].loc['AAA', 'corr'], r)
+    assert np.isclose(results['per_ticker'].loc['AAA', 'pvalue'], p)
+    assert results['pooled'][2] == 79 + 60
+
+    matrix = calculator.sentiment_correlation_matrix(sentiment)
+    pd.testing.assert_frame_equal(matrix, sentiment.corr(), check_names=False)
+
+
+def test_event_study_windows_and_group_averages():
+    dates = pd.bdate_range('2024-01-01', periods=10)
+    returns = pd.DataFrame({
+        'date': list(dates) * 2,
+        'stock': ['A'] * 10 + ['B'] * 10,
+        'daily_return': np.r_[np.arange(10.0), 100 + np.arange(10.0)],
+    })
+    events = pd.DataFrame({
+        # Saturday -> Monday; B's first day; before A's history; B's last day; after it
+        'date': pd.to_datetime(['2024-01-06', '2024-01-01', '2023-12-01', '2024-01-12',
+                                '2024-02-01']),
+        'stock': ['a', 'B', 'A', 'B', 'A'],
+        'label': ['x', 'y', 'x', 'y', 'x'],
+    })
+    study = CorrelationCalculator().event_study(returns, events, window=2, group_column='label')
+
+    assert list(study['event_rows']) == [0, 1, 3]
+    # Abnormal returns are measured against each ticker's mean (4.5 and 104.5)
+    np.testing.assert_allclose(study['windows'], [
+        [-1.5, -0.5, 0.5, 1.5, 2.5],
+        [np.nan, np.nan, -4.5, -3.5, -2.5],
+        [2.5, 3.5, 4.5, np.nan, np.nan],
+    ])
+    np.testing.assert_allclose(study['aar']['y'], [2.5, 3.5, 0.0, -3.5, -2.5])
+    np.testing.assert_allclose(study['caar']['x'], np.cumsum([-1.5, -0.5, 0.5, 1.5, 2.5]))
+    assert study['n'].to_dict() == {'x': 1, 'y': 2}
@@ -0,0 +1,121 @@
+import os
+
+import pandas as pd
+
+from data_loader import DataLoader
+
+
+def _write_prices(path, closes):
+    pd.DataFrame({
+        'Date': pd.bdate_range('2024-01-01', periods=len(closes)).strftime('%Y-%m-%d'),
+        'Close': closes,
+        'Volume': 1000,
+    }).to_csv(path, index=False)
+
+
+def test_load_stock_data_normalizes_columns_and_dates(tmp_path):
+    _write_prices(tmp_path / "AAA.csv", [1.0, 2.0, 3.0])
+    df = DataLoader(str(tmp_path)).load_stock_data("AAA")
+    assert list(df.columns) == ['date', 'close', 'volume']
+    assert pd.api.types.is_datetime64_any_dtype(df['date'])
+
+
+def test_columnar_cache_is_reused_and_invalidated(tmp_path):
+    csv_path = tmp_path / "AAA.csv"
+    _write_prices(csv_path, [1.0, 2.0, 3.0])
+    loader = DataLoader(str(tmp_path), use_cache=True)
+
+    first = loader.load_stock_data("AAA", usecols=['close'], dtype={'close': 'float32'})
+    assert list(first.columns) == ['date', 'close']
+    assert first['close'].dtype == 'float32'
+    assert len(os.listdir(loader.cache_dir)) == 1
+    pd.testing.assert_frame_equal(
+        first, loader.load_stock_data("AAA", usecols=['close'], dtype={'close': 'float32'})
+    )
+
+    _write_prices(csv_path, [1.0, 2.0, 3.0, 4.0])
+    assert len(loader.load_stock_data("AAA", usecols=['close'], dtype={'close': 'float32'})) == 4
+
+
+def _write_ratings(path):
+    pd.DataFrame({
+        'headline': ["a", "b", "c", "d", "e"],
+        'date': ["2024-01-01 09:00:00", "2024-01-01 10:00:00", "2024-01-02 09:00:00",
+                 "2024-01-03 09:00:00", "2024-01-03 12:00:00"],
+        'stock': ["AAA", "bbb", "AAA", "BBB", "AAA"],
+    }).to_csv(path, index=False)
+
+
+def test_partition_analyst_ratings_in_memory_and_on_disk(tmp_path):
+    _write_ratings(tmp_path / "raw_analyst_ratings.csv")
+    loader = DataLoader(str(tmp_path))
+
+    parts = loader.partition_analyst_ratings(chunksize=2)
+    assert sorted(parts) == ['AAA', 'BBB']
+    assert list(parts['AAA']['headline']) == ["a", "c", "e"]
+
+    out_dir = str(tmp_path / "parts")
+    loader.partition_analyst_ratings(chunksize=2, out_dir=out_dir, symbols=['BBB'])
+    bbb = loader.load_ratings_partition('bbb', out_dir)
+    assert list(bbb['headline']) == ["b", "d"]
+    assert pd.api.types.is_datetime64_any_dtype(bbb['date'])
+    assert len(loader.load_ratings_partition('AAA', out_dir)) == 0
+
+
+def test_compact_ratings_keep_used_columns_in_small_dtypes(tmp_path):
+    path = tmp_path / "raw_analyst_ratings.csv"
+    _write_ratings(path)
+    raw = pd.read_csv(path)
+    raw.insert(1, 'url', "https://example.com")
+    raw['publisher'] = "Desk"
+    raw.to_csv(path)
+
+    default = DataLoader(str(tmp_path)).load_analyst_ratings()
+    compact_loader = DataLoader(str(tmp_path), compact=True)
+    compact = compact_loader.load_analyst_ratings()
+
+    assert list(compact.columns) == ['headline', 'date', 'stock', 'publisher']
+    assert isinstance(compact['headline'].dtype, pd.StringDtype)
+    assert isinstance(compact['stock'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(compact.astype(object), default[compact.columns].astype(object))
+
+    parts = compact_loader.partition_analyst_ratings(chunksize=2)
+    assert isinstance(parts['AAA']['stock'].dtype, pd.CategoricalDtype)
+    assert list(parts['AAA']['headline']) == ["a", "c", "e"]
+
+
+def test_load_universe_concatenates_and_reports_failures(tmp_path):
+    _write_prices(tmp_path / "AAA.csv", [1.0, 2.0])
+    _write_prices(tmp_path / "BBB.csv", [3.0, 4.0, 5.0])
+    _write_ratings(tmp_path / "raw_analyst_ratings.csv")
+    loader = DataLoader(str(tmp_path))
+    assert loader.discover_stock_files() == ['AAA', 'BBB']
+
+    universe, report = loader.load_universe(['AAA', 'BBB', 'MISSING'], max_workers=2)
+    assert list(universe.columns) == ['date', 'stock', 'close', 'volume']
+    assert list(universe['stock']) == ['AAA', 'BBB', 'AAA', 'BBB', 'BBB']
+    assert universe['volume'].dtype == 'float64'
+    assert list(report['rows']) == [2, 3, 0]
+    assert report['error'].iloc[:2].isna().all()
+    assert report['error'].iloc[2].startswith('FileNotFoundError')
+
+
+def test_align_dates_cuts_common_range_and_maps_to_trading_days():
+    loader = DataLoader()
+    stock = pd.DataFrame({'date': pd.bdate_range('2024-01-05', periods=3),
+                          'close': [1.0, 2.0, 3.0]})
+    news = pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-04 09:00', '2024-01-06 09:00', '2024-01-07 09:00',
+                                '2024-01-08 15:30']),
+        'headline': ["before", "sat", "sun", "mon"],
+    })
+
+    news_aligned, stock_aligned = loader.align_dates(news, stock)
+    assert list(news_aligned['headline']) == ["sat", "sun", "mon"]
+    assert list(news_aligned['date'].dt.dayofweek) == [5, 6, 0]
+    assert list(stock_aligned['close']) == [1.0, 2.0]
+
+    news_aligned, stock_aligned = loader.align_dates(news, stock, map_to_trading_days=True)
+    assert list(news_aligned['headline']) == ["sat", "sun", "mon"]
+    assert list(news_aligned['date']) == [pd.Timestamp('2024-01-08')] * 3
+    assert list(stock_aligned['close']) == [2.0]
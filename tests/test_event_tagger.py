@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from event_tagger import EventTagger
+
+
+def test_tagger_matches_overlapping_phrases_in_one_pass():
+    tagger = EventTagger({
+        'approval': ["fda approval", "fda approves"],
+        'target': ["price target", "raises price target"],
+        'raise': ["raises"],
+    })
+    assert tagger.tag_text("Goldman raises price target on XYZ") == {1, 2}
+    assert tagger.tag_text("FDA: approves nothing") == {0}
+    assert tagger.tag_text("Pricey targets") == set()
+
+
+def test_event_index_rows_and_daily_counts():
+    headlines = ["FDA approves drug", "Price target raised", None,
+                 "FDA approves drug", "Upgrade and price target"]
+    index = EventTagger().tag(headlines)
+
+    assert list(index.rows('fda_approval')) == [0, 3]
+    assert list(index.rows('price_target')) == [1, 4]
+    assert index.mask('upgrade').tolist() == [False, False, False, False, True]
+    assert index.tagged_rows() == 4
+
+    dates = pd.to_datetime(['2024-01-02', '2024-01-02', '2024-01-02', '2024-01-03', '2024-01-03'])
+    daily = index.daily_counts(dates)
+    assert list(daily['date']) == list(pd.to_datetime(['2024-01-02', '2024-01-03']))
+    assert list(daily['event_fda_approval']) == [1, 1]
+    assert list(daily['event_price_target']) == [1, 1]
+    assert daily.filter(like='event_').to_numpy().sum() == np.diff(index.offsets).sum()
@@ -0,0 +1,39 @@
+import numpy as np
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+from fast_vader import COMPOUND_TOLERANCE, PROPORTION_TOLERANCE, FastVader
+from sentiment_analyzer import SentimentAnalyzer
+
+HEADLINES = [
+    "Apple shares surge after GREAT earnings!!",
+    "Analysts are not happy with the weak guidance",
+    "Stock isn't bad, but the outlook is extremely uncertain??",
+    "Revenue was kind of disappointing",
+    "Never so good: record quarter, record margins",
+    "At least the dividend is safe",
+    "The least impressive launch in years",
+    "Results were the bomb, analysts say",
+    "Kiss of death for the merger",
+    "Shares slightly lower, good good good",
+    "Fed holds rates steady.",
+    "",
+]
+
+
+def test_fast_vader_matches_nltk_within_tolerance():
+    sia = SentimentIntensityAnalyzer()
+    scores = FastVader(sia.lexicon).polarity_scores(HEADLINES)
+    expected = [sia.polarity_scores(text) for text in HEADLINES]
+
+    for key, tolerance in [('compound', COMPOUND_TOLERANCE), ('pos', PROPORTION_TOLERANCE),
+                           ('neg', PROPORTION_TOLERANCE), ('neu', PROPORTION_TOLERANCE)]:
+        np.testing.assert_allclose(scores[key], [e[key] for e in expected],
+                                   atol=tolerance + 1e-12)
+
+
+def test_fast_backend_scores_like_nltk_backend():
+    texts = HEADLINES + [None]
+    nltk_scores = SentimentAnalyzer()._score_texts(texts)
+    fast_analyzer = SentimentAnalyzer(vader_backend='fast')
+    np.testing.assert_allclose(fast_analyzer._score_texts(texts), nltk_scores, atol=1e-3)
+    assert fast_analyzer.cache_namespace != SentimentAnalyzer().cache_namespace
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from incremental import IncrementalAnalyzer
+from main import analyze_stock, build_components
+from synthetic_data import write_dataset
+
+
+def test_update_appends_only_new_days_and_matches_batch(tmp_path, monkeypatch):
+    symbol = write_dataset(str(tmp_path / "data"), n_tickers=1, days=60, headlines_per_day=3,
+                           seed=2)[0]
+    price_path = tmp_path / "data" / f"{symbol}.csv"
+    prices = pd.read_csv(price_path)
+    monkeypatch.chdir(tmp_path)
+    components = build_components()
+    ratings = components['loader'].load_analyst_ratings()
+    analyzer = IncrementalAnalyzer(components, results_dir=str(tmp_path / "incremental"))
+
+    prices.head(40).to_csv(price_path, index=False)
+    first = analyzer.update(symbol, ratings)
+    prices.to_csv(price_path, index=False)
+    second = analyzer.update(symbol, ratings)
+    checkpoint_date = pd.Timestamp(prices['Date'][39])
+    assert len(second['new_data']) > 0
+    assert (second['new_data']['date'] > checkpoint_date).all()
+    assert (first['combined_data']['date'] <= checkpoint_date).all()
+    assert analyzer.update(symbol, ratings)['new_data'].empty
+
+    batch = analyze_stock(symbol, ratings, components=build_components(), render=False)
+    pd.testing.assert_frame_equal(second['combined_data'], batch['combined_data'],
+                                  check_dtype=False)
+    restored = analyzer._correlation_results(analyzer._stats(analyzer.store.load(symbol)),
+                                             None, checkpoint_date)
+    expected = batch['correlation_results']['correlations']
+    for key in ['pearson_polarity', 'pearson_vader', 'pearson_positive_ratio']:
+        assert np.allclose(restored['correlations'][key], expected[key])
+
+
+def test_missing_results_file_discards_the_checkpoint(tmp_path, monkeypatch):
+    symbol = write_dataset(str(tmp_path / "data"), n_tickers=1, days=50, headlines_per_day=3,
+                           seed=3)[0]
+    price_path = tmp_path / "data" / f"{symbol}.csv"
+    prices = pd.read_csv(price_path)
+    monkeypatch.chdir(tmp_path)
+    components = build_components()
+    ratings = components['loader'].load_analyst_ratings()
+    analyzer = IncrementalAnalyzer(components, results_dir=str(tmp_path / "incremental"))
+
+    prices.head(30).to_csv(price_path, index=False)
+    analyzer.update(symbol, ratings)
+    (tmp_path / "incremental" / f"{symbol}_results.csv").unlink()
+    prices.to_csv(price_path, index=False)
+    rebuilt = analyzer.update(symbol, ratings)
+
+    batch = analyze_stock(symbol, ratings, components=build_components(), render=False)
+    pd.testing.assert_frame_equal(rebuilt['combined_data'], batch['combined_data'],
+                                  check_dtype=False)
+    assert rebuilt['correlation_results']['summary']['total_days'] == \
+        batch['correlation_results']['summary']['total_days']
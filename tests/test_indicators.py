@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import indicators
+from prepare_data import build_price_panel
+
+
+def _prices(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    return high, low, close
+
+
+def test_ema_is_seeded_with_sma():
+    close = np.arange(1.0, 31.0)
+    result = indicators.ema(close, 10)
+    assert np.isnan(result[:9]).all()
+    assert result[9] == close[:10].mean()
+    assert np.isclose(result[10], result[9] + 2 / 11 * (close[10] - result[9]))
+
+
+def test_streaming_indicators_match_vectorized_engine():
+    high, low, close = _prices()
+
+    def run(stream, *columns):
+        return np.array([stream.update(*bar) for bar in zip(*columns)], dtype=float)
+
+    np.testing.assert_allclose(run(indicators.SMAStream(20), close), indicators.sma(close, 20))
+    np.testing.assert_allclose(run(indicators.EMAStream(20), close), indicators.ema(close, 20))
+    np.testing.assert_allclose(run(indicators.RSIStream(14), close), indicators.rsi(close, 14))
+    np.testing.assert_allclose(run(indicators.MACDStream(), close),
+                               np.column_stack(indicators.macd(close)))
+    np.testing.assert_allclose(run(indicators.BollingerStream(), close),
+                               np.column_stack(indicators.bollinger_bands(close)))
+    np.testing.assert_allclose(run(indicators.StochasticStream(), high, low, close),
+                               np.column_stack(indicators.stochastic(high, low, close)))
+
+
+def test_numpy_engine_matches_talib():
+    talib = pytest.importorskip("talib")
+    high, low, close = _prices()
+    df = pd.DataFrame({'High': high, 'Low': low, 'Close': close})
+    ours = indicators.calculate_indicators(df.copy(), engine='numpy')
+    reference = indicators.calculate_indicators(df.copy(), engine='talib')
+    pd.testing.assert_frame_equal(ours, reference, rtol=1e-8)
+    assert talib is not None
+
+
+def test_indicator_panel_matches_single_ticker_engine_on_ragged_histories():
+    highs, lows, closes = zip(*[_prices(n=200, seed=seed) for seed in range(3)])
+    high, low, close = (np.column_stack(columns) for columns in (highs, lows, closes))
+    starts = [0, 37, 120]
+    for j, start in enumerate(starts):
+        for panel in (high, low, close):
+            panel[:start, j] = np.nan
+
+    results = indicators.calculate_indicator_panel(close, high, low)
+    for j, start in enumerate(starts):
+        single = indicators.calculate_indicators(pd.DataFrame({
+            'High': high[start:, j], 'Low': low[start:, j], 'Close': close[start:, j]
+        }))
+        for name, values in results.items():
+            assert values.shape == close.shape
+            assert np.isnan(values[:start, j]).all()
+            np.testing.assert_allclose(values[start:, j], single[name].to_numpy())
+
+
+def test_indicator_panel_gives_nan_on_missing_bars():
+    high, low, close = (np.column_stack([a, a]) for a in _prices(n=91, seed=4))
+    for panel in (high, low, close):
+        panel[85:, 0] = np.nan  # delisted
+        panel[60, 1] = np.nan  # one-bar gap
+
+    results = indicators.calculate_indicator_panel(close, high, low)
+    single = indicators.calculate_indicators(pd.DataFrame({
+        'High': high[:60, 1], 'Low': low[:60, 1], 'Close': close[:60, 1]
+    }))
+    for name, values in results.items():
+        assert np.isnan(values[85:, 0]).all(), name
+        assert np.isnan(values[60, 1]), name
+        np.testing.assert_allclose(values[:60, 1], single[name].to_numpy())
+    # Recursive indicators stay NaN after a gap; windowed ones recover
+    assert np.isnan(results['RSI'][61:, 1]).all()
+    assert not np.isnan(results['STOCH_K'][80:, 1]).any()
+
+
+def test_build_price_panel_aligns_dates():
+    first = pd.DataFrame({'Close': [1.0, 2.0]}, index=pd.to_datetime(['2024-01-02', '2024-01-03']))
+    second = pd.DataFrame({'Close': [5.0]}, index=pd.to_datetime(['2024-01-03']))
+    panel = build_price_panel({'AAA': first, 'BBB': second})
+    assert list(panel.columns) == ['AAA', 'BBB']
+    assert np.isnan(panel.loc['2024-01-02', 'BBB'])
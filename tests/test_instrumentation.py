@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from instrumentation import Instrumentation
+
+
+class _Cache:
+    hits = 0
+
+
+def test_stage_records_metrics_and_errors(tmp_path):
+    output = tmp_path / "metrics.jsonl"
+    instrumentation = Instrumentation(output=str(output), profile_stage='score',
+                                      profile_dir=str(tmp_path / "profiles"))
+    cache = _Cache()
+
+    with instrumentation.stage('AAPL', 'score', rows_in=10, cache=cache) as stage:
+        cache.hits += 4
+        stage.rows_out = 8
+    with pytest.raises(ValueError):
+        with instrumentation.stage('AAPL', 'combine'):
+            raise ValueError("bad frame")
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [line['stage'] for line in lines] == ['score', 'combine']
+    score, combine = lines
+    assert score['rows_in'] == 10 and score['rows_out'] == 8 and score['cache_hits'] == 4
+    assert score['wall_s'] >= 0 and score['cpu_s'] >= 0
+    assert score['profile'].endswith("AAPL_score.prof")
+    assert (tmp_path / "profiles" / "AAPL_score.prof").exists()
+    assert combine['error'] == "ValueError: bad frame"
+
+    summary = instrumentation.summary().set_index('stage')
+    assert summary.loc['score', 'calls'] == 1
+    assert summary.loc['combine', 'errors'] == 1
+    assert summary.loc['score', 'rows_out'] == 8
+    # Counts a stage never set are missing rather than zero
+    assert summary.loc['combine', ['rows_in', 'rows_out', 'cache_hits']].isna().all()
+
+
+def test_disabled_instrumentation_records_nothing(tmp_path):
+    instrumentation = Instrumentation(enabled=False, output=str(tmp_path / "metrics.jsonl"))
+    with instrumentation.stage('AAPL', 'score', rows_in=10) as stage:
+        stage.rows_out = 8
+
+    assert instrumentation.stage('MSFT', 'other') is stage
+    assert instrumentation.records == []
+    assert not (tmp_path / "metrics.jsonl").exists()
+    assert len(instrumentation.summary()) == 0
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+
+from live import LiveAnalyzer, QueueSource, TailFileSource
+from sentiment_analyzer import SentimentAnalyzer
+
+HEADLINES = ["Shares surge on strong earnings", "Stock falls after weak guidance",
+             "Analysts upgrade the stock", "Lawsuit news hits shares", "Record revenue"]
+
+
+def _feed(n_days=12, seed=3):
+    """Time-ordered headline and bar events, with weekend and 18:00 news"""
+    rng = np.random.default_rng(seed)
+    events = []
+    for i, day in enumerate(pd.bdate_range("2024-01-01", periods=n_days)):
+        for hour in (9, 12, 18):
+            events.append({'stock': 'aaa', 'date': f"{day.date()} {hour:02d}:00:00",
+                           'headline': HEADLINES[rng.integers(len(HEADLINES))]})
+            if hour == 12:
+                events.append({'stock': 'AAA', 'date': f"{day.date()} 16:00:00",
+                               'close': 100 + i + float(rng.normal())})
+        if day.dayofweek == 4:
+            saturday = (day + pd.Timedelta(days=1)).date()
+            events.append({'stock': 'AAA', 'date': f"{saturday} 10:00:00",
+                           'headline': HEADLINES[rng.integers(len(HEADLINES))]})
+    return events
+
+
+def _batch_correlation(events):
+    """Reference: batch pipeline semantics
+
+    News is dated by calendar day, so 18:00 headlines count toward their
+    own day and weekend ones toward the next trading day.
+    """
+    news = pd.DataFrame([e for e in events if 'headline' in e])
+    bars = pd.DataFrame([e for e in events if 'close' in e])
+    bars['date'] = pd.to_datetime(bars['date']).dt.normalize()
+    news['date'] = pd.to_datetime(news['date']).dt.normalize()
+    trading_days = bars['date'].to_numpy()
+    news['date'] = trading_days[np.searchsorted(trading_days, news['date'].to_numpy())]
+
+    analyzer = SentimentAnalyzer()
+    daily = analyzer.aggregate_daily_sentiment(analyzer.analyze_dataframe(news))
+    bars['daily_return'] = bars['close'].pct_change() * 100
+    combined = pd.merge(daily, bars, on='date').dropna(subset=['daily_return'])
+    return np.corrcoef(combined['avg_polarity'], combined['daily_return'])[0, 1], len(combined)
+
+
+def test_live_state_matches_batch_correlation():
+    events = _feed()
+    published = []
+
+    async def run():
+        feed = QueueSource()
+        for event in events + [None]:
+            await feed.put(event)
+        live = LiveAnalyzer(batch_size=4, publish_interval=0.05, publisher=published.extend)
+        return live, await live.run(feed)
+
+    live, summary = asyncio.run(run())
+    expected_r, expected_days = _batch_correlation(events)
+
+    final = published[-1]
+    assert final['stock'] == 'AAA'
+    assert final['days'] == expected_days
+    assert np.isclose(final['corr_avg_polarity'], expected_r)
+    assert summary['headlines'] == sum('headline' in e for e in events)
+    assert summary['batches'] >= summary['headlines'] // 4
+    assert summary['latency_max_ms'] < 1000
+    # Only the open days are kept, whatever the length of the feed
+    assert len(live.states['AAA'].sentiment) <= 2
+
+
+def test_tail_file_source_reads_json_lines(tmp_path):
+    path = tmp_path / "feed.jsonl"
+    path.write_text(json.dumps({'stock': 'AAA', 'headline': "Great news"}) + "\n\nnot json\n"
+                    + json.dumps({'stock': 'AAA', 'close': 1.0}) + "\n")
+
+    async def read():
+        return [event async for event in TailFileSource(str(path), follow=False).events()]
+
+    assert asyncio.run(read()) == [{'stock': 'AAA', 'headline': "Great news"},
+                                   {'stock': 'AAA', 'close': 1.0}]
+
+
+def test_events_without_headline_or_close_are_rejected():
+    published = []
+
+    async def run():
+        feed = QueueSource()
+        for event in [{'stock': 'AAA', 'date': "2024-01-02", 'close': 10.0},
+                      {'stock': 'AAA', 'date': "2024-01-02"},
+                      {'stock': 'AAA', 'date': "2024-01-02", 'headline': None},
+                      {'stock': 'AAA', 'date': "2024-01-02", 'headline': "  "},
+                      {'stock': 'AAA', 'date': "2024-01-02", 'type': 'bar'},
+                      {'stock': 'AAA', 'date': "2024-01-02", 'headline': "Record revenue"},
+                      [1, 2],
+                      {'stock': 5, 'headline': "Good news"},
+                      {'stock': 'BBB', 'date': "2024-01-02", 'close': "n/a"},
+                      None]:
+            await feed.put(event)
+        return await LiveAnalyzer(publish_interval=0.05, publisher=published.extend).run(feed)
+
+    summary = asyncio.run(run())
+    assert summary['rejected'] == 7
+    assert summary['headlines'] == 1
+    assert summary['bars'] == 1
+    assert summary['tickers'] == 1
+    assert published[-1]['articles_today'] == 1
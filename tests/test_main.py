@@ -0,0 +1,92 @@
+import pandas as pd
+
+from data_loader import DataLoader
+from main import analyze_stock, build_components, parse_args, run_universe
+from ratings_index import RatingsIndex
+from synthetic_data import write_dataset
+
+
+def test_run_universe_parallel_matches_serial_and_collects_failures(tmp_path, monkeypatch):
+    symbols = write_dataset(str(tmp_path / "data"), n_tickers=3, days=40, headlines_per_day=3,
+                            seed=5)
+    # A price file without a close column fails inside the pipeline
+    prices = pd.read_csv(tmp_path / "data" / f"{symbols[0]}.csv")
+    prices.drop(columns=['Close', 'Adj Close']).to_csv(tmp_path / "data" / "BAD.csv", index=False)
+    ratings = DataLoader(str(tmp_path / "data")).load_analyst_ratings()
+    ratings = pd.concat([ratings, ratings.head(3).assign(stock='BAD')], ignore_index=True)
+    monkeypatch.chdir(tmp_path)
+
+    stocks = symbols + ['BAD']
+    serial, serial_failures = run_universe(stocks, ratings_index=RatingsIndex(ratings),
+                                           workers=1, render=False)
+    parallel, failures = run_universe(stocks, ratings_index=RatingsIndex(ratings),
+                                      workers=2, render=False)
+
+    assert list(failures) == ['BAD']
+    assert "Could not find closing price column" in failures['BAD']
+    assert list(serial_failures) == ['BAD']
+    assert sorted(parallel) == sorted(serial) == symbols
+    for stock in symbols:
+        pd.testing.assert_frame_equal(parallel[stock]['combined_data'],
+                                      serial[stock]['combined_data'])
+        assert parallel[stock]['correlation_results'] == serial[stock]['correlation_results']
+
+
+def test_resamples_option_reaches_the_correlations(tmp_path, monkeypatch):
+    symbols = write_dataset(str(tmp_path / "data"), n_tickers=1, days=40, headlines_per_day=3,
+                            seed=6)
+    ratings_index = RatingsIndex(DataLoader(str(tmp_path / "data")).load_analyst_ratings())
+    monkeypatch.chdir(tmp_path)
+    assert parse_args([]).resamples == 0
+
+    args = parse_args(['--resamples', '200'])
+    results, _ = run_universe(symbols, ratings_index=ratings_index, render=False,
+                              n_resamples=args.resamples)
+    resampling = results[symbols[0]]['correlation_results']['resampling']
+    assert set(resampling) >= {'pearson_polarity', 'spearman_vader'}
+    assert all(1 / 201 <= row['perm_pvalue'] <= 1 for row in resampling.values())
+
+    results, _ = run_universe(symbols, ratings_index=ratings_index, render=False)
+    assert 'resampling' not in results[symbols[0]]['correlation_results']
+
+
+def test_score_jobs_option_configures_the_scoring_pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert parse_args([]).score_jobs == 1
+    jobs = parse_args(['--score-jobs', '3']).score_jobs
+    assert build_components(score_jobs=jobs)['sentiment_analyzer'].n_jobs == 3
+
+
+def test_caches_are_only_written_when_enabled(tmp_path, monkeypatch):
+    symbols = write_dataset(str(tmp_path / "data"), n_tickers=1, days=40, headlines_per_day=3,
+                            seed=7)
+    ratings_index = RatingsIndex(DataLoader(str(tmp_path / "data")).load_analyst_ratings())
+    monkeypatch.chdir(tmp_path)
+
+    assert analyze_stock(symbols[0], ratings_index.frame, ratings_index, render=False)
+    assert not (tmp_path / "cache").exists()
+    assert not (tmp_path / "data" / ".cache").exists()
+    assert parse_args(['--no-cache']).no_cache and not parse_args([]).no_cache
+
+    results, _ = run_universe(symbols, ratings_index=ratings_index, render=False,
+                              use_cache=True)
+    assert results
+    assert (tmp_path / "cache" / "sentiment_cache.sqlite").exists()
+    assert any((tmp_path / "data" / ".cache").iterdir())
+
+
+def test_seed_makes_resampled_pvalues_reproducible(tmp_path, monkeypatch):
+    symbols = write_dataset(str(tmp_path / "data"), n_tickers=1, days=40, headlines_per_day=3,
+                            seed=8)
+    ratings_index = RatingsIndex(DataLoader(str(tmp_path / "data")).load_analyst_ratings())
+    monkeypatch.chdir(tmp_path)
+    assert parse_args([]).seed == 0
+
+    def resampling(seed):
+        results, _ = run_universe(symbols, ratings_index=ratings_index, render=False,
+                                  n_resamples=50, seed=seed)
+        return results[symbols[0]]['correlation_results']['resampling']
+
+    seed = parse_args(['--seed', '11']).seed
+    assert resampling(seed) == resampling(seed)
+    assert resampling(seed) != resampling(seed + 1)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from ratings_index import RatingsIndex
+
+
+def test_get_returns_each_tickers_rows_in_original_order():
+    ratings = pd.DataFrame({
+        'headline': ["a", "b", "c", "d", "e"],
+        'stock': ["msft", "AAPL", None, "MSFT", "aapl"],
+    })
+    index = RatingsIndex(ratings)
+
+    assert list(index.get("MSFT")['headline']) == ["a", "d"]
+    assert list(index.get("aapl")['headline']) == ["b", "e"]
+    assert len(index.get("NVDA")) == 0
+    assert "Msft" in index and len(index) == 2
+    assert index.counts().to_dict() == {'AAPL': 2, 'MSFT': 2}
+
+
+def test_get_matches_full_table_scan():
+    rng = np.random.default_rng(0)
+    ratings = pd.DataFrame({
+        'value': np.arange(1000),
+        'stock': rng.choice(["AAA", "bbb", "Ccc"], 1000),
+    })
+    index = RatingsIndex(ratings)
+    for symbol in ["AAA", "BBB", "CCC"]:
+        expected = ratings[ratings['stock'].str.upper() == symbol]
+        pd.testing.assert_frame_equal(index.get(symbol), expected)
@@ -0,0 +1,105 @@
+import nltk
+import numpy as np
+import pandas as pd
+import pytest
+
+import sentiment_analyzer
+from sentiment_analyzer import DailySentimentStats, SentimentAnalyzer, label_names
+
+
+def test_batch_scores_match_per_headline_scores():
+    analyzer = SentimentAnalyzer()
+    headlines = pd.Series([
+        "Apple stock soars on great earnings",
+        "Shares fall after weak guidance",
+        "Apple stock soars on great earnings",
+        None,
+    ])
+    scores = analyzer.score_batch(headlines)
+    for i, text in enumerate(headlines):
+        expected = analyzer.analyze_sentiment(text)
+        assert scores['polarity'][i] == expected['polarity']
+        assert scores['vader_compound'][i] == expected['vader_compound']
+    assert scores['polarity'].flags['C_CONTIGUOUS']
+
+
+def test_process_pool_scores_match_serial_scores():
+    headlines = pd.Series(["Shares surge on strong earnings", "Stock falls after weak guidance",
+                           "Analysts upgrade the stock", "Lawsuit news hits shares",
+                           "Record revenue", None, "Shares surge on strong earnings"])
+    serial = SentimentAnalyzer().score_batch(headlines)
+    pooled = SentimentAnalyzer().score_batch(headlines, n_jobs=2, chunk_size=2)
+    for field in serial:
+        np.testing.assert_array_equal(pooled[field], serial[field])
+
+    df = pd.DataFrame({'date': pd.to_datetime(["2024-01-01"] * 7), 'headline': headlines})
+    pd.testing.assert_frame_equal(
+        SentimentAnalyzer(n_jobs=2, chunk_size=2).analyze_dataframe(df.copy()),
+        SentimentAnalyzer().analyze_dataframe(df.copy()))
+
+
+def test_analyze_dataframe_adds_sentiment_columns():
+    analyzer = SentimentAnalyzer()
+    df = pd.DataFrame({'headline': ["Great results", "Terrible loss", ""]})
+    df = analyzer.analyze_dataframe(df)
+    for col in ['sentiment_polarity', 'sentiment_subjectivity', 'vader_compound', 'sentiment_label']:
+        assert col in df.columns
+    assert np.isin(df['sentiment_label'], ['positive', 'negative', 'neutral']).all()
+
+
+def test_daily_stats_match_groupby_and_merge_late_batches():
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 20, n), 'D'),
+        'sentiment_polarity': rng.uniform(-1, 1, n),
+        'vader_compound': rng.uniform(-1, 1, n),
+    })
+    df['sentiment_label'] = np.where(df['sentiment_polarity'] > 0.5, 'positive', 'negative')
+
+    expected = df.groupby('date').agg(
+        avg_polarity=('sentiment_polarity', 'mean'),
+        std_polarity=('sentiment_polarity', 'std'),
+        article_count=('sentiment_polarity', 'count'),
+        avg_vader_compound=('vader_compound', 'mean'),
+        std_vader_compound=('vader_compound', 'std'),
+        positive_ratio=('sentiment_label', lambda x: (x == 'positive').mean()),
+    ).round(4).reset_index()
+
+    daily = DailySentimentStats.from_frame(df).to_frame()
+    pd.testing.assert_frame_equal(daily, expected, atol=1e-4)
+
+    # Late headlines for already-seen days fold into the stored state
+    late = DailySentimentStats.from_frame(df.iloc[:300]).update(df.iloc[300:])
+    pd.testing.assert_frame_equal(late.to_frame(), expected, atol=1e-4)
+
+
+def test_compact_mode_matches_default_results():
+    df = pd.DataFrame({
+        'date': pd.to_datetime(["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-02"]),
+        'headline': ["Great results", "Terrible loss", "Good strong growth", "Shares slip"],
+    })
+    default = SentimentAnalyzer().analyze_dataframe(df.copy())
+    compact = SentimentAnalyzer(compact=True).analyze_dataframe(df.copy())
+
+    assert compact['sentiment_polarity'].dtype == np.float32
+    assert compact['sentiment_label'].dtype == np.int8
+    assert list(label_names(compact['sentiment_label'])) == list(default['sentiment_label'])
+    pd.testing.assert_frame_equal(DailySentimentStats.from_frame(compact).to_frame(),
+                                  DailySentimentStats.from_frame(default).to_frame())
+
+
+def test_lexicon_loads_from_local_file_or_fails_fast_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(sentiment_analyzer, '_shared', {})
+    monkeypatch.setattr(nltk.data, 'path', list(nltk.data.path))
+    lexicon = tmp_path / "vader_lexicon.txt"
+    lexicon.write_text("good\t1.9\t0.9\t[2, 2]\nbad\t-2.5\t0.5\t[-3, -2]")
+    sia = sentiment_analyzer.load_vader(str(lexicon))
+    assert sia.lexicon == {'good': 1.9, 'bad': -2.5}
+    assert sia.polarity_scores("good")['compound'] > 0
+    assert sentiment_analyzer.load_vader() is sia
+
+    monkeypatch.setattr(sentiment_analyzer, '_shared', {})
+    monkeypatch.setattr(nltk.data, 'path', [str(tmp_path / "missing")])
+    with pytest.raises(LookupError, match=sentiment_analyzer.LEXICON_PATH_ENV):
+        sentiment_analyzer.load_vader(offline=True)
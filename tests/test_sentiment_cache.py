@@ -0,0 +1,54 @@
+from sentiment_cache import SentimentCache
+
+
+def test_cache_roundtrip_and_counters(tmp_path):
+    cache = SentimentCache(str(tmp_path / "scores.sqlite"))
+    cache.put_many({"good news": {'polarity': 0.7, 'vader_compound': 0.4}}, "ns")
+
+    found = cache.get_many(["good news", "bad news"], "ns")
+    assert found["good news"]['polarity'] == 0.7
+    assert found["good news"]['vader_negative'] == 0.0
+    assert "bad news" not in found
+    assert cache.hits == 1 and cache.misses == 1
+
+    # A different analyzer version never sees the entry
+    assert cache.get("good news", "ns-v2") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = SentimentCache(str(tmp_path / "scores.sqlite"), max_entries=2)
+    cache.put("a", {'polarity': 1}, "ns")
+    cache.put("b", {'polarity': 2}, "ns")
+    cache.get("a", "ns")
+    cache.put("c", {'polarity': 3}, "ns")
+
+    assert len(cache) == 2
+    assert cache.get("b", "ns") is None
+    assert cache.get("a", "ns") is not None
+
+
+def test_single_puts_are_buffered_and_rows_counted_only_to_evict(tmp_path):
+    path = str(tmp_path / "scores.sqlite")
+    cache = SentimentCache(path, max_entries=10, write_batch=4, evict_margin=5)
+    statements = []
+    cache.conn.set_trace_callback(statements.append)
+
+    for i in range(3):
+        cache.put(f"text {i}", {'polarity': i}, "ns")
+    assert statements == []
+    assert cache.get("text 2", "ns")['polarity'] == 2
+    assert len(SentimentCache(path)) == 0
+
+    # Flushed every 4 puts; rows are only counted once 10 + 5 are exceeded
+    for i in range(3, 12):
+        cache.put(f"text {i}", {'polarity': i}, "ns")
+    assert sum("COUNT" in sql for sql in statements) == 0
+    for i in range(12, 17):
+        cache.put(f"text {i}", {'polarity': i}, "ns")
+    assert sum("COUNT" in sql for sql in statements) == 1
+
+    cache.close()
+    reopened = SentimentCache(path, max_entries=10)
+    assert len(reopened) == 10
+    assert reopened.get("text 16", "ns")['polarity'] == 16
+    assert reopened.get("text 0", "ns") is None
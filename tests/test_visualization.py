@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pandas as pd
+from matplotlib.image import imread
+
+import visualization
+from visualization import StockVisualizer
+
+
+def _combined_data(n=20, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.bdate_range('2024-01-01', periods=n),
+        'avg_polarity': rng.uniform(-1, 1, n),
+        'avg_vader_compound': rng.uniform(-1, 1, n),
+        'daily_return': rng.normal(size=n),
+    })
+
+
+def test_dashboard_renders_once_and_skips_unchanged_data(tmp_path, capsys):
+    visualizer = StockVisualizer(dpi='preview')
+    data = _combined_data()
+    visualizer.create_dashboard(data, "AAA", str(tmp_path))
+
+    dashboard = tmp_path / "AAA_dashboard.png"
+    scatter = tmp_path / "individual_plots" / "AAA" / "AAA_polarity_vs_returns.png"
+    assert dashboard.exists() and scatter.exists()
+    first_mtime = os.path.getmtime(dashboard)
+
+    capsys.readouterr()
+    visualizer.create_dashboard(data, "AAA", str(tmp_path))
+    assert "up to date" in capsys.readouterr().out
+    assert os.path.getmtime(dashboard) == first_mtime
+
+    visualizer.create_dashboard(_combined_data(seed=1), "AAA", str(tmp_path))
+    assert "Dashboard saved" in capsys.readouterr().out
+
+
+def test_dashboard_keeps_the_tight_bbox_framing(tmp_path, monkeypatch):
+    visualizer = StockVisualizer(dpi='preview', skip_unchanged=False)
+    visualizer.create_dashboard(_combined_data(), "AAA", str(tmp_path))
+
+    # Save the same figure the way the dashboard used to be written
+    close = visualization.plt.close
+    def save_reference(fig):
+        fig.savefig(tmp_path / "reference.png", dpi=72, bbox_inches='tight')
+        close(fig)
+    monkeypatch.setattr(visualization.plt, 'close', save_reference)
+    visualizer.create_dashboard(_combined_data(), "AAA", str(tmp_path))
+
+    dashboard = imread(tmp_path / "AAA_dashboard.png")
+    reference = imread(tmp_path / "reference.png")
+    assert dashboard.shape[:2] != (12 * 72, 15 * 72)
+    assert np.allclose(dashboard.shape[:2], reference.shape[:2], atol=2)
+
+
+def test_render_dashboards_across_workers_writes_every_ticker(tmp_path):
+    frames = {"AAA": _combined_data(seed=2), "BBB": _combined_data(seed=3)}
+    StockVisualizer(dpi='preview').render_dashboards(frames, str(tmp_path), workers=2)
+    for symbol in frames:
+        assert (tmp_path / f"{symbol}_dashboard.png").exists()
+        for name in ("polarity", "vader"):
+            assert (tmp_path / "individual_plots" / symbol
+                    / f"{symbol}_{name}_vs_returns.png").exists()